@@ -6,6 +6,7 @@ import time
 import random
 import json
 from pathlib import Path
+from typing import Optional
 
 import config
 
@@ -17,9 +18,13 @@ if _presets_path.exists():
         SUNO_PRESETS = json.load(f)
 from services.suno_client import SunoClient
 from services.prompt_generator import PromptGenerator
-from services.music_manager import MusicManager
+from services.music_manager import get_shared_music_manager
 from services.google_drive_manager import GoogleDriveManager
 from services.task_manager import TaskManager
+from services.generation_scheduler import GenerationScheduler
+from services.prompt_pipeline import PromptPrefetcher
+from services.downloader import DownloadError, download_file
+from services.bulk_downloader import BulkDownloader
 
 # 장르별 옵션 매핑
 GENRE_OPTIONS = {
@@ -155,7 +160,8 @@ if "drive_manager" not in st.session_state or st.session_state.drive_manager is
     else:
         st.session_state.drive_manager = None
 if "music_manager" not in st.session_state:
-    st.session_state.music_manager = MusicManager(drive_manager=st.session_state.get("drive_manager"))
+    # 저장소/업로드 큐/동기화 스레드는 세션 간 공유 (같은 파일을 쓰므로)
+    st.session_state.music_manager = get_shared_music_manager(drive_manager=st.session_state.get("drive_manager"))
 # drive_manager가 나중에 연결되면 music_manager에도 반영
 if st.session_state.get("drive_manager") and st.session_state.music_manager:
     st.session_state.music_manager.drive_manager = st.session_state.drive_manager
@@ -215,11 +221,45 @@ def main():
         # Google Drive 연결 상태
         if st.session_state.drive_manager and st.session_state.drive_manager.is_connected():
             st.success("☁️ Google Drive 연결됨")
+            if st.button("☁️ Drive 동기화", key="drive_sync_btn", use_container_width=True,
+                         help="로컬 곡 파일 중 Drive에 없거나 내용이 다른 것만 업로드"):
+                with st.spinner("Drive와 비교 중..."):
+                    try:
+                        result = st.session_state.music_manager.sync_to_drive()
+                        st.success(
+                            f"동기화 완료: {result['checked']}곡 확인 · 업로드 {len(result['uploaded'])}곡 · "
+                            f"장르 폴더로 이동 {len(result['moved'])}곡 · "
+                            f"변경 없음 {len(result['unchanged'])}곡"
+                        )
+                        if result["failed"]:
+                            st.warning(f"실패 {len(result['failed'])}곡")
+                    except Exception as e:
+                        st.error(f"동기화 실패: {e}")
         elif config.GOOGLE_DRIVE_ENABLED:
             st.warning("☁️ Google Drive 연결 실패")
         else:
             st.info("☁️ Google Drive 미설정")
 
+        # Drive 업로드 큐 상태
+        pending_uploads = st.session_state.music_manager.get_pending_uploads()
+        if pending_uploads:
+            with st.expander(f"☁️ 업로드 대기 {len(pending_uploads)}곡"):
+                for job in pending_uploads:
+                    state = "업로드 중" if job["uploading"] else f"대기 (시도 {job['attempts']}회)"
+                    line = f"{job['title']} · {state}"
+                    if job["last_error"]:
+                        line += f" · {job['last_error']}"
+                    st.caption(line)
+            if st.button("🔄 새로고침", key="refresh_uploads", use_container_width=True):
+                st.rerun()
+
+        failed_uploads = st.session_state.music_manager.get_failed_uploads()
+        if failed_uploads:
+            st.warning(f"☁️ Drive 업로드 실패 {len(failed_uploads)}곡")
+            if st.button("☁️ 실패한 업로드 다시 시도", key="retry_uploads", use_container_width=True):
+                count = st.session_state.music_manager.retry_failed_uploads()
+                st.success(f"{count}곡을 업로드 대기열에 다시 넣었습니다")
+
         st.divider()
 
         # 통계
@@ -231,6 +271,17 @@ def main():
         with col2:
             st.metric("오늘", stats["today_count"])
 
+        # LLM 토큰 사용량 (제공자 프롬프트 캐시 적중)
+        if st.session_state.prompt_generator:
+            usage = st.session_state.prompt_generator.get_usage_stats()
+            if usage["requests"]:
+                st.caption(
+                    f"🧠 LLM {usage['requests']}회 · 입력 캐시 적중 {usage['cache_read_tokens']:,} 토큰 "
+                    f"({usage['cache_hit_rate']:.0%}) · 캐시 저장 {usage['cache_write_tokens']:,} 토큰"
+                )
+                if usage["uncached_requests"]:
+                    st.caption(f"⚠️ 프롬프트 캐시 미적용 호출 {usage['uncached_requests']}회")
+
         st.divider()
 
         # API 키 설정 도움말
@@ -340,9 +391,24 @@ def main():
                     elif not st.session_state.prompt_generator:
                         st.error("먼저 API를 연결해주세요")
                     else:
+                        # 제목/스타일이 완성되는 대로 미리 표시 (가사는 이어서 스트리밍)
+                        preview = st.empty()
+                        streamed = {}
+
+                        def show_field(name: str, value: str):
+                            streamed[name] = value
+                            lines = []
+                            if "title" in streamed:
+                                lines.append(f"**🏷️ {streamed['title']}**")
+                            if "style" in streamed:
+                                lines.append(f"🎨 {streamed['style']}")
+                            if "lyrics" not in streamed:
+                                lines.append("📝 가사 작성 중...")
+                            preview.markdown("\n\n".join(lines))
+
                         with st.spinner("프롬프트 생성 중..."):
                             try:
-                                prompt_data = st.session_state.prompt_generator.generate_music_prompt(
+                                prompt_data = st.session_state.prompt_generator.stream_music_prompt(
                                     theme=theme,
                                     genre=genre,
                                     mood=mood,
@@ -351,8 +417,10 @@ def main():
                                     age=age,
                                     tempo=tempo,
                                     sound_texture=sound_texture,
-                                    instrumental=instrumental
+                                    instrumental=instrumental,
+                                    on_field=show_field
                                 )
+                                preview.empty()
                                 # 시티팝 프리셋이면 스타일 덮어쓰기
                                 if single_style_override:
                                     prompt_data["style"] = single_style_override
@@ -661,6 +729,11 @@ def main():
                     )
 
                 batch_instrumental = st.checkbox("🎹 인스트루멘탈", key="batch_inst")
+                batch_force_fresh = st.checkbox(
+                    "🔄 프롬프트 새로 생성",
+                    key="batch_force_fresh",
+                    help="같은 조건으로 만든 프롬프트 캐시를 무시하고 AI로 다시 생성합니다"
+                )
 
             st.divider()
 
@@ -679,7 +752,7 @@ def main():
                 st.caption("📋 스타일 프롬프트 미리보기")
                 st.code(style_preview, language=None)
 
-                estimated_credits = len(themes) * 10
+                estimated_credits = len(themes) * config.CREDITS_PER_SONG
                 st.info(f"예상 크레딧 사용: {estimated_credits}")
 
             if st.button("🚀 대량 생성 시작", type="primary", use_container_width=True):
@@ -700,7 +773,8 @@ def main():
                         tempo=batch_tempo,
                         sound_texture=batch_sound_texture,
                         instrumental=batch_instrumental,
-                        style_override=final_style_override
+                        style_override=final_style_override,
+                        force_fresh=batch_force_fresh
                     )
 
     # 탭 5: 이전 생성곡 다시 받기
@@ -722,16 +796,17 @@ def main():
         </style>
         """, unsafe_allow_html=True)
 
-        all_songs = sorted(
-            st.session_state.music_manager.get_all_songs(),
-            key=lambda x: x.get("created_at", ""),
-            reverse=True
-        )
+        all_songs = st.session_state.music_manager.get_recent_songs(None)
 
         if not all_songs:
             st.info("이전에 생성한 곡이 없습니다.")
         else:
-            missing_songs = [s for s in all_songs if not Path(s.get("audio_path", "")).exists()]
+            library_paths = st.session_state.music_manager.resolve_library_paths(all_songs)
+            missing_songs = [
+                s for s in all_songs
+                if not st.session_state.music_manager.file_exists(s.get("audio_path", ""))
+                and library_paths.get(s.get("id", "")) is None
+            ]
 
             # 상단 요약 + 전체 다운로드
             col_summary, col_dl_all = st.columns([3, 1])
@@ -753,7 +828,7 @@ def main():
 
             # 곡 리스트
             for song in all_songs:
-                render_library_song(song)
+                render_library_song(song, library_paths.get(song.get("id", "")))
 
     # 탭 3: 동시 대량 생성
     with tab3:
@@ -981,12 +1056,18 @@ def main():
         if slot2_enabled:
             total_songs += slot2_count
 
-        estimated_credits = total_songs * 10
+        estimated_credits = total_songs * config.CREDITS_PER_SONG
         st.info(f"총 {total_songs}곡 · 예상 크레딧: {estimated_credits}")
 
         if total_songs > 40:
             st.warning("⚠️ 40곡 초과! 크레딧 제한에 걸릴 수 있습니다.")
 
+        parallel_force_fresh = st.checkbox(
+            "🔄 프롬프트 새로 생성",
+            key="parallel_force_fresh",
+            help="같은 조건으로 만든 프롬프트 캐시를 무시하고 AI로 다시 생성합니다"
+        )
+
         # 동시 대량 생성 버튼
         if st.button("🚀 동시 대량 생성 시작", type="primary", use_container_width=True):
             if not slot1_enabled and not slot2_enabled:
@@ -1029,11 +1110,11 @@ def main():
                         "style_direct": slot2_style_direct if 'slot2_style_direct' in dir() else None
                     })
 
-                generate_batch_parallel(slots_data)
+                generate_batch_parallel(slots_data, force_fresh=parallel_force_fresh)
 
 
-def generate_batch_parallel(slots_data: list):
-    """동시 대량 생성 (2개씩 병렬 처리)"""
+def generate_batch_parallel(slots_data: list, force_fresh: bool = False):
+    """동시 대량 생성 (MAX_PARALLEL_GENERATIONS개 슬롯 슬라이딩 윈도우)"""
     progress = st.progress(0, text="주제 생성 중...")
     status_container = st.empty()
 
@@ -1063,116 +1144,109 @@ def generate_batch_parallel(slots_data: list):
         while len(themes) < count:
             themes.append(f"노래 {len(themes)+1}")
 
-        # 태스크 목록에 추가
+        # 태스크 목록에 추가 (Random 선택시 곡마다 무작위 성별 적용)
         for theme in themes[:count]:
             all_tasks.append({
                 "genre": genre,
                 "theme": theme,
                 "mood": mood,
                 "language": language,
-                "gender": gender,
+                "gender": random.choice(["Male", "Female"]) if gender == "Random" else gender,
                 "style_direct": style_direct
             })
 
     total_songs = len(all_tasks)
     progress.progress(10, text=f"총 {total_songs}곡 준비 완료, 생성 시작...")
 
-    # 2. 2개씩 묶어서 동시 처리
-    success_count = 0
-    fail_count = 0
-
-    for i in range(0, total_songs, 2):
-        batch = all_tasks[i:i+2]  # 최대 2개
-        batch_num = i // 2 + 1
-        total_batches = (total_songs + 1) // 2
+    # 2. 슬라이딩 윈도우로 동시 처리 (한 곡이 끝나면 바로 다음 곡 투입)
+    # 워커 스레드에서는 st.session_state에 접근할 수 없으므로 미리 꺼내둠
+    prompt_generator = st.session_state.prompt_generator
+    used_keys = set()  # 이번 배치에서 쓴 캐시 키 (반복 주제는 캐시 대신 새로 생성)
+
+    def build_prompts(batch: list) -> list:
+        """조건이 같은 곡들의 프롬프트를 한 요청으로 생성 (선생성 워커 스레드에서 실행)"""
+        first = batch[0]
+        prompts = prompt_generator.generate_music_prompts_batched(
+            [task_info["theme"] for task_info in batch],
+            genre=first.get("genre"),
+            mood=first.get("mood"),
+            language=first["language"],
+            genders=[task_info["gender"] for task_info in batch],
+            instrumental=False,
+            batch_size=len(batch),
+            force_fresh=force_fresh,
+            used_keys=used_keys
+        )
 
-        status_container.info(f"🎵 배치 {batch_num}/{total_batches}: {len(batch)}곡 동시 생성 중...")
+        # 직접 스타일 입력이 있으면 덮어쓰기
+        for task_info, prompt_data in zip(batch, prompts):
+            if task_info.get("style_direct") and not prompt_data.get("error"):
+                prompt_data["style"] = task_info["style_direct"]
 
-        # 비동기 요청
-        pending = []
-        for task_info in batch:
-            try:
-                # 프롬프트 생성
-                current_gender = task_info["gender"]
-                if current_gender == "Random":
-                    current_gender = random.choice(["Male", "Female"])
-
-                prompt_data = st.session_state.prompt_generator.generate_music_prompt(
-                    theme=task_info["theme"],
-                    genre=task_info.get("genre"),
-                    mood=task_info.get("mood"),
-                    language=task_info["language"],
-                    gender=current_gender,
-                    instrumental=False
-                )
-                prompt_data["theme"] = task_info["theme"]
+        return prompts
 
-                # 직접 스타일 입력이 있으면 덮어쓰기
-                if task_info.get("style_direct"):
-                    prompt_data["style"] = task_info["style_direct"]
+    def batch_key(task_info: dict) -> tuple:
+        """한 요청으로 묶을 수 있는 조건 (성별은 곡마다 따로 보내므로 제외)"""
+        return (
+            task_info.get("genre"),
+            task_info.get("mood"),
+            task_info["language"]
+        )
 
-                # Suno 요청
-                task_id = st.session_state.suno_client.generate_async(
-                    prompt=prompt_data.get("lyrics", ""),
-                    style=prompt_data.get("style", ""),
-                    title=prompt_data.get("title", "")
+    def on_complete(task_info: dict, prompt_data: dict, clips: list):
+        """완료된 태스크 다운로드 및 저장"""
+        for clip_index, clip in enumerate(clips):
+            audio_url = clip.get("audio_url")
+            if audio_url:
+                save_path = st.session_state.music_manager.get_audio_path(
+                    prompt_data.get("title", "song"),
+                    clip.get("id", ""),
+                    clip_index=clip_index
+                )
+                save_path = st.session_state.suno_client.download_audio(audio_url, str(save_path))
+                song_info = st.session_state.music_manager.save_song(
+                    clip_data=clip,
+                    prompt_data=prompt_data,
+                    audio_path=str(save_path),
+                    genre=task_info["genre"]
                 )
 
-                pending.append({
-                    "task_id": task_id,
-                    "prompt_data": prompt_data,
-                    "genre": task_info["genre"]
-                })
-
-                st.session_state.task_manager.add_task(task_id, prompt_data, task_info["genre"])
-
-            except Exception as e:
-                st.error(f"요청 실패 ({task_info['theme']}): {e}")
-                fail_count += 1
-
-        # 완료 대기 및 다운로드
-        for task in pending:
-            try:
-                clips = st.session_state.suno_client.wait_for_completion(task["task_id"])
-
-                for clip_index, clip in enumerate(clips):
-                    audio_url = clip.get("audio_url")
-                    if audio_url:
-                        save_path = st.session_state.music_manager.get_audio_path(
-                            task["prompt_data"].get("title", "song"),
-                            clip.get("id", ""),
-                            clip_index=clip_index
-                        )
-                        save_path, audio_data = st.session_state.suno_client.download_audio(audio_url, str(save_path))
-                        song_info = st.session_state.music_manager.save_song(
-                            clip_data=clip,
-                            prompt_data=task["prompt_data"],
-                            audio_path=str(save_path),
-                            audio_data=audio_data,
-                            genre=task["genre"]
-                        )
-
-                        if song_info.get("drive_upload"):
-                            st.caption(f"☁️ Drive: {task['genre']}/{'홀수' if clip_index == 0 else '짝수'}")
-
-                st.session_state.task_manager.complete_task(task["task_id"], clips)
-                success_count += 1
-
-            except Exception as e:
-                st.error(f"생성 실패 ({task['prompt_data'].get('title', 'Unknown')}): {e}")
-                st.session_state.task_manager.fail_task(task["task_id"], str(e))
-                fail_count += 1
+                if song_info.get("drive_status") == "pending":
+                    st.caption(f"☁️ Drive 업로드 대기: {task_info['genre']}/{'홀수' if clip_index == 0 else '짝수'}")
 
-        # 진행률 업데이트
-        done = i + len(batch)
-        progress.progress(10 + int(90 * done / total_songs), text=f"{done}/{total_songs}곡 완료")
+    def on_event(event: dict):
+        """스케줄러 진행 이벤트 표시"""
+        if event["type"] == "submitted":
+            status_container.info(
+                f"🎵 '{event['prompt_data'].get('title', '')}' 요청 완료 "
+                f"(진행 중 {event['in_flight']}곡, 완료 {event['done']}/{event['total']}곡)"
+            )
+        elif event["type"] == "failed":
+            if event["stage"] == "request":
+                st.error(f"요청 실패 ({event['job']['theme']}): {event['error']}")
+            else:
+                st.error(f"생성 실패 ({event['prompt_data'].get('title', 'Unknown')}): {event['error']}")
+        elif event["type"] == "budget_exhausted":
+            st.warning(f"⚠️ 오늘 크레딧 한도({config.DAILY_CREDIT_LIMIT})에 도달해 {event['skipped']}곡을 건너뜁니다")
 
-        # Rate limit 방지
-        if i + 2 < total_songs:
-            time.sleep(2)
+        progress.progress(
+            10 + int(90 * event["done"] / total_songs),
+            text=f"{event['done']}/{total_songs}곡 완료"
+        )
 
+    scheduler = GenerationScheduler(
+        st.session_state.suno_client,
+        st.session_state.task_manager,
+        on_event=on_event
+    )
+    # 앞선 곡이 렌더링되는 동안 다음 곡들의 프롬프트를 묶어서 미리 생성
+    with PromptPrefetcher(all_tasks, generate_batch=build_prompts, batch_key=batch_key) as prefetcher:
+        result = scheduler.run(all_tasks, prefetcher.result, on_complete)
+
+    # 배치 동안 모아 둔 metadata.json 변경을 Drive에 반영
+    st.session_state.music_manager.flush_metadata()
     status_container.empty()
-    st.success(f"🎉 완료! 성공: {success_count}곡, 실패: {fail_count}곡")
+    st.success(f"🎉 완료! 성공: {result['success']}곡, 실패: {result['failed']}곡")
 
 
 def refresh_audio_url(clip_id: str) -> str:
@@ -1184,45 +1258,31 @@ def refresh_audio_url(clip_id: str) -> str:
     Returns:
         새로운 audio_url (실패시 빈 문자열)
     """
-    if not clip_id or not st.session_state.suno_client:
-        return ""
+    return refresh_audio_urls([clip_id]).get(clip_id, "")
 
-    songs = st.session_state.music_manager.metadata["songs"]
-    task_id = ""
-    for s in songs:
-        if s.get("id") == clip_id:
-            task_id = s.get("task_id", "")
-            break
 
-    if not task_id:
-        return ""
+def refresh_audio_urls(clip_ids: list) -> dict:
+    """여러 클립의 오디오 URL 일괄 갱신 (taskId별 상태 조회 1회, 메타데이터 저장 1회)
+
+    Returns:
+        {clip_id: 새 audio_url} (실패한 클립은 빠짐)
+    """
+    if not clip_ids or not st.session_state.suno_client:
+        return {}
 
     try:
-        status_data = st.session_state.suno_client._get_task_status(task_id)
-        if status_data.get("status") != "SUCCESS":
-            return ""
-
-        response = status_data.get("response", {})
-        suno_data = response.get("sunoData", [])
-
-        for item in suno_data:
-            if item.get("id") == clip_id:
-                new_url = item.get("audioUrl") or item.get("sourceAudioUrl") or ""
-                if new_url:
-                    for s in songs:
-                        if s.get("id") == clip_id:
-                            s["audio_url"] = new_url
-                            break
-                    st.session_state.music_manager._save_metadata()
-                return new_url
-
-        return ""
+        return st.session_state.music_manager.refresh_audio_urls(st.session_state.suno_client, clip_ids)
     except Exception:
-        return ""
+        return {}
+
 
+def render_library_song(song: dict, library_path: Optional[Path] = None):
+    """라이브러리 곡 렌더링 - Artlist 스타일
 
-def render_library_song(song: dict):
-    """라이브러리 곡 렌더링 - Artlist 스타일"""
+    Args:
+        song: 곡 메타데이터
+        library_path: library에 받아 둔 파일 경로 (없으면 None)
+    """
     title = song.get("title", "Untitled")
     created = song.get("created_at", "")[:10]
     audio_url = song.get("audio_url", "")
@@ -1231,11 +1291,9 @@ def render_library_song(song: dict):
     duration = song.get("duration", 0)
     lyrics = song.get("lyrics", "")
     audio_path = song.get("audio_path", "")
-    has_local = Path(audio_path).exists()
+    has_local = st.session_state.music_manager.file_exists(audio_path)
 
-    filename = st.session_state.music_manager.generate_filename(title, clip_id)
-    library_path = config.LIBRARY_DIR / filename
-    has_library = library_path.exists()
+    has_library = library_path is not None
 
     is_playing = (st.session_state.current_audio_id == clip_id) if clip_id else False
 
@@ -1309,83 +1367,119 @@ def render_library_song(song: dict):
     st.markdown("<hr style='margin:0; border:none; border-top:1px solid rgba(255,255,255,0.07);'>", unsafe_allow_html=True)
 
 
+def fetch_library_audio(audio_url: str, clip_id: str, save_path: Path) -> str:
+    """library 곡 다운로드 (URL 만료시 taskId로 갱신 후 한 번 더 시도)
+
+    Raises:
+        DownloadError: 갱신 후에도 받지 못한 경우
+    """
+    try:
+        if not audio_url:
+            raise DownloadError("audio_url 없음")
+        return download_file(audio_url, str(save_path))
+    except DownloadError as e:
+        # 연결 오류/재시도 초과가 아닌 HTTP 오류(441 등 URL 만료)만 갱신 대상
+        if audio_url and e.status_code is None:
+            raise
+        fresh_url = refresh_audio_url(clip_id)
+        if not fresh_url:
+            raise
+        return download_file(fresh_url, str(save_path))
+
+
 def download_library_song(audio_url: str, title: str, clip_id: str):
     """라이브러리 곡 다운로드 (library 폴더에 저장, URL 만료시 taskId로 갱신)"""
-    import requests as req
     try:
         with st.spinner("다운로드 중..."):
-            filename = st.session_state.music_manager.generate_filename(title, clip_id)
-            save_path = config.LIBRARY_DIR / filename
-
-            response = None
-            # 기존 URL로 시도
-            if audio_url:
-                response = req.get(audio_url, stream=True, timeout=60)
-
-            # URL 만료시 (441 등) taskId로 갱신 시도
-            if not response or response.status_code != 200:
-                fresh_url = refresh_audio_url(clip_id)
-                if fresh_url:
-                    audio_url = fresh_url
-                    response = req.get(audio_url, stream=True, timeout=60)
+            save_path = st.session_state.music_manager.get_library_path(title, clip_id)
 
-            if not response or response.status_code != 200:
-                status = response.status_code if response else "N/A"
+            try:
+                fetch_library_audio(audio_url, clip_id, save_path)
+            except DownloadError as e:
+                status = e.status_code or "N/A"
                 st.error(f"다운로드 실패: HTTP {status} (URL 만료, 15일 이내 생성곡만 복구 가능)")
                 return
 
-            with open(str(save_path), "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            st.session_state.music_manager.set_library_paths({clip_id: save_path})
             st.success(f"저장 완료: library/{save_path.name}")
     except Exception as e:
         st.error(f"다운로드 실패: {e}")
 
 
 def download_all_missing(songs: list):
-    """누락된 곡 전체 다운로드 (URL 만료시 taskId로 갱신)"""
-    import requests as req
+    """누락된 곡 전체 다운로드 (병렬, URL 만료시 taskId로 갱신 후 재시도)"""
     total = len(songs)
     progress = st.progress(0, text=f"0/{total} 다운로드 중...")
     success = 0
     fail = 0
 
-    for i, song in enumerate(songs):
-        audio_url = song.get("audio_url", "")
-        title = song.get("title", "Untitled")
+    # 다운로드 대상 정리 (이미 있는 파일은 성공 처리)
+    targets = {}  # clip_id -> (song, save_path)
+    for song in songs:
         clip_id = song.get("id", "")
-
-        if not audio_url and not song.get("task_id"):
+        if not song.get("audio_url") and not song.get("task_id"):
             fail += 1
             continue
 
-        try:
-            filename = st.session_state.music_manager.generate_filename(title, clip_id)
-            save_path = config.LIBRARY_DIR / filename
+        save_path = st.session_state.music_manager.get_library_path(song.get("title", "Untitled"), clip_id)
+        if st.session_state.music_manager.file_exists(save_path):
+            success += 1
+        else:
+            targets[clip_id] = (song, save_path)
+
+    def show_progress(stats: dict, done_before: int):
+        done = done_before + stats["done"]
+        speed = stats["throughput"] / (1024 * 1024)
+        progress.progress(
+            min(done / total, 1.0),
+            text=f"{done}/{total} 다운로드 중... · {speed:.1f} MB/s"
+        )
 
-            if not save_path.exists():
-                response = req.get(audio_url, stream=True, timeout=60) if audio_url else None
+    downloader = BulkDownloader()
+
+    # 1차: 저장된 URL로 병렬 다운로드
+    jobs = [
+        {"key": clip_id, "url": song["audio_url"], "save_path": str(save_path)}
+        for clip_id, (song, save_path) in targets.items()
+        if song.get("audio_url")
+    ]
+    done_before = success + fail
+    results = downloader.run(jobs, on_progress=lambda stats: show_progress(stats, done_before))
+
+    retry_ids = []
+    downloaded = {}  # clip_id -> 저장 경로 (메타데이터에 한 번에 기록)
+    for clip_id in targets:
+        error = results.get(clip_id, DownloadError("audio_url 없음"))
+        if error is None:
+            success += 1
+            downloaded[clip_id] = targets[clip_id][1]
+        elif error.status_code is not None or clip_id not in results:
+            retry_ids.append(clip_id)  # URL 만료 또는 URL 없음 → 갱신 대상
+        else:
+            fail += 1
 
-                # URL 만료시 taskId로 갱신 시도
-                if not response or response.status_code != 200:
-                    fresh_url = refresh_audio_url(clip_id)
-                    if fresh_url:
-                        audio_url = fresh_url
-                        response = req.get(audio_url, stream=True, timeout=60)
-
-                if response and response.status_code == 200:
-                    with open(str(save_path), "wb") as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                    success += 1
-                else:
-                    fail += 1
+    # 2차: URL 갱신 후 병렬 재시도
+    if retry_ids:
+        progress.progress(min((success + fail) / total, 1.0), text=f"만료된 URL {len(retry_ids)}개 갱신 중...")
+        fresh_urls = refresh_audio_urls(retry_ids)
+        jobs = []
+        for clip_id in retry_ids:
+            if clip_id in fresh_urls:
+                jobs.append({"key": clip_id, "url": fresh_urls[clip_id], "save_path": str(targets[clip_id][1])})
             else:
-                success += 1  # 이미 존재
-        except Exception:
-            fail += 1
+                fail += 1
+
+        done_before = success + fail
+        results = downloader.run(jobs, on_progress=lambda stats: show_progress(stats, done_before))
+        for clip_id, error in results.items():
+            if error is None:
+                success += 1
+                downloaded[clip_id] = targets[clip_id][1]
+            else:
+                fail += 1
 
-        progress.progress((i + 1) / total, text=f"{i + 1}/{total} 다운로드 중...")
+    progress.progress(1.0, text=f"{total}/{total} 완료")
+    st.session_state.music_manager.set_library_paths(downloaded)
 
     if fail > 0:
         st.warning(f"완료! 성공: {success}, 실패: {fail} (URL 만료된 곡은 taskId 없으면 복구 불가)")
@@ -1420,21 +1514,18 @@ def generate_single_song(prompt_data: dict):
                     clip_index=clip_index
                 )
 
-                save_path, audio_data = st.session_state.suno_client.download_audio(audio_url, str(save_path))
+                save_path = st.session_state.suno_client.download_audio(audio_url, str(save_path))
 
                 # 메타데이터 저장
                 song_info = st.session_state.music_manager.save_song(
                     clip_data=clip,
                     prompt_data=prompt_data,
-                    audio_path=str(save_path),
-                    audio_data=audio_data
+                    audio_path=str(save_path)
                 )
 
-                # Drive 업로드 결과 표시
-                if song_info.get("drive_upload"):
-                    st.success(f"☁️ Drive 업로드 성공: {Path(save_path).name}")
-                elif song_info.get("drive_error"):
-                    st.warning(f"☁️ Drive 업로드 실패: {song_info['drive_error']}")
+                # Drive 업로드는 백그라운드에서 진행 (사이드바에서 확인)
+                if song_info.get("drive_status") == "pending":
+                    st.caption(f"☁️ Drive 업로드 대기열에 추가: {Path(save_path).name}")
 
         progress.progress(100, text="완료!")
         st.success(f"🎉 {len(clips)}곡 생성 완료!")
@@ -1460,7 +1551,8 @@ def generate_batch_songs(
     tempo: str = None,
     sound_texture: str = None,
     instrumental: bool = False,
-    style_override: str = None
+    style_override: str = None,
+    force_fresh: bool = False
 ):
     """대량 곡 생성"""
     total = len(themes)
@@ -1470,71 +1562,89 @@ def generate_batch_songs(
     success_count = 0
     fail_count = 0
 
-    for i, theme in enumerate(themes):
-        # Random 선택시 곡마다 무작위 성별 적용
-        current_gender = random.choice(["Male", "Female"]) if gender == "Random" else gender
-        status_container.info(f"🎵 '{theme}' 생성 중... (성별: {current_gender})")
+    # Random 선택시 곡마다 무작위 성별 적용
+    jobs = [
+        {
+            "theme": theme,
+            "gender": random.choice(["Male", "Female"]) if gender == "Random" else gender
+        }
+        for theme in themes
+    ]
+
+    # 워커 스레드에서는 st.session_state에 접근할 수 없으므로 미리 꺼내둠
+    prompt_generator = st.session_state.prompt_generator
+    used_keys = set()  # 이번 배치에서 쓴 캐시 키 (반복 주제는 캐시 대신 새로 생성)
+
+    def build_prompts(batch: list) -> list:
+        """여러 곡의 프롬프트를 한 요청으로 생성 (선생성 워커 스레드에서 실행)"""
+        return prompt_generator.generate_music_prompts_batched(
+            [job["theme"] for job in batch],
+            genre=genre,
+            mood=mood,
+            language=language,
+            genders=[job["gender"] for job in batch],
+            age=age,
+            tempo=tempo,
+            sound_texture=sound_texture,
+            instrumental=instrumental,
+            batch_size=len(batch),
+            force_fresh=force_fresh,
+            used_keys=used_keys
+        )
 
-        try:
-            # 프롬프트 생성
-            prompt_data = st.session_state.prompt_generator.generate_music_prompt(
-                theme=theme,
-                genre=genre,
-                mood=mood,
-                language=language,
-                gender=current_gender,
-                age=age,
-                tempo=tempo,
-                sound_texture=sound_texture,
-                instrumental=instrumental
-            )
-            prompt_data["theme"] = theme
-
-            # 음악 생성 (시티팝 프리셋이면 style_override 사용)
-            final_style = style_override if style_override else prompt_data.get("style", "")
-            clips = st.session_state.suno_client.generate(
-                prompt=prompt_data.get("lyrics", ""),
-                style=final_style,
-                title=prompt_data.get("title", ""),
-                instrumental=instrumental,
-                wait_for_completion=True
-            )
+    # 앞선 곡이 렌더링되는 동안 다음 곡들의 프롬프트를 묶어서 미리 생성
+    with PromptPrefetcher(jobs, generate_batch=build_prompts) as prefetcher:
 
-            # 다운로드 및 저장 (첫 번째=output1, 두 번째=output2)
-            for clip_index, clip in enumerate(clips):
-                audio_url = clip.get("audio_url")
-                if audio_url:
-                    save_path = st.session_state.music_manager.get_audio_path(
-                        prompt_data.get("title", "song"),
-                        clip.get("id", ""),
-                        clip_index=clip_index
-                    )
-                    save_path, audio_data = st.session_state.suno_client.download_audio(audio_url, str(save_path))
-                    song_info = st.session_state.music_manager.save_song(
-                        clip_data=clip,
-                        prompt_data=prompt_data,
-                        audio_path=str(save_path),
-                        audio_data=audio_data
-                    )
+        for i, job in enumerate(jobs):
+            theme = job["theme"]
+            status_container.info(f"🎵 '{theme}' 생성 중... (성별: {job['gender']})")
 
-                    # Drive 업로드 결과 표시
-                    if song_info.get("drive_upload"):
-                        status_container.success(f"☁️ Drive 업로드 성공")
-                    elif song_info.get("drive_error"):
-                        status_container.warning(f"☁️ Drive 실패: {song_info['drive_error']}")
+            try:
+                prompt_data = prefetcher.result(job)
 
-            success_count += 1
+                # 음악 생성 (시티팝 프리셋이면 style_override 사용)
+                final_style = style_override if style_override else prompt_data.get("style", "")
+                clips = st.session_state.suno_client.generate(
+                    prompt=prompt_data.get("lyrics", ""),
+                    style=final_style,
+                    title=prompt_data.get("title", ""),
+                    instrumental=instrumental,
+                    wait_for_completion=True
+                )
 
-        except Exception as e:
-            fail_count += 1
-            status_container.error(f"'{theme}' 실패: {e}")
-            time.sleep(1)
+                # 다운로드 및 저장 (첫 번째=output1, 두 번째=output2)
+                for clip_index, clip in enumerate(clips):
+                    audio_url = clip.get("audio_url")
+                    if audio_url:
+                        save_path = st.session_state.music_manager.get_audio_path(
+                            prompt_data.get("title", "song"),
+                            clip.get("id", ""),
+                            clip_index=clip_index
+                        )
+                        save_path = st.session_state.suno_client.download_audio(audio_url, str(save_path))
+                        song_info = st.session_state.music_manager.save_song(
+                            clip_data=clip,
+                            prompt_data=prompt_data,
+                            audio_path=str(save_path)
+                        )
 
-        progress.progress((i + 1) / total, text=f"{i + 1}/{total} 완료")
+                        # Drive 업로드는 백그라운드에서 진행 (사이드바에서 확인)
+                        if song_info.get("drive_status") == "pending":
+                            status_container.caption("☁️ Drive 업로드 대기열에 추가")
 
-        # Rate limit 방지
-        time.sleep(2)
+                success_count += 1
+
+            except Exception as e:
+                fail_count += 1
+                status_container.error(f"'{theme}' 실패: {e}")
+                time.sleep(1)
+
+            progress.progress((i + 1) / total, text=f"{i + 1}/{total} 완료")
+
+            # Rate limit 방지
+            time.sleep(2)
 
+    st.session_state.music_manager.flush_metadata()
     status_container.empty()
     st.success(f"🎉 완료! 성공: {success_count}, 실패: {fail_count}")
 
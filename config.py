@@ -47,6 +47,34 @@ MAX_CONCURRENT_GENERATIONS = 2  # 동시 생성 개수 (Suno 제한)
 GENERATION_WAIT_TIME = 10  # 상태 확인 간격 (초)
 MAX_WAIT_TIME = 300  # 최대 대기 시간 (초)
 
+# 다운로드 설정
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 스트리밍 다운로드 청크 크기 (bytes)
+DOWNLOAD_MAX_RETRIES = 3  # 연결 끊김 시 이어받기 재시도 횟수
+BULK_DOWNLOAD_WORKERS = 8  # 일괄 다운로드 동시 작업 수
+BULK_DOWNLOAD_PER_HOST = 4  # 같은 호스트로의 최대 동시 연결 수
+
+# 다중 태스크 폴링 설정 (적응형 백오프)
+POLL_MIN_INTERVAL = 5  # 상태 변화 직후 폴링 간격 (초)
+POLL_MAX_INTERVAL = 20  # 상태 변화 없을 때 최대 폴링 간격 (초)
+POLL_BACKOFF_FACTOR = 1.5  # 상태 변화 없을 때 간격 증가 배수
+POLL_MAX_WORKERS = 8  # 동시 상태 조회 스레드 수
+
+# LLM 호출 설정
+LLM_MAX_CONCURRENCY = 4  # 일괄 프롬프트 생성 시 동시 호출 수
+LLM_CALL_TIMEOUT = 90  # 호출 1회당 타임아웃 (초)
+PROMPT_BATCH_SIZE = 5  # 한 요청으로 묶어 생성할 곡 수
+PROMPT_BATCH_TOKENS_PER_SONG = 2000  # 묶음 요청 시 곡당 최대 출력 토큰
+
+# 프롬프트 캐시 설정 (같은 조건 조합이면 LLM 재호출 없이 재사용)
+PROMPT_CACHE_ENABLED = os.getenv("PROMPT_CACHE_ENABLED", "true").lower() == "true"
+PROMPT_CACHE_DIR = BASE_DIR / "prompt_cache"
+PROMPT_CACHE_TTL = 7 * 24 * 3600  # 캐시 유효 기간 (초)
+PROMPT_CACHE_MAX_ENTRIES = 2000  # 최대 캐시 항목 수 (초과 시 LRU 삭제)
+
+# 프롬프트 선생성 설정 (Suno 렌더링 중 다음 곡 프롬프트 미리 생성)
+PROMPT_PREFETCH_SIZE = 3  # 미리 생성해둘 프롬프트 수
+PROMPT_PREFETCH_WORKERS = 2  # 프롬프트 생성 스레드 수
+
 # Google Drive 설정
 GOOGLE_DRIVE_FOLDER_ID = os.getenv("GOOGLE_DRIVE_FOLDER_ID", "")  # Drive 루트 폴더 ID
 GOOGLE_CREDENTIALS_PATH = str(BASE_DIR / os.getenv("GOOGLE_CREDENTIALS_PATH", "google-credentials.json"))  # 로컬용 JSON 파일 (절대 경로)
@@ -70,5 +98,31 @@ GENRE_LIST = [
 # 동시 생성 설정
 MAX_PARALLEL_GENERATIONS = 2  # 동시 생성 최대 개수
 
+# 크레딧 설정 (Pro 플랜 기준 하루 약 100곡)
+CREDITS_PER_SONG = 10  # 곡(태스크) 1개당 크레딧
+DAILY_CREDIT_LIMIT = int(os.getenv("DAILY_CREDIT_LIMIT", "500"))  # 하루 크레딧 한도 (0이면 제한 없음)
+
+# 메타데이터 저장소 ("json": metadata.json, "sqlite": metadata.db - 곡 수가 많을 때)
+METADATA_BACKEND = os.getenv("METADATA_BACKEND", "json").lower()
+METADATA_JOURNAL_MAX_OPS = 200  # json 저장소: 저널 줄 수가 이만큼 쌓이면 스냅샷 압축
+METADATA_JOURNAL_MAX_AGE = 300  # json 저장소: 저널 첫 항목 후 이 시간(초)이 지나면 압축
+METADATA_SYNC_WINDOW = 10  # Drive metadata.json 업로드를 모으는 시간 (초)
+
+# Drive mp3 업로드 큐 설정 (생성과 별도로 백그라운드에서 업로드)
+DRIVE_UPLOAD_WORKERS = 4  # 동시 업로드 수 (스레드마다 Drive 서비스 객체를 따로 씀)
+DRIVE_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # 재개 가능 업로드 청크 크기 (256KB의 배수)
+DRIVE_UPLOAD_SESSIONS_FILE = BASE_DIR / "drive_upload_sessions.json"  # 끊긴 업로드의 세션 URI (재시작 후 이어서)
+DRIVE_UPLOAD_MAX_RETRIES = 5  # 실패 시 최대 시도 횟수
+DRIVE_UPLOAD_RETRY_BASE = 5  # 재시도 대기 기본값 (초, 시도마다 2배)
+DRIVE_UPLOAD_RETRY_MAX = 300  # 재시도 대기 최대값 (초)
+DRIVE_UPLOAD_QUEUE_FILE = OUTPUT_DIR / "drive_upload_queue.json"  # 대기 중인 업로드 (재시작 후 이어서)
+DRIVE_FILE_CACHE_FILE = BASE_DIR / "drive_file_cache.json"  # (폴더 ID, 파일명) → Drive 파일 ID
+DRIVE_FOLDER_CACHE_FILE = BASE_DIR / "drive_folder_cache.json"  # 루트별 장르/홀짝 폴더 ID 트리
+
+# 로컬 파일 지문 캐시 (크기/수정 시각이 바뀐 파일만 다시 해시)
+FILE_FINGERPRINT_CACHE_FILE = BASE_DIR / "file_fingerprints.json"
+FINGERPRINT_WORKERS = os.cpu_count() or 4  # 병렬 해시 스레드 수
+DIRECTORY_INDEX_CHECK_INTERVAL = 2  # 폴더 변경(mtime) 확인 간격 (초) - 라이브러리 탭 파일 존재 확인용
+
 # 작업 관리
 PENDING_TASKS_FILE = BASE_DIR / "pending_tasks.json"
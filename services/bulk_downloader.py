@@ -0,0 +1,108 @@
+"""
+병렬 일괄 다운로드 - 라이브러리 "전체 다운로드"용
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+import config
+from services.downloader import DownloadError, download_file
+
+
+class BulkDownloader:
+    """워커 풀로 여러 파일을 동시에 받는 다운로더
+
+    - 모든 워커가 하나의 requests.Session을 공유해 연결(keep-alive)을 재사용한다.
+    - 같은 호스트로의 동시 연결은 per_host_limit개로 제한한다.
+    - on_progress는 run()을 호출한 스레드에서만 호출되므로 Streamlit 갱신에 써도 된다.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, per_host_limit: Optional[int] = None):
+        self.max_workers = max_workers or config.BULK_DOWNLOAD_WORKERS
+        self.per_host_limit = per_host_limit or config.BULK_DOWNLOAD_PER_HOST
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._host_slots = {}  # host -> Semaphore
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+    def run(self, jobs: list, on_progress: Optional[Callable[[dict], None]] = None) -> dict:
+        """
+        다운로드 실행
+
+        Args:
+            jobs: [{"key": 식별자, "url": URL, "save_path": 저장 경로}, ...]
+            on_progress: 진행 상황 콜백 - {"done", "total", "failed", "bytes", "elapsed", "throughput"(bytes/s)}
+
+        Returns:
+            {key: None(성공) 또는 DownloadError}
+        """
+        results = {}
+        failed = 0
+        self._bytes = 0
+        start_time = time.time()
+
+        def report():
+            if not on_progress:
+                return
+            elapsed = time.time() - start_time
+            on_progress({
+                "done": len(results),
+                "total": len(jobs),
+                "failed": failed,
+                "bytes": self._bytes,
+                "elapsed": elapsed,
+                "throughput": self._bytes / elapsed if elapsed > 0 else 0.0,
+            })
+
+        if not jobs:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as executor:
+            pending = {executor.submit(self._download, job): job["key"] for job in jobs}
+
+            while pending:
+                # 끝난 작업이 없어도 주기적으로 처리량 갱신
+                finished, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    key = pending.pop(future)
+                    try:
+                        future.result()
+                        results[key] = None
+                    except DownloadError as e:
+                        results[key] = e
+                        failed += 1
+                    except Exception as e:
+                        results[key] = DownloadError(str(e))
+                        failed += 1
+                report()
+
+        return results
+
+    def _download(self, job: dict):
+        """워커: 호스트 슬롯을 잡고 다운로드"""
+        with self._host_slot(job["url"]):
+            download_file(
+                job["url"],
+                job["save_path"],
+                session=self.session,
+                on_progress=self._add_bytes
+            )
+
+    def _host_slot(self, url: str) -> threading.Semaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.Semaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def _add_bytes(self, count: int):
+        with self._lock:
+            self._bytes += count
@@ -0,0 +1,72 @@
+"""
+디렉토리 파일 목록 캐시 (파일 존재 확인을 메모리에서)
+"""
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+import config
+
+
+class DirectoryIndex:
+    """폴더마다 os.scandir 한 번으로 파일명 집합을 만들어 두고 존재 여부를 답한다
+
+    폴더의 mtime은 파일이 생기거나 지워지거나 이름이 바뀔 때 바뀌므로, mtime이
+    그대로면 목록을 다시 읽지 않는다. mtime 확인(stat 1회)도 폴더당
+    check_interval초에 한 번만 하며, 앱이 직접 만든 파일은 invalidate()로 바로 반영한다.
+    """
+
+    def __init__(self, check_interval: Optional[float] = None):
+        self.check_interval = check_interval if check_interval is not None else config.DIRECTORY_INDEX_CHECK_INTERVAL
+        self._lock = threading.Lock()
+        self._dirs = {}  # 폴더 경로 -> {"names": set, "mtime_ns": int, "checked_at": float}
+
+    def exists(self, path) -> bool:
+        """파일 존재 여부 (폴더 목록 캐시로 판단)"""
+        if not path:
+            return False
+        path = Path(path)
+        return path.name in self.names(path.parent)
+
+    def names(self, directory) -> frozenset:
+        """폴더 안의 파일명 집합"""
+        key = os.path.abspath(directory)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._dirs.get(key)
+            if entry and now - entry["checked_at"] < self.check_interval:
+                return entry["names"]
+
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+
+        if entry and entry["mtime_ns"] == mtime_ns:
+            names = entry["names"]
+        else:
+            names = self._scan(key) if mtime_ns is not None else frozenset()
+
+        with self._lock:
+            self._dirs[key] = {"names": names, "mtime_ns": mtime_ns, "checked_at": now}
+        return names
+
+    def invalidate(self, path=None):
+        """캐시 무효화 (파일 경로면 그 파일의 폴더, None이면 전체)"""
+        with self._lock:
+            if path is None:
+                self._dirs.clear()
+            else:
+                path = Path(path)
+                for key in (os.path.abspath(path), os.path.abspath(path.parent)):
+                    self._dirs.pop(key, None)
+
+    @staticmethod
+    def _scan(directory: str) -> frozenset:
+        try:
+            with os.scandir(directory) as entries:
+                return frozenset(entry.name for entry in entries if entry.is_file())
+        except OSError:
+            return frozenset()
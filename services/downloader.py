@@ -0,0 +1,145 @@
+"""
+이어받기/무결성 검증을 지원하는 오디오 다운로드 엔진
+"""
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional
+import requests
+import config
+
+
+class DownloadError(Exception):
+    """다운로드 실패 (status_code: HTTP 상태 코드, 연결 오류면 None)"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def download_file(
+    url: str,
+    save_path: str,
+    session: Optional[requests.Session] = None,
+    expected_md5: Optional[str] = None,
+    max_retries: Optional[int] = None,
+    timeout: int = 60,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> str:
+    """
+    파일 다운로드 (임시 .part 파일 → 검증 → 최종 경로로 원자적 교체)
+
+    - 이전에 중단된 .part 파일이 있으면 HTTP Range 요청으로 이어받는다.
+    - Content-Length(206이면 Content-Range의 전체 크기)와 받은 크기를 비교한다.
+    - expected_md5가 있으면 체크섬까지 확인한다.
+    - 검증이 끝나기 전에는 최종 경로에 파일이 생기지 않으므로,
+      Path.exists()가 True면 완전한 파일이다.
+
+    Args:
+        url: 다운로드 URL
+        save_path: 최종 저장 경로
+        session: 연결 재사용용 requests.Session (없으면 requests 모듈 사용)
+        expected_md5: 기대 MD5 (hex, 선택)
+        max_retries: 연결 끊김/크기 불일치 시 재시도 횟수
+        timeout: 요청 타임아웃 (초)
+        on_progress: 청크를 쓸 때마다 받은 바이트 수로 호출
+
+    Returns:
+        저장된 파일 경로
+
+    Raises:
+        DownloadError: HTTP 오류(4xx는 즉시), 재시도 초과, 체크섬 불일치
+    """
+    save_path = Path(save_path)
+    part_path = save_path.with_name(save_path.name + ".part")
+    http = session or requests
+    max_retries = max_retries or config.DOWNLOAD_MAX_RETRIES
+    last_error = None
+
+    for attempt in range(max_retries):
+        try:
+            if _fetch_into_part(http, url, part_path, timeout, on_progress):
+                break
+            last_error = "받은 크기가 Content-Length와 다름"
+        except requests.exceptions.RequestException as e:
+            # 연결 끊김 - 받은 부분은 .part에 남아 다음 시도에서 이어받음
+            last_error = f"연결 오류: {e}"
+
+        if attempt < max_retries - 1:
+            time.sleep(2 * (attempt + 1))
+    else:
+        raise DownloadError(f"다운로드 실패 ({max_retries}회 재시도 후): {last_error}")
+
+    if expected_md5:
+        actual_md5 = _file_md5(part_path)
+        if actual_md5 != expected_md5.lower():
+            part_path.unlink(missing_ok=True)
+            raise DownloadError(f"체크섬 불일치: {actual_md5} != {expected_md5}")
+
+    os.replace(part_path, save_path)
+    return str(save_path)
+
+
+def _fetch_into_part(http, url: str, part_path: Path, timeout: int, on_progress) -> bool:
+    """요청 1회 수행 후 .part에 기록. 완전한 파일이 되었으면 True"""
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+    response = http.get(url, stream=True, timeout=timeout, headers=headers)
+    with response:
+        if response.status_code == 416 and offset:
+            # 이미 끝까지 받았거나 서버 파일이 바뀜
+            total = _total_from_content_range(response.headers.get("Content-Range", ""))
+            if total == offset:
+                return True
+            part_path.unlink(missing_ok=True)
+            return False
+
+        if response.status_code == 206:
+            mode = "ab"
+            total = _total_from_content_range(response.headers.get("Content-Range", ""))
+        elif response.status_code == 200:
+            # Range를 무시한 서버 - 처음부터 다시 받음
+            mode = "wb"
+            total = _content_length(response)
+        elif 500 <= response.status_code < 600:
+            return False
+        else:
+            raise DownloadError(f"다운로드 실패: HTTP {response.status_code}", response.status_code)
+
+        with open(part_path, mode) as f:
+            for chunk in response.iter_content(chunk_size=config.DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                if on_progress:
+                    on_progress(len(chunk))
+
+    size = part_path.stat().st_size
+    if total is None or size == total:
+        return True
+    if size > total:
+        # 받은 양이 더 많으면 .part가 오염된 것 - 처음부터 다시
+        part_path.unlink(missing_ok=True)
+    return False
+
+
+def _content_length(response) -> Optional[int]:
+    """압축 전송이 아닐 때만 Content-Length를 파일 크기로 사용"""
+    if response.headers.get("Content-Encoding", "identity") != "identity":
+        return None
+    length = response.headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+def _total_from_content_range(content_range: str) -> Optional[int]:
+    """'bytes 100-199/1000' 또는 'bytes */1000'에서 전체 크기 추출"""
+    total = content_range.rsplit("/", 1)[-1].strip()
+    return int(total) if total.isdigit() else None
+
+
+def _file_md5(path: Path) -> str:
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(config.DOWNLOAD_CHUNK_SIZE), b""):
+            md5.update(block)
+    return md5.hexdigest()
@@ -0,0 +1,70 @@
+"""
+Google Drive 배치 HTTP 요청 (여러 API 호출을 왕복 한 번으로)
+"""
+import time
+from googleapiclient.errors import HttpError
+
+
+class DriveBatch:
+    """googleapiclient 요청들을 모아 배치 엔드포인트로 실행
+
+    Drive 배치는 요청 100개가 한도라 그 단위로 나눠 보낸다.
+    배치 안의 개별 요청이 429/5xx로 실패하면 그 요청만 모아 다시 보낸다.
+
+    사용 예:
+        batch = DriveBatch(service)
+        for name in names:
+            batch.add(service.files().create(body={...}, fields='id'))
+        for response, error in batch.execute():
+            ...
+    """
+
+    MAX_BATCH_SIZE = 100
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, service, max_retries: int = 3):
+        self.service = service
+        self.max_retries = max_retries
+        self._requests = []
+
+    def add(self, request) -> int:
+        """요청 추가. 결과 리스트에서의 인덱스 반환"""
+        self._requests.append(request)
+        return len(self._requests) - 1
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def execute(self) -> list:
+        """
+        모은 요청 실행
+
+        Returns:
+            [(응답, 예외), ...] - add() 순서, 성공이면 예외 None
+        """
+        results = [(None, None)] * len(self._requests)
+        pending = list(range(len(self._requests)))
+
+        for attempt in range(self.max_retries):
+            for start in range(0, len(pending), self.MAX_BATCH_SIZE):
+                self._execute_chunk(pending[start:start + self.MAX_BATCH_SIZE], results)
+
+            pending = [i for i in pending if self._should_retry(results[i][1])]
+            if not pending or attempt == self.max_retries - 1:
+                break
+            time.sleep(2 ** attempt)
+
+        self._requests = []
+        return results
+
+    def _execute_chunk(self, indexes: list, results: list):
+        def callback(request_id, response, exception):
+            results[int(request_id)] = (response, exception)
+
+        batch = self.service.new_batch_http_request(callback=callback)
+        for index in indexes:
+            batch.add(self._requests[index], request_id=str(index))
+        batch.execute()
+
+    def _should_retry(self, error) -> bool:
+        return isinstance(error, HttpError) and error.resp.status in self.RETRY_STATUSES
@@ -0,0 +1,65 @@
+"""
+Google Drive (폴더 ID, 파일명) → 파일 ID 캐시 (디스크 저장)
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+import config
+
+
+class DriveFileCache:
+    """업로드 전 "같은 이름 파일이 있는지" 검색을 없애기 위한 파일 ID 캐시
+
+    {폴더 ID: {파일명: 파일 ID}} 형태로 JSON 파일에 저장한다.
+    다른 기기에서 올린 파일을 놓치지 않도록 폴더마다 세션당 한 번
+    전체 목록으로 덮어쓰며(warm), 그 여부는 메모리에만 기록한다.
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file = Path(cache_file or config.DRIVE_FILE_CACHE_FILE)
+        self._lock = threading.Lock()
+        self._warmed = set()  # 이번 세션에 목록을 받아 온 폴더 ID
+        self._folders = self._load()
+
+    def get(self, folder_id: str, file_name: str) -> Optional[str]:
+        with self._lock:
+            return self._folders.get(folder_id, {}).get(file_name)
+
+    def set(self, folder_id: str, file_name: str, file_id: str):
+        with self._lock:
+            self._folders.setdefault(folder_id, {})[file_name] = file_id
+            self._save()
+
+    def remove(self, folder_id: str, file_name: str):
+        with self._lock:
+            if self._folders.get(folder_id, {}).pop(file_name, None) is not None:
+                self._save()
+
+    def is_warm(self, folder_id: str) -> bool:
+        with self._lock:
+            return folder_id in self._warmed
+
+    def set_folder(self, folder_id: str, files: dict):
+        """폴더 전체 목록으로 교체 ({파일명: 파일 ID})"""
+        with self._lock:
+            self._folders[folder_id] = dict(files)
+            self._warmed.add(folder_id)
+            self._save()
+
+    def _load(self) -> dict:
+        if not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """캐시 파일 저장 (락을 잡은 상태에서 호출)"""
+        tmp_path = self.cache_file.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._folders, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_file)
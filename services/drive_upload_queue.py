@@ -0,0 +1,167 @@
+"""
+Google Drive 업로드 백그라운드 큐 (재시작 후에도 유지)
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, TYPE_CHECKING
+import config
+
+if TYPE_CHECKING:
+    from services.google_drive_manager import GoogleDriveManager
+
+
+class DriveUploadQueue:
+    """mp3 업로드를 워커 스레드가 처리하는 영속 큐
+
+    대기 중인 작업은 JSON 파일에 저장되어 앱을 다시 켜도 이어서 올린다.
+    실패하면 지수 백오프로 재시도하고, max_retries를 넘으면 포기한다.
+    Drive가 연결되지 않은 동안에는 시도 횟수를 쓰지 않고 기다린다.
+    상태가 바뀔 때마다 on_status(song_id, status, error)를 워커 스레드에서 호출한다
+    (status: "uploading", "done", "pending"(재시도 대기), "failed").
+    drive_manager는 워커 스레드에서 쓰므로 스레드마다 서비스 객체를 따로 만들어야 한다
+    (GoogleDriveManager.service가 그렇게 동작함 - httplib2 연결은 스레드 간 공유 불가).
+    """
+
+    def __init__(
+        self,
+        get_drive_manager: Callable[[], Optional["GoogleDriveManager"]],
+        on_status: Optional[Callable[[str, str, Optional[str]], None]] = None,
+        queue_file: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+        max_retries: Optional[int] = None
+    ):
+        self.get_drive_manager = get_drive_manager
+        self.on_status = on_status
+        self.queue_file = Path(queue_file or config.DRIVE_UPLOAD_QUEUE_FILE)
+        self.max_workers = max_workers or config.DRIVE_UPLOAD_WORKERS
+        self.max_retries = max_retries or config.DRIVE_UPLOAD_MAX_RETRIES
+
+        self._cond = threading.Condition()
+        self._jobs = self._load()
+        self._active = set()  # 워커가 처리 중인 song_id
+
+        for i in range(self.max_workers):
+            threading.Thread(target=self._worker, name=f"drive-upload-{i}", daemon=True).start()
+
+    def enqueue(self, song_id: str, file_path: str, is_odd: bool, genre: Optional[str] = None):
+        """업로드 작업 추가 (같은 곡이 이미 대기 중이면 교체)"""
+        job = {
+            "song_id": song_id,
+            "file_path": str(file_path),
+            "is_odd": is_odd,
+            "genre": genre or "",
+            "attempts": 0,
+            "next_attempt_at": 0,
+            "last_error": None,
+        }
+        with self._cond:
+            self._jobs = [j for j in self._jobs if j["song_id"] != song_id]
+            self._jobs.append(job)
+            self._save()
+            self._cond.notify()
+
+    def get_pending(self) -> list:
+        """대기/재시도 중인 작업 목록 (사본)"""
+        with self._cond:
+            return [
+                dict(job, uploading=job["song_id"] in self._active)
+                for job in self._jobs
+            ]
+
+    def _worker(self):
+        while True:
+            job = self._take()
+            drive_manager = self.get_drive_manager()
+
+            if not (drive_manager and drive_manager.is_connected()):
+                # Drive 연결 전 - 시도 횟수를 쓰지 않고 나중에 다시
+                self._release(job, delay=config.DRIVE_UPLOAD_RETRY_BASE)
+                continue
+
+            self._notify(job["song_id"], "uploading", None)
+            error = None
+            try:
+                if not Path(job["file_path"]).exists():
+                    error = "로컬 파일 없음"
+                elif not drive_manager.upload_file(job["file_path"], is_odd=job["is_odd"], genre=job["genre"] or None):
+                    error = "업로드 실패"
+            except Exception as e:
+                error = str(e)
+
+            if error is None:
+                self._finish(job)
+                self._notify(job["song_id"], "done", None)
+                continue
+
+            job["attempts"] += 1
+            job["last_error"] = error
+            if job["attempts"] >= self.max_retries or error == "로컬 파일 없음":
+                self._finish(job)
+                self._notify(job["song_id"], "failed", error)
+            else:
+                delay = min(config.DRIVE_UPLOAD_RETRY_BASE * 2 ** (job["attempts"] - 1), config.DRIVE_UPLOAD_RETRY_MAX)
+                self._release(job, delay=delay)
+                self._notify(job["song_id"], "pending", error)
+
+    def _take(self) -> dict:
+        """시도할 때가 된 작업 하나를 꺼냄 (없으면 대기)"""
+        with self._cond:
+            while True:
+                now = time.time()
+                ready = [
+                    j for j in self._jobs
+                    if j["song_id"] not in self._active and j["next_attempt_at"] <= now
+                ]
+                if ready:
+                    job = min(ready, key=lambda j: j["next_attempt_at"])
+                    self._active.add(job["song_id"])
+                    return job
+
+                waiting = [j["next_attempt_at"] for j in self._jobs if j["song_id"] not in self._active]
+                self._cond.wait(timeout=max(min(waiting) - now, 0.1) if waiting else None)
+
+    def _release(self, job: dict, delay: float):
+        """재시도 시각을 정해 큐에 되돌림"""
+        with self._cond:
+            job["next_attempt_at"] = time.time() + delay
+            self._active.discard(job["song_id"])
+            self._save()
+            self._cond.notify()
+
+    def _finish(self, job: dict):
+        """작업을 큐에서 제거"""
+        with self._cond:
+            self._jobs = [j for j in self._jobs if j is not job]
+            self._active.discard(job["song_id"])
+            self._save()
+
+    def _notify(self, song_id: str, status: str, error: Optional[str]):
+        if not self.on_status:
+            return
+        try:
+            self.on_status(song_id, status, error)
+        except Exception as e:
+            print(f"업로드 상태 기록 실패 ({song_id}): {e}")
+
+    def _load(self) -> list:
+        if not self.queue_file.exists():
+            return []
+        try:
+            with open(self.queue_file, "r", encoding="utf-8") as f:
+                jobs = json.load(f)
+        except (OSError, ValueError):
+            return []
+        # 재시작 직후에는 바로 시도
+        for job in jobs:
+            job["next_attempt_at"] = 0
+        return jobs
+
+    def _save(self):
+        """큐 파일 저장 (락을 잡은 상태에서 호출)"""
+        tmp_path = self.queue_file.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._jobs, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.queue_file)
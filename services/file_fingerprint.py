@@ -0,0 +1,100 @@
+"""
+로컬 오디오 파일 지문(크기/수정 시각/md5) 캐시
+"""
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+import config
+
+
+class FileFingerprintCache:
+    """경로 → {"size", "mtime_ns", "md5"}를 디스크에 저장해 두고
+    크기나 수정 시각이 바뀐 파일만 다시 해시한다
+
+    해시는 스레드 풀에서 병렬로 계산한다 (hashlib은 큰 버퍼를 처리하는 동안
+    GIL을 놓으므로 여러 코어를 쓴다).
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None, max_workers: Optional[int] = None):
+        self.cache_file = Path(cache_file or config.FILE_FINGERPRINT_CACHE_FILE)
+        self.max_workers = max_workers or config.FINGERPRINT_WORKERS
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def fingerprints(self, paths: list) -> dict:
+        """
+        여러 파일의 지문 조회 (필요한 것만 해시)
+
+        Returns:
+            {경로: {"size", "mtime_ns", "md5"}} - 없는 파일은 빠짐
+        """
+        result = {}
+        stale = []
+        removed = False
+
+        with self._lock:
+            for path in paths:
+                key = str(path)
+                try:
+                    stat = os.stat(key)
+                except OSError:
+                    removed = self._entries.pop(key, None) is not None or removed
+                    continue
+
+                entry = self._entries.get(key)
+                if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                    result[key] = entry
+                else:
+                    stale.append((key, stat.st_size, stat.st_mtime_ns))
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(stale))) as executor:
+                hashes = list(executor.map(self._hash, [key for key, _, _ in stale]))
+
+            with self._lock:
+                for (key, size, mtime_ns), md5 in zip(stale, hashes):
+                    if md5 is None:
+                        continue
+                    entry = {"size": size, "mtime_ns": mtime_ns, "md5": md5}
+                    self._entries[key] = entry
+                    result[key] = entry
+
+        if stale or removed:
+            with self._lock:
+                self._save()
+        return result
+
+    def md5s(self, paths: list) -> dict:
+        """{경로: md5}"""
+        return {path: entry["md5"] for path, entry in self.fingerprints(paths).items()}
+
+    @staticmethod
+    def _hash(path: str) -> Optional[str]:
+        md5 = hashlib.md5()
+        try:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    md5.update(block)
+        except OSError:
+            return None
+        return md5.hexdigest()
+
+    def _load(self) -> dict:
+        if not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """캐시 파일 저장 (락을 잡은 상태에서 호출)"""
+        tmp_path = self.cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_file)
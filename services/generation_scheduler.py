@@ -0,0 +1,140 @@
+"""
+슬라이딩 윈도우 생성 스케줄러 - 슬롯이 비는 즉시 다음 곡을 투입
+"""
+from collections import deque
+from typing import Callable, Optional, TYPE_CHECKING
+import config
+
+if TYPE_CHECKING:
+    from services.suno_client import SunoClient
+    from services.task_manager import TaskManager
+
+
+class GenerationScheduler:
+    """항상 max_parallel개의 Suno 태스크가 진행 중이도록 유지하는 스케줄러
+
+    한 곡이 끝나면 다음 폴링 라운드를 기다리지 않고 바로 빈 슬롯을 채운다.
+    하루 크레딧 한도(DAILY_CREDIT_LIMIT)를 넘는 요청은 보내지 않는다.
+
+    진행 이벤트 (on_event에 dict로 전달):
+        submitted: Suno 요청 완료 - job, task_id, prompt_data
+        completed: 생성 및 저장 완료 - job, task_id, prompt_data, clips
+        failed: 요청 또는 생성 실패 - job, stage("request"/"generate"), error
+        budget_exhausted: 크레딧 한도 도달 - skipped (건너뛴 작업 수)
+        모든 이벤트에 공통으로 done, total, in_flight 포함
+    """
+
+    def __init__(
+        self,
+        suno_client: "SunoClient",
+        task_manager: "TaskManager",
+        max_parallel: Optional[int] = None,
+        daily_credit_limit: Optional[int] = None,
+        on_event: Optional[Callable[[dict], None]] = None
+    ):
+        self.suno_client = suno_client
+        self.task_manager = task_manager
+        self.max_parallel = max_parallel or config.MAX_PARALLEL_GENERATIONS
+        self.daily_credit_limit = daily_credit_limit if daily_credit_limit is not None else config.DAILY_CREDIT_LIMIT
+        self.on_event = on_event
+
+        self._total = 0
+        self._done = 0
+        self._in_flight = {}  # task_id -> (job, prompt_data)
+
+    def run(
+        self,
+        jobs: list,
+        prepare: Callable[[dict], dict],
+        on_complete: Callable[[dict, dict, list], None]
+    ) -> dict:
+        """
+        작업 목록 실행
+
+        Args:
+            jobs: 작업 리스트 (각 항목은 prepare에 그대로 전달됨)
+            prepare: job -> prompt_data (title/style/lyrics), Suno 요청 직전에 호출
+            on_complete: (job, prompt_data, clips) -> None, 다운로드/저장 처리
+
+        Returns:
+            {"success": 성공 수, "failed": 실패 수, "skipped": 크레딧 한도로 건너뛴 수}
+        """
+        queue = deque(jobs)
+        poller = self.suno_client.create_poller()
+        result = {"success": 0, "failed": 0, "skipped": 0}
+
+        self._total = len(jobs)
+        self._done = 0
+        self._in_flight = {}
+
+        while queue or self._in_flight:
+            # 빈 슬롯 채우기
+            while queue and len(self._in_flight) < self.max_parallel:
+                if not self.has_budget():
+                    result["skipped"] = len(queue)
+                    self._done += len(queue)
+                    queue.clear()
+                    self._emit("budget_exhausted", skipped=result["skipped"])
+                    break
+
+                job = queue.popleft()
+                try:
+                    prompt_data = prepare(job)
+                    task_id = self.suno_client.generate_async(
+                        prompt=prompt_data.get("lyrics", ""),
+                        style=prompt_data.get("style", ""),
+                        title=prompt_data.get("title", "")
+                    )
+                except Exception as e:
+                    result["failed"] += 1
+                    self._done += 1
+                    self._emit("failed", job=job, stage="request", error=str(e))
+                    continue
+
+                self.task_manager.add_task(task_id, prompt_data, job.get("genre"))
+                self._in_flight[task_id] = (job, prompt_data)
+                poller.add(task_id)
+                self._emit("submitted", job=job, task_id=task_id, prompt_data=prompt_data)
+
+            if not self._in_flight:
+                continue
+
+            # 끝난 태스크 처리 (다음 루프에서 바로 슬롯 보충)
+            for task_id, clips, error in poller.poll():
+                job, prompt_data = self._in_flight.pop(task_id)
+                self._done += 1
+
+                try:
+                    if error:
+                        raise Exception(error)
+                    on_complete(job, prompt_data, clips)
+                except Exception as e:
+                    self.task_manager.fail_task(task_id, str(e))
+                    result["failed"] += 1
+                    self._emit("failed", job=job, task_id=task_id, prompt_data=prompt_data, stage="generate", error=str(e))
+                    continue
+
+                self.task_manager.complete_task(task_id, clips)
+                result["success"] += 1
+                self._emit("completed", job=job, task_id=task_id, prompt_data=prompt_data, clips=clips)
+
+        return result
+
+    def has_budget(self) -> bool:
+        """오늘 크레딧 한도 내에서 한 곡 더 요청 가능한지 확인"""
+        if not self.daily_credit_limit:
+            return True
+        used = self.task_manager.count_today_tasks() * config.CREDITS_PER_SONG
+        return used + config.CREDITS_PER_SONG <= self.daily_credit_limit
+
+    def _emit(self, event_type: str, **data):
+        """진행 이벤트 전달"""
+        if not self.on_event:
+            return
+        data.update({
+            "type": event_type,
+            "done": self._done,
+            "total": self._total,
+            "in_flight": len(self._in_flight),
+        })
+        self.on_event(data)
@@ -1,14 +1,21 @@
 """Google Drive 연동 매니저 (OAuth 방식)"""
 import os
 import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
 import io
+import config
+from services.drive_batch import DriveBatch
+from services.drive_file_cache import DriveFileCache
 
 
 class GoogleDriveManager:
@@ -24,12 +31,21 @@ class GoogleDriveManager:
             credentials_dict: Streamlit Cloud용 - credentials dict (미사용, 호환성 유지)
         """
         self.root_folder_id = folder_id
-        self.service = None
+        # 인증 정보만 공유하고 서비스 객체는 스레드마다 따로 만듦 (httplib2는 스레드 간 공유 불가)
+        self._credentials = None
+        self._local = threading.local()
+        self._folder_lock = threading.Lock()
+        self._sessions_lock = threading.Lock()
+        self.upload_sessions_file = Path(config.DRIVE_UPLOAD_SESSIONS_FILE)
         # 기존 홀짝 폴더 (하위 호환)
         self.odd_folder_id = None
         self.even_folder_id = None
-        # 장르별 폴더 캐시: {"팝": {"홀수": "id", "짝수": "id"}, ...}
+        # 장르별 폴더 캐시: {"팝": {"id": "장르 폴더 id", "홀수": "id", "짝수": "id"}, ...}
+        # 루트 폴더별로 디스크에 저장해 두고, 쓰다가 404가 나면 그때 다시 찾음
         self.genre_folders = {}
+        self.folder_cache_file = Path(config.DRIVE_FOLDER_CACHE_FILE)
+        # (폴더 ID, 파일명) → 파일 ID 캐시 (업로드 전 검색 생략)
+        self.file_cache = DriveFileCache()
 
         # 프로젝트 루트 경로
         self.base_dir = Path(__file__).parent.parent
@@ -38,55 +54,118 @@ class GoogleDriveManager:
 
         # OAuth 인증
         try:
-            creds = None
-
-            # 저장된 토큰이 있으면 로드
-            if self.token_path.exists():
-                creds = Credentials.from_authorized_user_file(str(self.token_path), self.SCOPES)
-
-            # 토큰이 없거나 만료됐으면 새로 인증
-            if not creds or not creds.valid:
-                if creds and creds.expired and creds.refresh_token:
-                    # 토큰 갱신
-                    creds.refresh(Request())
-                else:
-                    # 새 인증 (브라우저 열림)
-                    if not self.oauth_credentials_path.exists():
-                        return
-
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        str(self.oauth_credentials_path), self.SCOPES
-                    )
-                    creds = flow.run_local_server(port=0)
-
-                # 토큰 저장
-                with open(self.token_path, 'w') as token:
-                    token.write(creds.to_json())
-
-            self.service = build('drive', 'v3', credentials=creds)
+            self._credentials = self._authenticate()
+            if self._credentials is None:
+                return
             self._ensure_folder_structure()
+            # 자주 쓰는 폴더의 파일 목록을 미리 받아 둠 (폴더당 목록 조회 1회)
+            for folder_id in (self.root_folder_id, self.odd_folder_id, self.even_folder_id):
+                self._warm_file_cache(folder_id)
 
         except Exception as e:
             print(f"Google Drive 인증 실패: {e}")
-            self.service = None
+            self._credentials = None
+
+    def _authenticate(self) -> Optional[Credentials]:
+        """저장된 토큰 로드/갱신, 없으면 브라우저 인증. OAuth 설정 파일이 없으면 None"""
+        creds = None
+
+        # 저장된 토큰이 있으면 로드
+        if self.token_path.exists():
+            creds = Credentials.from_authorized_user_file(str(self.token_path), self.SCOPES)
+
+        # 토큰이 없거나 만료됐으면 새로 인증
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                # 토큰 갱신
+                creds.refresh(Request())
+            else:
+                # 새 인증 (브라우저 열림)
+                if not self.oauth_credentials_path.exists():
+                    return None
+
+                flow = InstalledAppFlow.from_client_secrets_file(
+                    str(self.oauth_credentials_path), self.SCOPES
+                )
+                creds = flow.run_local_server(port=0)
+
+            # 토큰 저장
+            with open(self.token_path, 'w') as token:
+                token.write(creds.to_json())
+
+        return creds
+
+    @property
+    def service(self):
+        """현재 스레드의 Drive 서비스 객체 (미연결이면 None)"""
+        if self._credentials is None:
+            return None
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = build('drive', 'v3', credentials=self._credentials)
+            self._local.service = service
+        return service
 
     def is_connected(self) -> bool:
         """Drive 연결 상태 확인"""
-        return self.service is not None
+        return self._credentials is not None
 
     def _ensure_folder_structure(self):
-        """홀수/짝수 폴더 구조 확인"""
+        """홀수/짝수 및 장르별 폴더 구조 확인 (디스크 캐시에 다 있으면 API 호출 없음)"""
         if not self.service:
             return
 
         try:
-            # 홀수 폴더 (검색만, 자동생성 안 함)
-            self.odd_folder_id = self._find_or_create_folder("홀수", self.root_folder_id)
-            # 짝수 폴더 (검색만, 자동생성 안 함)
-            self.even_folder_id = self._find_or_create_folder("짝수", self.root_folder_id)
+            self._load_folder_cache()
+            complete = self.odd_folder_id and self.even_folder_id and all(
+                "홀수" in self.genre_folders.get(genre, {}) and "짝수" in self.genre_folders.get(genre, {})
+                for genre in config.GENRE_LIST
+            )
+            if not complete:
+                self.provision_folders()
         except Exception as e:
             print(f"폴더 구조 확인 실패: {e}")
 
+    def provision_folders(self, genres: Optional[list] = None):
+        """루트의 홀수/짝수 폴더와 모든 장르의 홀수/짝수 폴더를 일괄 확인/생성
+
+        단계마다 배치 요청 1번씩(루트 목록, 장르 폴더 생성, 장르별 하위 목록, 홀짝 폴더 생성)이라
+        장르 수와 무관하게 왕복 4번 정도로 끝난다.
+        """
+        genres = list(genres or config.GENRE_LIST)
+
+        # 1) 루트 바로 아래 폴더 확인, 없는 것 생성
+        root_children = self._list_child_folders([self.root_folder_id])[self.root_folder_id]
+        missing = [name for name in ["홀수", "짝수"] + genres if name not in root_children]
+        for (name, _), folder_id in self._create_folders([(name, self.root_folder_id) for name in missing]).items():
+            root_children[name] = folder_id
+
+        self.odd_folder_id = root_children.get("홀수")
+        self.even_folder_id = root_children.get("짝수")
+
+        # 2) 장르 폴더 아래 홀수/짝수 확인, 없는 것 생성
+        genre_ids = {genre: root_children[genre] for genre in genres if root_children.get(genre)}
+        genre_children = self._list_child_folders(list(genre_ids.values()))
+        missing = [
+            (odd_even, genre_id)
+            for genre_id in genre_ids.values()
+            for odd_even in ("홀수", "짝수")
+            if odd_even not in genre_children.get(genre_id, {})
+        ]
+        for (odd_even, genre_id), folder_id in self._create_folders(missing).items():
+            genre_children.setdefault(genre_id, {})[odd_even] = folder_id
+
+        for genre, genre_id in genre_ids.items():
+            entry = {"id": genre_id}
+            entry.update({
+                odd_even: folder_id
+                for odd_even, folder_id in genre_children.get(genre_id, {}).items()
+                if odd_even in ("홀수", "짝수")
+            })
+            self.genre_folders[genre] = entry
+
+        self._save_folder_cache()
+
     def _get_genre_folder(self, genre: str, is_odd: bool) -> str:
         """장르별 홀짝 폴더 ID 가져오기 (없으면 생성)
 
@@ -107,21 +186,144 @@ class GoogleDriveManager:
             if odd_even in self.genre_folders[genre]:
                 return self.genre_folders[genre][odd_even]
 
-        # 장르 폴더 찾기/생성
-        genre_folder_id = self._find_or_create_folder(genre, self.root_folder_id)
-        if not genre_folder_id:
-            return ""
+        # 여러 업로드 스레드가 같은 폴더를 중복 생성하지 않도록 한 번에 하나만
+        with self._folder_lock:
+            if odd_even in self.genre_folders.get(genre, {}):
+                return self.genre_folders[genre][odd_even]
+
+            # 장르 폴더 찾기/생성
+            genre_folder_id = self.genre_folders.get(genre, {}).get("id") or self._find_or_create_folder(genre, self.root_folder_id)
+            if not genre_folder_id:
+                return ""
 
-        # 홀짝 폴더 찾기/생성
-        odd_even_folder_id = self._find_or_create_folder(odd_even, genre_folder_id)
+            # 홀짝 폴더 찾기/생성
+            odd_even_folder_id = self._find_or_create_folder(odd_even, genre_folder_id)
+            if not odd_even_folder_id:
+                return ""
 
-        # 캐시에 저장
-        if genre not in self.genre_folders:
-            self.genre_folders[genre] = {}
-        self.genre_folders[genre][odd_even] = odd_even_folder_id
+            # 캐시에 저장
+            if genre not in self.genre_folders:
+                self.genre_folders[genre] = {"id": genre_folder_id}
+            self.genre_folders[genre][odd_even] = odd_even_folder_id
+            self._save_folder_cache()
 
         return odd_even_folder_id
 
+    def _forget_folder(self, genre: Optional[str], is_odd: bool):
+        """Drive에서 사라진 것으로 확인된 폴더를 캐시에서 제거"""
+        if genre:
+            self.genre_folders.pop(genre, None)
+        elif is_odd:
+            self.odd_folder_id = self._find_or_create_folder("홀수", self.root_folder_id)
+        else:
+            self.even_folder_id = self._find_or_create_folder("짝수", self.root_folder_id)
+        self._save_folder_cache()
+
+    def _list_child_folders(self, parent_ids: list) -> dict:
+        """여러 폴더의 하위 폴더를 배치 요청으로 조회 → {부모 ID: {폴더명: 폴더 ID}}"""
+        children = {parent_id: {} for parent_id in parent_ids}
+        pending = [(parent_id, None) for parent_id in parent_ids]
+
+        while pending:
+            batch = DriveBatch(self.service)
+            for parent_id, page_token in pending:
+                batch.add(self.service.files().list(
+                    q=f"'{parent_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false",
+                    spaces='drive',
+                    fields='nextPageToken, files(id, name)',
+                    pageSize=1000,
+                    pageToken=page_token
+                ))
+            next_pending = []
+            for (parent_id, _), (response, error) in zip(pending, batch.execute()):
+                if error:
+                    raise error
+                for item in response.get('files', []):
+                    children[parent_id].setdefault(item['name'], item['id'])
+                if response.get('nextPageToken'):
+                    next_pending.append((parent_id, response['nextPageToken']))
+            pending = next_pending
+
+        return children
+
+    def _create_folders(self, folders: list) -> dict:
+        """[(폴더명, 부모 ID), ...]를 배치 요청으로 생성 → {(폴더명, 부모 ID): 폴더 ID}"""
+        batch = DriveBatch(self.service)
+        for name, parent_id in folders:
+            batch.add(self.service.files().create(
+                body={
+                    'name': name,
+                    'mimeType': 'application/vnd.google-apps.folder',
+                    'parents': [parent_id]
+                },
+                fields='id'
+            ))
+        created = {}
+        for folder, (response, error) in zip(folders, batch.execute()):
+            if error:
+                print(f"폴더 생성 실패 ({folder[0]}): {error}")
+                continue
+            created[folder] = response.get('id')
+        return created
+
+    def batch_update_metadata(self, updates: list) -> dict:
+        """
+        여러 파일의 메타데이터만(내용 제외) 배치 요청으로 수정 - 이름 변경, 폴더 이동 등
+
+        Args:
+            updates: [{"file_id": 파일 ID, "body": 변경할 필드(선택),
+                       "add_parents": 새 부모 폴더 ID(선택), "remove_parents": 뺄 부모 폴더 ID(선택)}, ...]
+
+        Returns:
+            {file_id: None(성공) 또는 오류 메시지}
+        """
+        if not self.service:
+            return {update["file_id"]: "Drive 미연결" for update in updates}
+
+        batch = DriveBatch(self.service)
+        for update in updates:
+            params = {"fileId": update["file_id"], "body": update.get("body", {}), "fields": "id"}
+            if update.get("add_parents"):
+                params["addParents"] = update["add_parents"]
+            if update.get("remove_parents"):
+                params["removeParents"] = update["remove_parents"]
+            batch.add(self.service.files().update(**params))
+
+        return {
+            update["file_id"]: str(error) if error else None
+            for update, (_, error) in zip(updates, batch.execute())
+        }
+
+    def _load_folder_cache(self):
+        """디스크에 저장된 이 루트 폴더의 폴더 트리 로드"""
+        try:
+            with open(self.folder_cache_file, "r", encoding="utf-8") as f:
+                tree = json.load(f).get(self.root_folder_id, {})
+        except (OSError, ValueError):
+            return
+
+        self.odd_folder_id = tree.get("홀수")
+        self.even_folder_id = tree.get("짝수")
+        self.genre_folders = tree.get("genres", {})
+
+    def _save_folder_cache(self):
+        """폴더 트리 저장 (다른 루트 폴더의 항목은 유지)"""
+        try:
+            with open(self.folder_cache_file, "r", encoding="utf-8") as f:
+                trees = json.load(f)
+        except (OSError, ValueError):
+            trees = {}
+
+        trees[self.root_folder_id] = {
+            "홀수": self.odd_folder_id,
+            "짝수": self.even_folder_id,
+            "genres": self.genre_folders,
+        }
+        tmp_path = self.folder_cache_file.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(trees, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.folder_cache_file)
+
     def _find_or_create_folder(self, folder_name: str, parent_id: str) -> str:
         """폴더 검색, 없으면 생성"""
         if not self.service:
@@ -191,48 +393,191 @@ class GoogleDriveManager:
                     return False
                 file_name = file_path_obj.name
                 mime_type = 'audio/mpeg' if file_name.endswith('.mp3') else 'application/octet-stream'
-                media = MediaFileUpload(str(file_path), mimetype=mime_type, resumable=True)
+                media = MediaFileUpload(str(file_path), mimetype=mime_type, chunksize=config.DRIVE_UPLOAD_CHUNK_SIZE, resumable=True)
+                # 끊긴 업로드를 이어받기 전에 파일이 그대로인지 확인하는 값
+                stat = file_path_obj.stat()
+                content_id = f"{stat.st_size}:{stat.st_mtime_ns}"
             elif file_data and file_name:
                 mime_type = 'audio/mpeg' if file_name.endswith('.mp3') else 'application/octet-stream'
-                media = MediaIoBaseUpload(io.BytesIO(file_data), mimetype=mime_type, resumable=True)
+                media = MediaIoBaseUpload(io.BytesIO(file_data), mimetype=mime_type, chunksize=config.DRIVE_UPLOAD_CHUNK_SIZE, resumable=True)
+                content_id = hashlib.md5(file_data).hexdigest()
             else:
                 return False
 
-            # 기존 파일 검색 (덮어쓰기)
-            query = f"name='{file_name}' and '{folder_id}' in parents and trashed=false"
-            results = self.service.files().list(
-                q=query,
-                spaces='drive',
-                fields='files(id)'
-            ).execute()
-
-            items = results.get('files', [])
-
-            if items:
-                # 업데이트
-                file_id = items[0]['id']
-                self.service.files().update(
-                    fileId=file_id,
-                    media_body=media
-                ).execute()
-            else:
-                # 새로 생성
-                file_metadata = {
-                    'name': file_name,
-                    'parents': [folder_id]
-                }
-                self.service.files().create(
-                    body=file_metadata,
-                    media_body=media,
-                    fields='id'
-                ).execute()
-
+            try:
+                self._put_file(folder_id, file_name, media, content_id)
+            except HttpError as e:
+                # 캐시된 폴더가 Drive에서 지워진 경우 - 폴더를 다시 찾아 한 번 더
+                if e.resp.status != 404:
+                    raise
+                self._forget_folder(genre, is_odd)
+                folder_id = self._get_genre_folder(genre, is_odd) if genre else (self.odd_folder_id if is_odd else self.even_folder_id)
+                if not folder_id:
+                    return False
+                self._put_file(folder_id, file_name, media, content_id)
             return True
 
         except Exception as e:
             print(f"파일 업로드 실패 ({file_name or file_path}): {e}")
             return False
 
+    def upload_files(self, files: list, max_workers: Optional[int] = None) -> dict:
+        """
+        여러 파일을 동시에 업로드 (스레드마다 별도 서비스 객체 사용)
+
+        Args:
+            files: [{"file_path": 경로, "is_odd": bool, "genre": 장르(선택)}, ...]
+            max_workers: 동시 업로드 수
+
+        Returns:
+            {file_path: 성공 여부}
+        """
+        if not files:
+            return {}
+
+        def upload(item: dict) -> bool:
+            return self.upload_file(item["file_path"], is_odd=item.get("is_odd", True), genre=item.get("genre"))
+
+        max_workers = max_workers or config.DRIVE_UPLOAD_WORKERS
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as executor:
+            results = list(executor.map(upload, files))
+
+        return {item["file_path"]: ok for item, ok in zip(files, results)}
+
+    def sync_files(self, files: list, max_workers: Optional[int] = None, get_md5s=None) -> dict:
+        """
+        로컬 파일을 Drive와 비교해 없거나 내용이 다른 파일만 업로드
+
+        대상 폴더마다 목록을 한 번씩만(배치 요청) 받아 md5Checksum을 비교하므로
+        이미 올라간 파일은 API 호출 없이 건너뛴다. 장르 폴더에 없는 파일이
+        홀수/짝수 루트 폴더(장르 없이 올린 예전 위치)에 같은 내용으로 있으면
+        다시 올리지 않고 배치 메타데이터 수정(batch_update_metadata)으로 옮긴다.
+
+        Args:
+            files: [{"file_path": 경로, "is_odd": bool, "genre": 장르(선택)}, ...]
+            max_workers: 동시 업로드 수
+            get_md5s: 경로 리스트 → {경로: md5} (로컬 해시 캐시용, 없으면 직접 계산)
+
+        Returns:
+            {"checked": 비교한 수, "uploaded": [경로], "moved": [경로], "unchanged": [경로], "failed": [경로]}
+        """
+        result = {"checked": 0, "uploaded": [], "moved": [], "unchanged": [], "failed": []}
+        if not self.service:
+            result["failed"] = [item["file_path"] for item in files]
+            return result
+
+        # 파일별 대상 폴더
+        targets = []
+        for item in files:
+            genre = item.get("genre")
+            is_odd = item.get("is_odd", True)
+            folder_id = self._get_genre_folder(genre, is_odd) if genre else (self.odd_folder_id if is_odd else self.even_folder_id)
+            if folder_id and Path(item["file_path"]).exists():
+                targets.append((item, folder_id))
+            else:
+                result["failed"].append(item["file_path"])
+
+        legacy_folders = {True: self.odd_folder_id, False: self.even_folder_id}
+        folder_ids = {folder_id for _, folder_id in targets}
+        folder_ids.update(
+            legacy_folders[item.get("is_odd", True)] for item, _ in targets
+            if item.get("genre") and legacy_folders[item.get("is_odd", True)]
+        )
+        remote = self._list_folder_details(sorted(folder_ids))
+
+        # 크기가 같은 파일만 md5 비교 대상 (크기가 다르면 해시할 필요도 없음)
+        to_upload = []
+        to_compare = []  # (항목, 대상 폴더 ID, Drive 파일, 찾은 폴더 ID)
+        for item, folder_id in targets:
+            path = Path(item["file_path"])
+            size = path.stat().st_size
+            remote_file = remote.get(folder_id, {}).get(path.name)
+            found_in = folder_id
+            if not remote_file and item.get("genre"):
+                found_in = legacy_folders[item.get("is_odd", True)]
+                remote_file = remote.get(found_in, {}).get(path.name)
+            result["checked"] += 1
+            if remote_file and int(remote_file.get("size", -1)) == size:
+                to_compare.append((item, folder_id, remote_file, found_in))
+            else:
+                to_upload.append(item)
+
+        paths = [item["file_path"] for item, _, _, _ in to_compare]
+        local_md5s = get_md5s(paths) if get_md5s else {path: self._file_md5(Path(path)) for path in paths}
+        moves = []
+        moving_ids = set()  # 예전 위치의 같은 파일은 한 곳으로만 옮김
+        for item, folder_id, remote_file, found_in in to_compare:
+            if remote_file.get("md5Checksum") != local_md5s.get(item["file_path"]):
+                to_upload.append(item)
+            elif found_in != folder_id:
+                if remote_file["id"] in moving_ids:
+                    to_upload.append(item)
+                else:
+                    moving_ids.add(remote_file["id"])
+                    moves.append((item, folder_id, remote_file, found_in))
+            else:
+                result["unchanged"].append(item["file_path"])
+
+        # 예전 위치의 파일은 배치 요청으로 장르 폴더로 이동 (실패하면 업로드)
+        if moves:
+            errors = self.batch_update_metadata([
+                {"file_id": remote_file["id"], "add_parents": folder_id, "remove_parents": found_in}
+                for _, folder_id, remote_file, found_in in moves
+            ])
+            for item, folder_id, remote_file, found_in in moves:
+                if errors.get(remote_file["id"]):
+                    to_upload.append(item)
+                    continue
+                name = Path(item["file_path"]).name
+                self.file_cache.remove(found_in, name)
+                self.file_cache.set(folder_id, name, remote_file["id"])
+                result["moved"].append(item["file_path"])
+
+        for file_path, ok in self.upload_files(to_upload, max_workers=max_workers).items():
+            result["uploaded" if ok else "failed"].append(file_path)
+
+        return result
+
+    def _list_folder_details(self, folder_ids: list) -> dict:
+        """여러 폴더의 파일 목록을 배치 요청으로 조회 → {폴더 ID: {파일명: {"id", "md5Checksum", "size"}}}
+
+        받은 목록으로 파일 ID 캐시도 갱신한다.
+        """
+        details = {folder_id: {} for folder_id in folder_ids}
+        pending = [(folder_id, None) for folder_id in folder_ids]
+
+        while pending:
+            batch = DriveBatch(self.service)
+            for folder_id, page_token in pending:
+                batch.add(self.service.files().list(
+                    q=f"'{folder_id}' in parents and mimeType!='application/vnd.google-apps.folder' and trashed=false",
+                    spaces='drive',
+                    fields='nextPageToken, files(id, name, md5Checksum, size)',
+                    pageSize=1000,
+                    pageToken=page_token
+                ))
+            next_pending = []
+            for (folder_id, _), (response, error) in zip(pending, batch.execute()):
+                if error:
+                    raise error
+                for item in response.get('files', []):
+                    details[folder_id].setdefault(item['name'], item)
+                if response.get('nextPageToken'):
+                    next_pending.append((folder_id, response['nextPageToken']))
+            pending = next_pending
+
+        for folder_id, files in details.items():
+            self.file_cache.set_folder(folder_id, {name: item['id'] for name, item in files.items()})
+        return details
+
+    @staticmethod
+    def _file_md5(path: Path) -> str:
+        md5 = hashlib.md5()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                md5.update(block)
+        return md5.hexdigest()
+
     def upload_metadata(self, metadata_path: str) -> bool:
         """
         metadata.json을 루트 폴더에 업로드
@@ -251,41 +596,171 @@ class GoogleDriveManager:
             if not metadata_path_obj.exists():
                 return False
 
-            file_name = metadata_path_obj.name
+            media = MediaFileUpload(str(metadata_path), mimetype='application/json')
+            self._put_file(self.root_folder_id, metadata_path_obj.name, media)
+            return True
 
-            # 기존 파일 검색
-            query = f"name='{file_name}' and '{self.root_folder_id}' in parents and trashed=false"
-            results = self.service.files().list(
-                q=query,
-                spaces='drive',
-                fields='files(id)'
-            ).execute()
+        except Exception as e:
+            print(f"metadata 업로드 실패: {e}")
+            return False
 
-            items = results.get('files', [])
+    def _put_file(self, folder_id: str, file_name: str, media, content_id: Optional[str] = None) -> str:
+        """폴더에 같은 이름 파일이 있으면 내용 교체, 없으면 생성. 파일 ID 반환
 
-            media = MediaFileUpload(str(metadata_path), mimetype='application/json', resumable=True)
+        캐시에 파일 ID가 있으면 API 호출 1번으로 끝난다.
+        content_id(크기+수정 시각 또는 md5)를 주면 끊긴 재개 가능 업로드를 이어받는다.
+        """
+        self._warm_file_cache(folder_id)
 
-            if items:
-                # 업데이트
-                file_id = items[0]['id']
-                self.service.files().update(
+        file_id = self.file_cache.get(folder_id, file_name)
+        if file_id:
+            try:
+                self._execute_upload(self.service.files().update(
                     fileId=file_id,
                     media_body=media
-                ).execute()
+                ), f"update:{file_id}", content_id)
+                return file_id
+            except HttpError as e:
+                # 캐시된 파일이 Drive에서 지워진 경우 - 새로 생성
+                if e.resp.status != 404:
+                    raise
+                self.file_cache.remove(folder_id, file_name)
+
+        file_metadata = {
+            'name': file_name,
+            'parents': [folder_id]
+        }
+        file_id = self._execute_upload(self.service.files().create(
+            body=file_metadata,
+            media_body=media,
+            fields='id'
+        ), f"create:{folder_id}/{file_name}", content_id).get('id')
+        self.file_cache.set(folder_id, file_name, file_id)
+        return file_id
+
+    def _execute_upload(self, request, session_key: str, content_id: Optional[str] = None) -> dict:
+        """업로드 요청 실행 - 재개 가능 업로드는 청크 단위로 보내고 세션 URI를 저장
+
+        이전에 끊긴 같은 요청(session_key와 content_id가 같음)의 세션이 남아 있으면
+        서버에 받은 위치를 물어 그다음 청크부터 이어서 보낸다.
+        content_id가 없으면 세션을 저장하지 않는다 (내용이 같은지 확인할 수 없음).
+        """
+        if not request.resumable:
+            return request.execute()
+
+        size = request.resumable.size()
+        saved = self._get_upload_session(session_key) if content_id else None
+        if saved and saved.get("content_id") == content_id:
+            offset, response = self._query_upload_session(request, saved["uri"], size)
+            if response is not None:
+                # 끊기기 전에 이미 다 올라감
+                self._set_upload_session(session_key, None)
+                return response
+            if offset is None:
+                # 세션 만료 (약 1주) - 처음부터 새 세션으로
+                saved = None
+                self._set_upload_session(session_key, None)
             else:
-                # 새로 생성
-                file_metadata = {
-                    'name': file_name,
-                    'parents': [self.root_folder_id]
-                }
-                self.service.files().create(
-                    body=file_metadata,
-                    media_body=media,
-                    fields='id'
-                ).execute()
+                request.resumable_uri = saved["uri"]
+                request.resumable_progress = offset
+        else:
+            saved = None
+
+        response = None
+        while response is None:
+            try:
+                _, response = request.next_chunk(num_retries=3)
+            except HttpError as e:
+                if saved and e.resp.status in (404, 410):
+                    saved = None
+                    self._set_upload_session(session_key, None)
+                    request.resumable_uri = None
+                    request.resumable_progress = 0
+                    continue
+                raise
+            finally:
+                # 첫 청크에서 끊겨도 이어받을 수 있도록 세션이 열리는 즉시 저장
+                if response is None and content_id and not saved and request.resumable_uri:
+                    saved = {"uri": request.resumable_uri, "content_id": content_id}
+                    self._set_upload_session(session_key, saved)
+
+        if saved:
+            self._set_upload_session(session_key, None)
+        return response
+
+    def _query_upload_session(self, request, uri: str, size: int) -> tuple:
+        """재개 가능 업로드 세션의 진행 위치 조회 (빈 PUT + Content-Range: bytes */크기)
 
-            return True
+        Returns:
+            (다음에 보낼 바이트 위치, 완료 응답) - 이미 완료면 (None, 응답),
+            세션이 만료됐으면 (None, None)
+        """
+        resp, content = request.http.request(
+            uri, "PUT", headers={"Content-Range": f"bytes */{size}", "Content-Length": "0"}
+        )
+        if resp.status in (200, 201):
+            return None, request.postproc(resp, content)
+        if resp.status == 308:
+            # Range: bytes=0-N (받은 게 없으면 헤더 없음)
+            if "range" in resp:
+                return int(resp["range"].split("-")[1]) + 1, None
+            return 0, None
+        if resp.status in (404, 410):
+            return None, None
+        raise HttpError(resp, content, uri=uri)
+
+    def _get_upload_session(self, session_key: str) -> Optional[dict]:
+        with self._sessions_lock:
+            return self._load_upload_sessions().get(session_key)
+
+    def _set_upload_session(self, session_key: str, session: Optional[dict]):
+        """재개 가능 업로드 세션 저장 (None이면 삭제)"""
+        with self._sessions_lock:
+            sessions = self._load_upload_sessions()
+            if session:
+                sessions[session_key] = session
+            else:
+                sessions.pop(session_key, None)
+
+            tmp_path = self.upload_sessions_file.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(sessions, f, ensure_ascii=False)
+            os.replace(tmp_path, self.upload_sessions_file)
 
+    def _load_upload_sessions(self) -> dict:
+        try:
+            with open(self.upload_sessions_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _warm_file_cache(self, folder_id: str):
+        """이번 세션에 아직 안 받았으면 폴더 파일 목록을 받아 캐시 갱신"""
+        if not folder_id or self.file_cache.is_warm(folder_id):
+            return
+
+        try:
+            self.file_cache.set_folder(folder_id, self._list_folder_files(folder_id))
         except Exception as e:
-            print(f"metadata 업로드 실패: {e}")
-            return False
+            print(f"파일 목록 조회 실패 ({folder_id}): {e}")
+
+    def _list_folder_files(self, folder_id: str) -> dict:
+        """폴더의 파일 목록 {파일명: 파일 ID} (페이지 단위 조회)"""
+        files = {}
+        page_token = None
+        while True:
+            results = self.service.files().list(
+                q=f"'{folder_id}' in parents and mimeType!='application/vnd.google-apps.folder' and trashed=false",
+                spaces='drive',
+                fields='nextPageToken, files(id, name)',
+                pageSize=1000,
+                pageToken=page_token
+            ).execute()
+
+            for item in results.get('files', []):
+                # 같은 이름이 여러 개면 기존 동작처럼 첫 번째 사용
+                files.setdefault(item['name'], item['id'])
+
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return files
@@ -0,0 +1,104 @@
+"""
+스트리밍 LLM 응답용 점진적 JSON 필드 추출기
+"""
+import json
+
+
+class JsonFieldStream:
+    """토큰 스트림에서 최상위 JSON 객체의 문자열 필드를 완성되는 즉시 추출
+
+    응답 앞의 ```json 펜스나 설명 문구는 첫 '{'가 나올 때까지 건너뛴다.
+    중첩 객체/배열 안의 값은 추출하지 않는다.
+
+    사용 예:
+        stream = JsonFieldStream()
+        for text in token_stream:
+            for name, value in stream.feed(text):
+                print(name, value)  # "title", "곡 제목" ...
+    """
+
+    def __init__(self):
+        self.fields = {}  # 지금까지 완성된 최상위 문자열 필드
+        self.done = False  # 최상위 객체가 닫혔는지 여부
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._buffer = []
+        self._string_role = None  # "key", "value" 또는 None (중첩 값)
+        self._expect_value = False
+        self._key = None
+
+    def feed(self, text: str) -> list:
+        """
+        텍스트 조각 입력
+
+        Returns:
+            이번 조각에서 완성된 필드 [(name, value), ...]
+        """
+        completed = []
+
+        for char in text:
+            if self.done:
+                break
+
+            if self._in_string:
+                if self._string_role:
+                    self._buffer.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    field = self._close_string()
+                    if field:
+                        completed.append(field)
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._buffer = []
+                if self._depth == 1:
+                    self._string_role = "value" if self._expect_value else "key"
+                else:
+                    self._string_role = None
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.done = True
+            elif self._depth == 1 and char == ":":
+                self._expect_value = True
+            elif self._depth == 1 and char == ",":
+                self._expect_value = False
+                self._key = None
+
+        return completed
+
+    def _close_string(self):
+        """문자열이 닫혔을 때 키 또는 필드 값으로 처리"""
+        # 마지막 따옴표를 제외한 원문을 JSON 문자열로 디코딩 (이스케이프 처리)
+        raw = "".join(self._buffer[:-1])
+        role = self._string_role
+        self._string_role = None
+
+        if not role:
+            return None
+
+        value = json.loads(f'"{raw}"')
+        if role == "key":
+            self._key = value
+            return None
+
+        self._expect_value = False
+        if self._key is None:
+            return None
+        self.fields[self._key] = value
+        return self._key, value
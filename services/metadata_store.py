@@ -0,0 +1,299 @@
+"""
+곡 메타데이터 저장소 (JSON 파일 / SQLite)
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+import config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def _file_lock(lock_file: Path):
+    """프로세스/인스턴스 간 배타 락 (같은 프로세스 안의 다른 인스턴스끼리도 막힘)"""
+    with open(lock_file, "a+") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK은 약 10초 후 포기하므로 잡힐 때까지 다시 시도
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class JsonMetadataStore:
+    """metadata.json 스냅샷 + 추가 전용 JSONL 저널 저장소 (기본)
+
+    변경은 저널(metadata.journal.jsonl)에 한 줄씩 추가만 하고, 저널이
+    config.METADATA_JOURNAL_MAX_OPS줄을 넘거나 METADATA_JOURNAL_MAX_AGE초가
+    지나면 스냅샷 전체를 다시 쓰는 압축(compaction)을 한다.
+    로드는 스냅샷 위에 저널을 재생한다. 저널 항목은 모두 멱등이라
+    압축 도중 죽어도 다음 로드에서 같은 결과가 된다.
+
+    여러 세션/프로세스가 같은 파일을 쓸 수 있으므로 저널 추가와 압축은
+    파일 락(metadata.lock) 안에서 하고, 압축은 메모리 상태가 아니라
+    디스크의 스냅샷 + 저널(다른 인스턴스가 쓴 항목 포함)을 다시 읽어 병합한다.
+    """
+
+    def __init__(self, metadata_file: Path):
+        self.metadata_file = Path(metadata_file)
+        self.journal_file = self.metadata_file.with_name(self.metadata_file.stem + ".journal.jsonl")
+        self.lock_file = self.metadata_file.with_name(self.metadata_file.stem + ".lock")
+        # Drive 업로드용 내보내기 파일 (스냅샷과 별도라 내보내기가 압축 주기에 영향을 주지 않음)
+        self.export_file = self.metadata_file.parent / "drive_export" / self.metadata_file.name
+        self.metadata = None
+        self._lock = threading.Lock()
+        self._journal_ops = 0
+        self._journal_started = None  # 저널 첫 항목 시각
+
+    def load(self) -> dict:
+        """메타데이터 로드 ({"songs": [...], "stats": {...}}) - 스냅샷 + 저널 재생"""
+        with self._lock, _file_lock(self.lock_file):
+            self.metadata = self._read_snapshot()
+            if self._replay_journal(self.metadata):
+                self._write_snapshot(self.metadata)
+        return self.metadata
+
+    def upsert_song(self, song: dict):
+        self.upsert_songs([song])
+
+    def upsert_songs(self, songs: list):
+        self._append([{"op": "upsert", "song": song} for song in songs])
+
+    def delete_song(self, song_id: str):
+        self._append([{"op": "delete", "id": song_id}])
+
+    def save_stats(self, stats: dict):
+        self._append([{"op": "stats", "stats": stats}])
+
+    def export_json(self) -> Path:
+        """메모리 상태를 Drive 업로드용 JSON으로 내보내기 (압축은 하지 않음)
+
+        호출자는 self.metadata를 바꾸는 쪽과 같은 락을 잡고 호출한다.
+        """
+        self.export_file.parent.mkdir(exist_ok=True)
+        tmp_path = self.export_file.with_suffix(".json.tmp")
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.metadata, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.export_file)
+        return self.export_file
+
+    def _append(self, entries: list):
+        """저널에 항목 추가 후 필요하면 압축"""
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        with self._lock, _file_lock(self.lock_file):
+            with open(self.journal_file, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+
+            if self._journal_started is None:
+                self._journal_started = time.time()
+            self._journal_ops += len(entries)
+
+            if (self._journal_ops >= config.METADATA_JOURNAL_MAX_OPS
+                    or time.time() - self._journal_started >= config.METADATA_JOURNAL_MAX_AGE):
+                self._compact()
+
+    def _read_snapshot(self) -> dict:
+        if not self.metadata_file.exists():
+            return {"songs": [], "stats": {"total_generated": 0}}
+        with open(self.metadata_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _replay_journal(self, metadata: dict) -> int:
+        """저널을 metadata에 적용. 적용한 항목 수 반환"""
+        if not self.journal_file.exists():
+            return 0
+
+        songs = metadata["songs"]
+        positions = {}  # id -> songs 안의 인덱스들 (기존 데이터에는 중복 ID가 있을 수 있음)
+        for i, song in enumerate(songs):
+            positions.setdefault(song.get("id", ""), []).append(i)
+        applied = 0
+
+        with open(self.journal_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 쓰다 끊긴 마지막 줄
+                    continue
+
+                op = entry.get("op")
+                if op == "upsert":
+                    song = entry["song"]
+                    song_id = song.get("id", "")
+                    if song_id in positions:
+                        for i in positions[song_id]:
+                            songs[i] = song
+                    else:
+                        positions[song_id] = [len(songs)]
+                        songs.append(song)
+                elif op == "delete":
+                    for i in positions.pop(entry["id"], []):
+                        songs[i] = None
+                elif op == "stats":
+                    metadata["stats"] = entry["stats"]
+                applied += 1
+
+        if None in songs:
+            metadata["songs"] = [s for s in songs if s is not None]
+        return applied
+
+    def _compact(self):
+        """디스크의 스냅샷에 저널을 재생해 새 스냅샷으로 교체 (두 락을 잡은 상태에서 호출)
+
+        메모리의 self.metadata는 다른 세션이 추가한 곡을 모를 수 있으므로 쓰지 않는다.
+        """
+        metadata = self._read_snapshot()
+        self._replay_journal(metadata)
+        self._write_snapshot(metadata)
+
+    def _write_snapshot(self, metadata: dict):
+        """스냅샷을 임시 파일에 쓰고 교체한 뒤 저널 비우기 (두 락을 잡은 상태에서 호출)"""
+        tmp_path = self.metadata_file.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.metadata_file)
+
+        # 스냅샷 교체 후에 비우므로 그 사이에 죽어도 재생 결과는 같음
+        open(self.journal_file, "w").close()
+        self._journal_ops = 0
+        self._journal_started = None
+
+
+class SqliteMetadataStore:
+    """SQLite(WAL) 저장소 - 곡 1개 저장이 라이브러리 크기와 무관하게 행 1개 쓰기
+
+    곡은 JSON 그대로 data 컬럼에 저장하고, 정렬용 created_at만 별도 컬럼으로 둔다.
+    DB를 처음 만들 때 기존 metadata.json이 있으면 한 번만 가져온다
+    (가져왔는지는 PRAGMA user_version으로 기록).
+    metadata.json은 Drive 업로드용으로 export_json() 때만 만들며, 마지막 내보내기
+    이후 DB가 바뀌지 않았으면 다시 쓰지 않는다.
+    """
+
+    def __init__(self, db_file: Path, json_file: Path):
+        self.db_file = Path(db_file)
+        self.json_file = Path(json_file)
+        self._lock = threading.Lock()
+        self._exported_version = None  # 마지막으로 내보낸 시점의 _version()
+
+        # Streamlit은 rerun마다 스레드가 바뀔 수 있어 락으로 직렬화해 공유
+        self._conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS songs (
+                id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL DEFAULT '',
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_songs_created_at ON songs(created_at);
+            CREATE TABLE IF NOT EXISTS stats (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+            if self.json_file.exists():
+                self._import_json()
+            self._conn.execute("PRAGMA user_version = 1")
+
+    def load(self) -> dict:
+        """메타데이터 로드"""
+        with self._lock:
+            songs = [
+                json.loads(data) for (data,) in
+                self._conn.execute("SELECT data FROM songs ORDER BY created_at, rowid")
+            ]
+            stats = {
+                key: json.loads(value) for key, value in
+                self._conn.execute("SELECT key, value FROM stats")
+            }
+
+        stats.setdefault("total_generated", 0)
+        return {"songs": songs, "stats": stats}
+
+    def upsert_song(self, song: dict):
+        self.upsert_songs([song])
+
+    def upsert_songs(self, songs: list):
+        """여러 곡을 한 트랜잭션으로 저장"""
+        with self._lock, self._conn:
+            self._insert_songs(songs)
+
+    def delete_song(self, song_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM songs WHERE id = ?", (song_id,))
+
+    def save_stats(self, stats: dict):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO stats (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in stats.items()]
+            )
+
+    def export_json(self) -> Path:
+        """DB 내용을 metadata.json 형식으로 내보내기 (Drive 업로드용, 변경이 없으면 생략)"""
+        with self._lock:
+            version = self._version()
+        if version == self._exported_version and self.json_file.exists():
+            return self.json_file
+
+        metadata = self.load()
+        tmp_path = self.json_file.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.json_file)
+        self._exported_version = version
+        return self.json_file
+
+    def _version(self) -> tuple:
+        """DB 변경 표시 (이 연결의 누적 변경 수 + 다른 연결의 커밋 시 바뀌는 data_version)"""
+        return (self._conn.total_changes, self._conn.execute("PRAGMA data_version").fetchone()[0])
+
+    def _import_json(self):
+        """기존 metadata.json을 한 트랜잭션으로 가져오기"""
+        with open(self.json_file, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+
+        with self._conn:
+            self._insert_songs(metadata.get("songs", []))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO stats (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in metadata.get("stats", {}).items()]
+            )
+
+    def _insert_songs(self, songs: list):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO songs (id, created_at, data) VALUES (?, ?, ?)",
+            [
+                (song.get("id", ""), song.get("created_at", ""), json.dumps(song, ensure_ascii=False))
+                for song in songs
+            ]
+        )
@@ -0,0 +1,88 @@
+"""
+metadata.json Google Drive 동기화 (지연 + 병합)
+"""
+import atexit
+import hashlib
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+import config
+
+
+class MetadataSyncer:
+    """메타데이터 변경을 모아 Drive에 한 번에 올리는 백그라운드 동기화
+
+    request()는 표시만 하고 바로 반환한다. 백그라운드 스레드가 첫 요청 후
+    window초 동안 들어온 요청을 모아 export → upload를 한 번만 수행하고,
+    내보낸 파일의 sha256이 마지막 업로드와 같으면 업로드를 건너뛴다.
+    flush()는 대기 중인 동기화를 즉시 끝내며, 프로세스 종료 시에도 호출된다.
+    upload는 동기화 스레드에서 불리므로 Drive 서비스 객체를 다른 스레드와 공유하면 안 된다.
+    """
+
+    def __init__(
+        self,
+        export: Callable[[], Path],
+        upload: Callable[[str], bool],
+        window: Optional[float] = None
+    ):
+        """
+        Args:
+            export: 업로드할 JSON 파일을 만들고 경로를 반환하는 함수
+            upload: 파일 경로를 받아 Drive에 올리고 성공 여부를 반환하는 함수
+            window: 요청을 모으는 시간 (초)
+        """
+        self.export = export
+        self.upload = upload
+        self.window = window if window is not None else config.METADATA_SYNC_WINDOW
+
+        self._dirty = False
+        self._last_hash = None
+        self._cond = threading.Condition()
+        self._sync_lock = threading.Lock()  # export/upload는 한 번에 하나만
+
+        self._thread = threading.Thread(target=self._run, name="metadata-syncer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def request(self):
+        """동기화 요청 (window 안의 요청은 한 번으로 합쳐짐)"""
+        with self._cond:
+            self._dirty = True
+            self._cond.notify()
+
+    def flush(self) -> bool:
+        """대기 중인 동기화를 지금 수행. 업로드할 게 없었거나 성공하면 True"""
+        with self._cond:
+            if not self._dirty:
+                return True
+            self._dirty = False
+        return self._sync()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty:
+                    self._cond.wait()
+
+            # 첫 요청 후 window 동안 들어오는 변경을 모음
+            with self._cond:
+                self._cond.wait_for(lambda: not self._dirty, timeout=self.window)
+            self.flush()
+
+    def _sync(self) -> bool:
+        with self._sync_lock:
+            try:
+                path = Path(self.export())
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+                if digest == self._last_hash:
+                    return True
+                if self.upload(str(path)):
+                    self._last_hash = digest
+                    return True
+            except Exception as e:
+                print(f"metadata 동기화 실패: {e}")
+
+        # 실패하면 다음 요청 때 다시 시도
+        with self._cond:
+            self._dirty = True
+        return False
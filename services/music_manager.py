@@ -1,47 +1,181 @@
 """
 음악 파일 관리 및 메타데이터 처리
 """
-import json
 import os
+import threading
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, TYPE_CHECKING
 import config
+from services.metadata_store import JsonMetadataStore, SqliteMetadataStore
+from services.directory_index import DirectoryIndex
+from services.drive_upload_queue import DriveUploadQueue
+from services.file_fingerprint import FileFingerprintCache
+from services.metadata_syncer import MetadataSyncer
 
 if TYPE_CHECKING:
     from services.google_drive_manager import GoogleDriveManager
+    from services.suno_client import SunoClient
+
+
+_shared_lock = threading.Lock()
+_shared_managers = {}  # 출력 폴더 절대 경로 -> MusicManager
+
+
+def get_shared_music_manager(
+    output_dir: Optional[Path] = None,
+    drive_manager: Optional["GoogleDriveManager"] = None
+) -> "MusicManager":
+    """출력 폴더마다 프로세스에 하나뿐인 MusicManager 반환
+
+    Streamlit은 세션(새로고침 포함)마다 스크립트 상태를 새로 만들지만, 메타데이터 저장소,
+    Drive 업로드 큐, 메타데이터 동기화 스레드는 같은 파일을 쓰므로 세션 간에 공유해야 한다.
+    drive_manager를 주면 공유 인스턴스에 연결한다 (None이면 기존 연결 유지).
+    """
+    key = os.path.abspath(output_dir or config.OUTPUT_DIR)
+    with _shared_lock:
+        manager = _shared_managers.get(key)
+        if manager is None:
+            manager = MusicManager(Path(key), drive_manager)
+            _shared_managers[key] = manager
+        elif drive_manager:
+            manager.drive_manager = drive_manager
+    return manager
 
 
 class MusicManager:
-    """생성된 음악 파일 및 메타데이터 관리"""
+    """생성된 음악 파일 및 메타데이터 관리
+
+    저장소/업로드 큐/동기화 스레드를 직접 가지므로 같은 출력 폴더에 인스턴스를
+    여러 개 만들지 말고 get_shared_music_manager()로 얻는다.
+    """
 
     def __init__(self, output_dir: Optional[Path] = None, drive_manager: Optional["GoogleDriveManager"] = None):
         self.output_dir = output_dir or config.OUTPUT_DIR
         self.metadata_file = self.output_dir / "metadata.json"
         self.drive_manager = drive_manager
         self._ensure_dirs()
+        self._lock = threading.RLock()  # 메타데이터 변경/내보내기 직렬화
+        self.store = self._create_store()
         self._load_metadata()
+        self.syncer = MetadataSyncer(self._export_metadata, self._upload_metadata)
+        # mp3 Drive 업로드는 백그라운드 큐에서 처리 (drive_manager는 나중에 연결될 수 있음)
+        self.upload_queue = DriveUploadQueue(
+            lambda: self.drive_manager,
+            on_status=self._on_upload_status,
+            queue_file=self.output_dir / "drive_upload_queue.json"
+        )
+        # 로컬 mp3 크기/수정 시각/md5 캐시 (바뀐 파일만 다시 해시)
+        self.fingerprints = FileFingerprintCache()
+        # 파일 존재 확인용 폴더 목록 캐시 (곡마다 exists() 호출 대신)
+        self.file_index = DirectoryIndex()
+        self._library_names = None  # _library_by_suffix 계산에 쓴 library 파일명 집합
+        self._library_by_suffix = {}
 
     def _ensure_dirs(self):
         """필요한 디렉토리 생성"""
         self.output_dir.mkdir(exist_ok=True)
 
+    def _create_store(self):
+        """config.METADATA_BACKEND에 따른 메타데이터 저장소 생성"""
+        if config.METADATA_BACKEND == "sqlite":
+            return SqliteMetadataStore(self.output_dir / "metadata.db", self.metadata_file)
+        return JsonMetadataStore(self.metadata_file)
+
     def _load_metadata(self):
-        """메타데이터 파일 로드"""
-        if self.metadata_file.exists():
-            with open(self.metadata_file, "r", encoding="utf-8") as f:
-                self.metadata = json.load(f)
+        """메타데이터 로드"""
+        self.metadata = self.store.load()
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        """메타데이터로 조회용 인덱스 재구성
+
+        - _by_id: 클립 ID -> 곡 (ID가 중복되면 먼저 나온 항목)
+        - _id_entries: 클립 ID -> [곡, ...] (중복 ID 항목 전부, 삭제용)
+        - _by_task: task_id -> [곡, ...]
+        - _by_genre: 장르 -> [곡, ...]
+        - _style_counts: style 첫 태그 -> 곡 수 (get_stats용)
+        - _order / _order_keys: created_at 오름차순 곡 리스트와 그 키 (bisect용)
+        """
+        self._by_id = {}
+        self._id_entries = {}
+        self._by_task = {}
+        self._by_genre = {}
+        self._style_counts = {}
+        self._order = sorted(self.metadata["songs"], key=lambda x: x.get("created_at", ""))
+        self._order_keys = [song.get("created_at", "") for song in self._order]
+
+        for song in self.metadata["songs"]:
+            self._index_lookup(song)
+
+    def _index_lookup(self, song: dict):
+        """ID/태스크/장르 인덱스와 장르 통계에 곡 추가"""
+        self._by_id.setdefault(song.get("id", ""), song)
+        self._id_entries.setdefault(song.get("id", ""), []).append(song)
+        style = self._style_tag(song)
+        self._style_counts[style] = self._style_counts.get(style, 0) + 1
+        self._by_task.setdefault(song.get("task_id", ""), []).append(song)
+        self._by_genre.setdefault(song.get("genre", ""), []).append(song)
+
+    def _index_song(self, song: dict):
+        """새 곡을 모든 인덱스에 추가 (새 곡은 보통 맨 뒤라 삽입이 O(1))"""
+        self._index_lookup(song)
+        created_at = song.get("created_at", "")
+        pos = bisect_right(self._order_keys, created_at)
+        self._order_keys.insert(pos, created_at)
+        self._order.insert(pos, song)
+
+    def _unindex_song(self, song: dict):
+        """곡을 모든 인덱스에서 제거"""
+        song_id = song.get("id", "")
+        entries = self._id_entries.get(song_id, [])
+        entries[:] = [s for s in entries if s is not song]
+        if entries:
+            self._by_id[song_id] = entries[0]
         else:
-            self.metadata = {"songs": [], "stats": {"total_generated": 0}}
+            self._id_entries.pop(song_id, None)
+            self._by_id.pop(song_id, None)
+
+        style = self._style_tag(song)
+        self._style_counts[style] -= 1
+        if not self._style_counts[style]:
+            del self._style_counts[style]
+
+        for index, key in ((self._by_task, song.get("task_id", "")), (self._by_genre, song.get("genre", ""))):
+            bucket = index.get(key, [])
+            bucket[:] = [s for s in bucket if s is not song]
+            if not bucket:
+                index.pop(key, None)
+
+        created_at = song.get("created_at", "")
+        lo = bisect_left(self._order_keys, created_at)
+        hi = bisect_right(self._order_keys, created_at)
+        for pos in range(lo, hi):
+            if self._order[pos] is song:
+                del self._order[pos]
+                del self._order_keys[pos]
+                break
+
+    def _sync_metadata(self):
+        """Google Drive 메타데이터 동기화 요청 (일정 시간 모아서 한 번에 업로드)"""
+        if self.drive_manager and self.drive_manager.is_connected():
+            self.syncer.request()
 
-    def _save_metadata(self):
-        """메타데이터 파일 저장 (로컬 + Google Drive)"""
-        with open(self.metadata_file, "w", encoding="utf-8") as f:
-            json.dump(self.metadata, f, ensure_ascii=False, indent=2)
+    def flush_metadata(self) -> bool:
+        """대기 중인 Drive 메타데이터 동기화를 즉시 수행"""
+        return self.syncer.flush()
 
-        # Google Drive에도 업로드
-        if self.drive_manager and self.drive_manager.is_connected():
-            self.drive_manager.upload_metadata(str(self.metadata_file))
+    def _export_metadata(self) -> Path:
+        """저장소 내용을 JSON으로 내보내기 (동기화 스레드에서 호출)"""
+        with self._lock:
+            return self.store.export_json()
+
+    def _upload_metadata(self, metadata_path: str) -> bool:
+        if not (self.drive_manager and self.drive_manager.is_connected()):
+            return False
+        return self.drive_manager.upload_metadata(metadata_path)
 
     def save_song(
         self,
@@ -58,11 +192,11 @@ class MusicManager:
             clip_data: Suno API에서 받은 클립 데이터
             prompt_data: 프롬프트 생성기에서 받은 데이터
             audio_path: 저장된 오디오 파일 경로
-            audio_data: 오디오 파일 bytes 데이터 (Streamlit Cloud용)
+            audio_data: 오디오 파일 bytes 데이터 (audio_path에 파일이 없을 때만 사용, Streamlit Cloud용)
             genre: 장르 (Drive 장르별 폴더 저장용)
 
         Returns:
-            저장된 곡 정보
+            저장된 곡 정보 (Drive 연결 시 drive_status="pending" - 업로드는 백그라운드 큐에서 진행)
         """
         song_info = {
             "id": clip_data.get("id", ""),
@@ -83,82 +217,194 @@ class MusicManager:
             }
         }
 
-        self.metadata["songs"].append(song_info)
-        self.metadata["stats"]["total_generated"] += 1
-        self._save_metadata()
+        upload_to_drive = bool(self.drive_manager and self.drive_manager.is_connected())
+        if upload_to_drive:
+            song_info["drive_status"] = "pending"
+            song_info["drive_error"] = None
+
+        with self._lock:
+            self.metadata["songs"].append(song_info)
+            self.metadata["stats"]["total_generated"] += 1
+            self._index_song(song_info)
+            self.store.upsert_song(song_info)
+            self.store.save_stats(self.metadata["stats"])
+        self._sync_metadata()
+
+        # Google Drive mp3 업로드는 큐에 넣고 바로 반환
+        if upload_to_drive:
+            audio_path_obj = Path(audio_path)
+            if not audio_path_obj.exists() and audio_data:
+                # 파일이 없으면 메모리 데이터를 기록해 두고 올림 (Streamlit Cloud용)
+                audio_path_obj.parent.mkdir(parents=True, exist_ok=True)
+                audio_path_obj.write_bytes(audio_data)
+
+            # audio_path에서 output1/output2 판단 (output1=odd, output2=even)
+            is_odd = "output1" in str(audio_path_obj.parent)  # output1 폴더면 홀수(odd)
+            self.upload_queue.enqueue(song_info["id"], str(audio_path_obj), is_odd=is_odd, genre=genre)
+
+        # 방금 받은(또는 위에서 기록한) 파일이 폴더 목록 캐시에 바로 보이도록
+        self.file_index.invalidate(audio_path)
+        return song_info
 
-        # Google Drive에 mp3 업로드
-        upload_success = False
-        upload_error = None
-        if self.drive_manager and self.drive_manager.is_connected():
-            try:
+    def _on_upload_status(self, song_id: str, status: str, error: Optional[str]):
+        """업로드 큐의 상태 변경을 곡 메타데이터에 기록 (drive_status / drive_error)"""
+        with self._lock:
+            song = self._by_id.get(song_id)
+            if not song:
+                return
+            song["drive_status"] = status
+            song["drive_error"] = error
+            self.store.upsert_song(song)
+
+        if status in ("done", "failed"):
+            self._sync_metadata()
+
+    def get_pending_uploads(self) -> list:
+        """Drive 업로드 대기/진행 중인 작업 (제목 포함)"""
+        jobs = self.upload_queue.get_pending()
+        for job in jobs:
+            song = self._by_id.get(job["song_id"])
+            job["title"] = song.get("title", "") if song else Path(job["file_path"]).name
+        return jobs
+
+    def get_failed_uploads(self) -> list:
+        """Drive 업로드를 포기한 곡 목록"""
+        return [s for s in self.metadata["songs"] if s.get("drive_status") == "failed"]
+
+    def retry_failed_uploads(self) -> int:
+        """업로드 실패한 곡을 다시 큐에 넣기. 넣은 곡 수 반환"""
+        count = 0
+        for song in self.get_failed_uploads():
+            audio_path = Path(song.get("audio_path", ""))
+            if not audio_path.exists():
+                continue
+            is_odd = "output1" in str(audio_path.parent)
+            self._on_upload_status(song["id"], "pending", None)
+            self.upload_queue.enqueue(song["id"], str(audio_path), is_odd=is_odd, genre=song.get("genre") or None)
+            count += 1
+        return count
+
+    def sync_to_drive(self) -> dict:
+        """
+        생성 폴더(output1/output2)에 있는 곡 파일을 Drive와 비교해 빠진/바뀐 파일만 업로드
+
+        Returns:
+            GoogleDriveManager.sync_files 결과 ({"checked", "uploaded", "moved", "unchanged", "failed"})
+        """
+        if not (self.drive_manager and self.drive_manager.is_connected()):
+            raise Exception("Google Drive가 연결되지 않았습니다")
+
+        entries = []
+        songs_by_path = {}
+        for song in self.get_all_songs():
+            audio_path = Path(song.get("audio_path", ""))
+            # library 사본은 파일명이 달라 Drive에 중복으로 생기므로 생성 폴더 파일만 올림
+            if not self.file_exists(song.get("audio_path")):
+                continue
+            songs_by_path[str(audio_path)] = song
+            entries.append({
+                "file_path": str(audio_path),
                 # audio_path에서 output1/output2 판단 (output1=odd, output2=even)
-                audio_path_obj = Path(audio_path)
-                is_odd = "output1" in str(audio_path_obj.parent)  # output1 폴더면 홀수(odd)
+                "is_odd": "output1" in str(audio_path.parent),
+                "genre": song.get("genre") or None,
+            })
+
+        result = self.drive_manager.sync_files(entries, get_md5s=self.fingerprints.md5s)
+
+        # Drive에 올라가 있는 것이 확인된 곡은 업로드 상태 갱신
+        changed = []
+        with self._lock:
+            for file_path in result["uploaded"] + result["moved"] + result["unchanged"]:
+                song = songs_by_path.get(file_path)
+                if song and song.get("drive_status") != "done":
+                    song["drive_status"] = "done"
+                    song["drive_error"] = None
+                    changed.append(song)
+            if changed:
+                self.store.upsert_songs(changed)
+        if changed:
+            self._sync_metadata()
+
+        return result
+
+    def file_exists(self, path) -> bool:
+        """로컬 파일 존재 여부 (폴더 목록 캐시 사용)"""
+        return self.file_index.exists(path)
+
+    def get_file_fingerprints(self, paths: Optional[list] = None) -> dict:
+        """
+        로컬 오디오 파일 지문 조회 (중복/무결성 확인용)
 
-                # audio_data가 있으면 메모리에서 직접 업로드 (Streamlit Cloud용)
-                if audio_data:
-                    file_name = audio_path_obj.name
-                    upload_success = self.drive_manager.upload_file(file_data=audio_data, file_name=file_name, is_odd=is_odd, genre=genre)
-                else:
-                    # 로컬 파일에서 업로드
-                    upload_success = self.drive_manager.upload_file(str(audio_path), is_odd=is_odd, genre=genre)
-            except Exception as e:
-                upload_error = str(e)
+        Args:
+            paths: 확인할 파일 경로들 (없으면 output1/output2/library의 모든 mp3)
 
-        song_info["drive_upload"] = upload_success
-        song_info["drive_error"] = upload_error
-        return song_info
+        Returns:
+            {경로: {"size", "mtime_ns", "md5"}}
+        """
+        if paths is None:
+            paths = [
+                entry.path
+                for folder in (config.OUTPUT1_DIR, config.OUTPUT2_DIR, config.LIBRARY_DIR)
+                if folder.exists()
+                for entry in os.scandir(folder)
+                if entry.name.endswith(".mp3") and entry.is_file()
+            ]
+        return self.fingerprints.fingerprints(paths)
 
     def get_song(self, song_id: str) -> Optional[dict]:
         """ID로 곡 정보 조회"""
-        for song in self.metadata["songs"]:
-            if song["id"] == song_id:
-                return song
-        return None
+        return self._by_id.get(song_id)
+
+    def has_song(self, song_id: str) -> bool:
+        """해당 ID의 곡이 저장되어 있는지 여부"""
+        return song_id in self._by_id
+
+    def get_songs_by_task(self, task_id: str) -> list:
+        """같은 생성 태스크의 곡 조회"""
+        return list(self._by_task.get(task_id, []))
+
+    def get_songs_by_genre(self, genre: str) -> list:
+        """장르별 곡 조회"""
+        return list(self._by_genre.get(genre, []))
 
     def get_all_songs(self) -> list:
         """모든 곡 정보 조회"""
         return self.metadata["songs"]
 
-    def get_recent_songs(self, count: int = 10) -> list:
-        """최근 생성된 곡 조회"""
-        return sorted(
-            self.metadata["songs"],
-            key=lambda x: x.get("created_at", ""),
-            reverse=True
-        )[:count]
+    def get_recent_songs(self, count: Optional[int] = 10) -> list:
+        """최근 생성된 곡 조회 (최신순, count=None이면 전체)"""
+        if count is None:
+            return self._order[::-1]
+        if count <= 0:
+            return []
+        return self._order[:-count - 1:-1]
 
     def get_songs_by_date(self, date: str) -> list:
         """특정 날짜에 생성된 곡 조회 (YYYY-MM-DD 형식)"""
-        return [
-            song for song in self.metadata["songs"]
-            if song.get("created_at", "").startswith(date)
-        ]
+        # created_at은 ISO 형식이라 날짜 접두사 범위를 이진 탐색으로 찾음
+        lo = bisect_left(self._order_keys, date)
+        hi = bisect_left(self._order_keys, date + "\uffff")
+        return self._order[lo:hi]
 
     def get_stats(self) -> dict:
-        """통계 정보 조회"""
-        songs = self.metadata["songs"]
-
+        """통계 정보 조회 (인덱스에서 바로 계산)"""
         # 오늘 생성된 곡 수
         today = datetime.now().strftime("%Y-%m-%d")
-        today_count = len([s for s in songs if s.get("created_at", "").startswith(today)])
-
-        # 장르별 통계
-        style_counts = {}
-        for song in songs:
-            style = song.get("style", "Unknown")
-            # 첫 번째 태그를 장르로 사용
-            genre = style.split(",")[0].strip() if style else "Unknown"
-            style_counts[genre] = style_counts.get(genre, 0) + 1
+        today_count = len(self.get_songs_by_date(today))
 
         return {
             "total_generated": self.metadata["stats"]["total_generated"],
-            "total_saved": len(songs),
+            "total_saved": len(self.metadata["songs"]),
             "today_count": today_count,
-            "genres": style_counts
+            "genres": dict(self._style_counts)
         }
 
+    @staticmethod
+    def _style_tag(song: dict) -> str:
+        """장르 통계용 style 첫 번째 태그"""
+        style = song.get("style", "Unknown")
+        return style.split(",")[0].strip() if style else "Unknown"
+
     def generate_filename(self, title: str, song_id: str) -> str:
         """안전한 파일명 생성"""
         # 특수문자 제거 및 공백 처리
@@ -173,6 +419,93 @@ class MusicManager:
 
         return f"{safe_title}_{timestamp}_{short_id}.mp3"
 
+    def library_filename(self, title: str, song_id: str) -> str:
+        """library 저장용 파일명 - 같은 곡이면 항상 같은 이름 (타임스탬프 없음, 전체 clip ID)"""
+        safe_title = "".join(c for c in title if c.isalnum() or c in " -_").strip()
+        safe_title = safe_title.replace(" ", "_")[:50] or "song"
+        return f"{safe_title}_{song_id or 'unknown'}.mp3"
+
+    def get_library_path(self, title: str, song_id: str) -> Path:
+        """library 다운로드 저장 경로"""
+        return config.LIBRARY_DIR / self.library_filename(title, song_id)
+
+    def resolve_library_paths(self, songs: list) -> dict:
+        """
+        곡들의 library 파일 경로 확인 (없으면 None)
+
+        메타데이터의 library_path를 먼저 보고, 없으면 library 폴더에서
+        "*_{clip_id}.mp3" 파일을 찾아 기록한다. 예전 파일명("*_{clip_id 앞 8자리}.mp3",
+        타임스탬프 포함)은 앞 8자리가 같은 곡도, 같은 8자리로 끝나는 파일도 하나뿐일 때만 쓴다.
+
+        Returns:
+            {clip_id: Path 또는 None}
+        """
+        resolved = {}
+        found = {}
+        short_id_counts = None  # 앞 8자리별 곡 수 (예전 파일명을 찾을 때만 계산)
+        for song in songs:
+            clip_id = song.get("id", "")
+            recorded = song.get("library_path")
+            if recorded and self.file_exists(recorded):
+                resolved[clip_id] = Path(recorded)
+                continue
+
+            name = None
+            if clip_id:
+                by_suffix = self._library_by_suffix_map()
+                names = by_suffix.get(clip_id)
+                if names:
+                    name = names[0]
+                else:
+                    if short_id_counts is None:
+                        short_id_counts = {}
+                        for song_id in self._by_id:
+                            short_id_counts[song_id[:8]] = short_id_counts.get(song_id[:8], 0) + 1
+                    legacy = by_suffix.get(clip_id[:8], [])
+                    if len(legacy) == 1 and short_id_counts.get(clip_id[:8], 0) <= 1:
+                        name = legacy[0]
+            path = config.LIBRARY_DIR / name if name else None
+            resolved[clip_id] = path
+            if path and str(path) != recorded:
+                found[clip_id] = path
+
+        if found:
+            self.set_library_paths(found)
+        return resolved
+
+    def set_library_paths(self, paths: dict):
+        """다운로드한 library 파일 경로를 메타데이터에 기록 ({clip_id: 경로})"""
+        changed = []
+        with self._lock:
+            for clip_id, path in paths.items():
+                song = self._by_id.get(clip_id)
+                if song and song.get("library_path") != str(path):
+                    song["library_path"] = str(path)
+                    changed.append(song)
+            if changed:
+                self.store.upsert_songs(changed)
+
+        for path in paths.values():
+            self.file_index.invalidate(path)
+        if changed:
+            self._sync_metadata()
+
+    def _library_by_suffix_map(self) -> dict:
+        """library 파일명 목록으로 {마지막 "_" 뒤 ID(전체 clip ID 또는 예전 8자리): [파일명, ...]}
+
+        폴더 목록이 바뀔 때만 다시 계산한다.
+        """
+        names = self.file_index.names(config.LIBRARY_DIR)
+        if names is not self._library_names:
+            by_suffix = {}
+            for name in sorted(names):
+                stem, _, ext = name.rpartition(".")
+                if ext == "mp3" and "_" in stem:
+                    by_suffix.setdefault(stem.rsplit("_", 1)[1], []).append(name)
+            self._library_by_suffix = by_suffix
+            self._library_names = names
+        return self._library_by_suffix
+
     def get_audio_path(self, title: str, song_id: str, clip_index: int = 0) -> Path:
         """오디오 파일 저장 경로 생성
 
@@ -192,22 +525,84 @@ class MusicManager:
         output_folder.mkdir(exist_ok=True)
         return output_folder / filename
 
+    def refresh_audio_urls(self, suno_client: "SunoClient", clip_ids: list) -> dict:
+        """
+        만료된 오디오 URL 일괄 갱신
+
+        클립을 task_id별로 묶어 태스크당 상태 조회 1회만 하고(한 태스크에 클립 2개),
+        같은 태스크의 다른 클립 URL도 함께 갱신한 뒤 메타데이터는 마지막에 한 번만 저장한다.
+
+        Args:
+            suno_client: 상태 조회용 SunoClient
+            clip_ids: 갱신할 클립 ID 리스트
+
+        Returns:
+            {clip_id: 새 audio_url} (요청한 클립 중 갱신된 것만)
+        """
+        wanted = set(clip_ids)
+        task_ids = []
+        for clip_id in clip_ids:
+            song = self._by_id.get(clip_id)
+            task_id = song.get("task_id") if song else None
+            if task_id and task_id not in task_ids:
+                task_ids.append(task_id)
+
+        if not task_ids:
+            return {}
+
+        def fetch(task_id: str) -> list:
+            try:
+                return suno_client.get_task_clips(task_id)
+            except Exception:
+                return []
+
+        with ThreadPoolExecutor(max_workers=min(config.POLL_MAX_WORKERS, len(task_ids))) as executor:
+            task_clips = list(executor.map(fetch, task_ids))
+
+        fresh_urls = {}
+        for clips in task_clips:
+            for clip in clips:
+                if clip.get("id") and clip.get("audio_url"):
+                    fresh_urls[clip["id"]] = clip["audio_url"]
+
+        changed = []
+        with self._lock:
+            for task_id in task_ids:
+                for song in self._by_task.get(task_id, []):
+                    new_url = fresh_urls.get(song.get("id"))
+                    if new_url and song.get("audio_url") != new_url:
+                        song["audio_url"] = new_url
+                        changed.append(song)
+
+            if changed:
+                self.store.upsert_songs(changed)
+
+        if changed:
+            self._sync_metadata()
+
+        return {clip_id: url for clip_id, url in fresh_urls.items() if clip_id in wanted}
+
     def delete_song(self, song_id: str) -> bool:
         """곡 정보 및 파일 삭제"""
         song = self.get_song(song_id)
         if not song:
             return False
 
-        # 파일 삭제
-        audio_path = Path(song.get("audio_path", ""))
-        if audio_path.exists():
-            audio_path.unlink()
-
-        # 메타데이터에서 제거
-        self.metadata["songs"] = [
-            s for s in self.metadata["songs"] if s["id"] != song_id
-        ]
-        self._save_metadata()
+        # 파일 삭제 (경로가 비어 있으면 Path("")가 현재 폴더라 건너뜀)
+        if song.get("audio_path"):
+            audio_path = Path(song["audio_path"])
+            if audio_path.is_file():
+                audio_path.unlink()
+            self.file_index.invalidate(audio_path)
+
+        # 메타데이터와 인덱스에서 제거 (같은 ID의 중복 항목 포함)
+        # 지울 항목은 ID 인덱스로 찾고, 목록은 새로 만들지 않고 제자리에서 뺀다
+        with self._lock:
+            for s in list(self._id_entries.get(song_id, [])):
+                self._unindex_song(s)
+                self.metadata["songs"].remove(s)
+            self.store.delete_song(song_id)
+        self._sync_metadata()
 
         return True
 
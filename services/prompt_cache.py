@@ -0,0 +1,112 @@
+"""
+생성된 프롬프트 디스크 캐시 (조건 조합 해시 기반)
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+import config
+
+
+class PromptCache:
+    """정규화된 생성 조건을 키로 하는 content-addressed 프롬프트 캐시
+
+    항목 하나당 <sha256>.json 파일 하나로 저장한다. 조회할 때 파일 mtime을
+    갱신해 LRU 순서로 쓰고, 항목 수가 max_entries를 넘으면 가장 오래 안 쓴
+    항목부터 지운다. ttl(초)이 지난 항목은 없는 것으로 취급한다.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None
+    ):
+        self.cache_dir = Path(cache_dir or config.PROMPT_CACHE_DIR)
+        self.ttl = ttl if ttl is not None else config.PROMPT_CACHE_TTL
+        self.max_entries = max_entries or config.PROMPT_CACHE_MAX_ENTRIES
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(**conditions) -> str:
+        """생성 조건을 정규화해 캐시 키(sha256) 생성
+
+        문자열은 앞뒤 공백 제거, 연속 공백 축약, 대소문자 통일 후 비교하고
+        None과 빈 문자열은 같은 값으로 취급한다.
+        """
+        normalized = {}
+        for name, value in conditions.items():
+            if isinstance(value, str):
+                value = " ".join(value.split()).casefold()
+            normalized[name] = "" if value is None else value
+
+        raw = json.dumps(normalized, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self.ttl and time.time() - entry.get("created_at", 0) > self.ttl:
+            self._remove(path)
+            return None
+
+        # LRU 순서 갱신
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return entry.get("value")
+
+    def set(self, key: str, value: dict):
+        """캐시 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{id(value)}.tmp")
+        entry = {"created_at": time.time(), "value": value}
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        self._evict()
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                self._remove(entry.path)
+
+    def _evict(self):
+        """항목 수가 max_entries를 넘으면 오래 안 쓴 항목부터 삭제"""
+        entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith(".json")]
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+
+        entries.sort(key=self._mtime)
+        for entry in entries[:overflow]:
+            self._remove(entry.path)
+
+    @staticmethod
+    def _mtime(entry: os.DirEntry) -> float:
+        try:
+            return entry.stat().st_mtime
+        except OSError:
+            return 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -1,8 +1,14 @@
 """
 AI를 이용한 Suno 프롬프트 생성기 (OpenAI or Anthropic)
 """
-from typing import Optional
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 import config
+from services.json_stream import JsonFieldStream
+from services.prompt_cache import PromptCache
 
 # 장르별 레퍼런스 프롬프트
 GENRE_REFERENCE = {
@@ -18,54 +24,9 @@ GENRE_REFERENCE = {
     "클래식/OST": "cinematic orchestral style, emotional progression, dramatic atmosphere, cinematic score"
 }
 
-
-class PromptGenerator:
-    """Suno용 음악 프롬프트 생성기"""
-
-    def __init__(self, api_key: Optional[str] = None, use_openai: bool = False):
-        self.use_openai = use_openai or bool(config.OPENAI_API_KEY and not config.ANTHROPIC_API_KEY)
-
-        if self.use_openai:
-            from openai import OpenAI
-            self.client = OpenAI(api_key=api_key or config.OPENAI_API_KEY)
-        else:
-            from anthropic import Anthropic
-            self.client = Anthropic(api_key=api_key or config.ANTHROPIC_API_KEY)
-
-    def generate_music_prompt(
-        self,
-        theme: str,
-        genre: Optional[str] = None,
-        mood: Optional[str] = None,
-        language: Optional[str] = None,
-        gender: Optional[str] = None,
-        age: Optional[str] = None,
-        tempo: Optional[str] = None,
-        sound_texture: Optional[str] = None,
-        instrumental: bool = False
-    ) -> dict:
-        """
-        주제를 기반으로 Suno용 프롬프트 생성
-
-        Args:
-            theme: 음악 주제 (예: "이별", "여름 바다", "새벽 감성")
-            genre: 장르 (예: "K-pop", "R&B", "EDM") - 없으면 자동 선택
-            mood: 분위기 (예: "신나는", "슬픈", "몽환적") - 없으면 자동 선택
-            language: 가사 언어 (예: "Korean", "Japanese", "English") - 없으면 자동 선택
-            gender: 보컬 성별 (예: "Male", "Female") - 없으면 자동 선택
-            age: 보컬 나이 (예: "youthful", "mature", "aged") - 없으면 자동 선택
-            tempo: 템포 (예: "very slow", "slow", "mid-tempo", "upbeat", "fast") - 없으면 자동 선택
-            sound_texture: 사운드 질감 (예: "Clean", "Warm", "Dark", "Retro") - 없으면 자동 선택
-            instrumental: True면 가사 없이 스타일만 생성
-
-        Returns:
-            {
-                "title": "곡 제목",
-                "style": "스타일 태그",
-                "lyrics": "가사" (instrumental이면 빈 문자열)
-            }
-        """
-        system_prompt = """당신은 Suno AI 음악 생성 전문가입니다.
+# 곡 프롬프트 생성용 시스템 프롬프트 (모든 호출에서 동일)
+# 제공자 캐시 최소 길이(약 1024 토큰)보다 짧으면 캐시되지 않으며, 그런 호출은 uncached_requests로 집계됨
+MUSIC_SYSTEM_PROMPT = """당신은 Suno AI 음악 생성 전문가입니다.
 사용자의 주제를 받아 Suno에서 좋은 결과가 나오는 프롬프트를 만들어주세요.
 
 ## 중요 규칙:
@@ -106,145 +67,391 @@ class PromptGenerator:
     "lyrics": "가사 (구조 태그 포함)"
 }"""
 
-        # 선택된 파라미터만 메시지에 포함
-        conditions = [f"주제: {theme}"]
-        conditions.append(f"장르: {genre if genre else '주제에 맞게 자동 선택'}")
-        conditions.append(f"분위기: {mood if mood else '주제에 맞게 자동 선택'}")
-
-        if language:
-            conditions.append(f"가사 언어: {language}")
-        else:
-            conditions.append("가사 언어: 주제와 장르에 맞게 자동 선택 (한국어, 일본어, 영어 중)")
+# 랜덤 주제 생성용 시스템 프롬프트
+THEME_SYSTEM_PROMPT = """당신은 음악 주제 전문가입니다.
+K-pop, 발라드, R&B 등 한국 음악에 어울리는 참신하고 감성적인 주제를 생성해주세요.
+각 주제는 간결하게 2-5단어로 표현해주세요.
 
-        if gender:
-            conditions.append(f"보컬 성별: {gender}")
-        if age:
-            conditions.append(f"보컬 나이: {age}")
-        if tempo:
-            conditions.append(f"템포: {tempo}")
-        if sound_texture:
-            conditions.append(f"사운드 질감: {sound_texture}")
+응답은 반드시 JSON 배열로만 해주세요:
+["주제1", "주제2", "주제3", ...]"""
 
-        conditions.append(f"인스트루멘탈: {'예 (가사 없이 스타일만)' if instrumental else '아니오 (가사 포함)'}")
+# 일괄 생성 결과 항목의 필수 필드
+PROMPT_FIELDS = ("title", "style", "lyrics")
 
-        # 장르별 레퍼런스 프롬프트 추가
-        genre_ref = ""
-        if genre and genre in GENRE_REFERENCE:
-            genre_ref = f"\n\n## 장르 레퍼런스 (style에 반드시 포함):\n{GENRE_REFERENCE[genre]}"
+# 시스템 프롬프트가 바뀌면 기존 캐시가 무효화되도록 키에 포함
+MUSIC_PROMPT_VERSION = hashlib.sha256(MUSIC_SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12]
 
-        user_message = f"""다음 조건으로 Suno 음악 프롬프트를 만들어주세요:
 
-{chr(10).join(conditions)}{genre_ref}
+class PromptGenerator:
+    """Suno용 음악 프롬프트 생성기"""
 
-JSON 형식으로만 응답해주세요."""
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        use_openai: bool = False,
+        timeout: Optional[float] = None,
+        cache: Optional[PromptCache] = None
+    ):
+        self.use_openai = use_openai or bool(config.OPENAI_API_KEY and not config.ANTHROPIC_API_KEY)
+        # 호출 1회당 타임아웃 (초)
+        self.timeout = timeout or config.LLM_CALL_TIMEOUT
 
-        # API 호출 (OpenAI 또는 Anthropic)
         if self.use_openai:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                max_tokens=2000,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ]
-            )
-            content = response.choices[0].message.content.strip()
+            from openai import OpenAI
+            self.client = OpenAI(api_key=api_key or config.OPENAI_API_KEY, timeout=self.timeout)
         else:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2000,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_message}]
-            )
-            content = response.content[0].text.strip()
+            from anthropic import Anthropic
+            self.client = Anthropic(api_key=api_key or config.ANTHROPIC_API_KEY, timeout=self.timeout)
+
+        # 토큰 사용량 (제공자 측 프롬프트 캐시 적중 포함)
+        self._usage_lock = threading.Lock()
+        self._used_keys_lock = threading.Lock()
+        self.usage = {
+            "requests": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_read_tokens": 0,
+            "cache_write_tokens": 0,
+            "uncached_requests": 0,  # 캐시를 요청했지만 적용되지 않은 호출 (Anthropic)
+        }
+        self._warned_uncached = False
+
+        # 프롬프트 캐시 (PROMPT_CACHE_ENABLED가 꺼져 있으면 사용 안 함)
+        if cache is None and config.PROMPT_CACHE_ENABLED:
+            cache = PromptCache()
+        self.cache = cache
 
-        # JSON 블록 추출
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
+    def generate_music_prompt(
+        self,
+        theme: str,
+        genre: Optional[str] = None,
+        mood: Optional[str] = None,
+        language: Optional[str] = None,
+        gender: Optional[str] = None,
+        age: Optional[str] = None,
+        tempo: Optional[str] = None,
+        sound_texture: Optional[str] = None,
+        instrumental: bool = False,
+        force_fresh: bool = False,
+        used_keys: Optional[set] = None
+    ) -> dict:
+        """
+        주제를 기반으로 Suno용 프롬프트 생성 (같은 조건이면 캐시 재사용)
+
+        Args:
+            theme: 음악 주제 (예: "이별", "여름 바다", "새벽 감성")
+            genre: 장르 (예: "K-pop", "R&B", "EDM") - 없으면 자동 선택
+            mood: 분위기 (예: "신나는", "슬픈", "몽환적") - 없으면 자동 선택
+            language: 가사 언어 (예: "Korean", "Japanese", "English") - 없으면 자동 선택
+            gender: 보컬 성별 (예: "Male", "Female") - 없으면 자동 선택
+            age: 보컬 나이 (예: "youthful", "mature", "aged") - 없으면 자동 선택
+            tempo: 템포 (예: "very slow", "slow", "mid-tempo", "upbeat", "fast") - 없으면 자동 선택
+            sound_texture: 사운드 질감 (예: "Clean", "Warm", "Dark", "Retro") - 없으면 자동 선택
+            instrumental: True면 가사 없이 스타일만 생성
+            force_fresh: True면 캐시를 무시하고 새로 생성 (결과는 캐시에 덮어씀)
+            used_keys: 한 번의 일괄 생성에서 공유하는 캐시 키 집합. 이미 쓴 키면
+                캐시를 건너뛰어 같은 주제가 반복돼도 곡이 중복되지 않는다
 
-        import json
-        result = json.loads(content)
+        Returns:
+            {
+                "title": "곡 제목",
+                "style": "스타일 태그",
+                "lyrics": "가사" (instrumental이면 빈 문자열)
+            }
+        """
+        cache_key = self._cache_key(
+            theme, genre, mood, language, gender, age, tempo, sound_texture, instrumental
+        )
+        if self._claim_key(cache_key, used_keys) and not force_fresh:
+            cached = self._cache_get(cache_key)
+            if cached:
+                return cached
+
+        user_message = self._music_user_message(
+            theme, genre, mood, language, gender, age, tempo, sound_texture, instrumental
+        )
+        content = self._complete(MUSIC_SYSTEM_PROMPT, user_message, max_tokens=2000)
+        result = self._parse_json(content)
 
         if instrumental:
             result["lyrics"] = ""
 
+        self._cache_set(cache_key, result)
         return result
 
+    def stream_music_prompt(
+        self,
+        theme: str,
+        genre: Optional[str] = None,
+        mood: Optional[str] = None,
+        language: Optional[str] = None,
+        gender: Optional[str] = None,
+        age: Optional[str] = None,
+        tempo: Optional[str] = None,
+        sound_texture: Optional[str] = None,
+        instrumental: bool = False,
+        force_fresh: bool = False,
+        on_field: Optional[Callable[[str, str], None]] = None
+    ) -> dict:
+        """
+        generate_music_prompt의 스트리밍 버전
+
+        응답 토큰을 받는 대로 JSON을 점진적으로 파싱해, title/style/lyrics가
+        완성되는 즉시 on_field(name, value)를 호출한다. 가사가 끝나기 전에
+        제목과 스타일을 UI에 보여주거나 (인스트루멘탈이면) Suno 요청을 시작할 수 있다.
+
+        Args:
+            on_field: 필드 완성 콜백 (호출한 스레드에서 실행됨)
+            나머지는 generate_music_prompt와 동일
+
+        Returns:
+            generate_music_prompt와 같은 형식의 딕셔너리
+        """
+        def emit(name: str, value: str):
+            if on_field and name in PROMPT_FIELDS:
+                on_field(name, "" if instrumental and name == "lyrics" else value)
+
+        cache_key = self._cache_key(
+            theme, genre, mood, language, gender, age, tempo, sound_texture, instrumental
+        )
+        if not force_fresh:
+            cached = self._cache_get(cache_key)
+            if cached:
+                for field in PROMPT_FIELDS:
+                    emit(field, cached.get(field, ""))
+                return cached
+
+        user_message = self._music_user_message(
+            theme, genre, mood, language, gender, age, tempo, sound_texture, instrumental
+        )
+        parser = JsonFieldStream()
+
+        def on_text(text: str):
+            for name, value in parser.feed(text):
+                emit(name, value)
+
+        content = self._complete_stream(MUSIC_SYSTEM_PROMPT, user_message, 2000, on_text)
+        try:
+            result = self._parse_json(content)
+        except ValueError:
+            # 객체 뒤에 불필요한 텍스트가 붙은 경우 등 - 스트림에서 추출한 필드 사용
+            if not all(field in parser.fields for field in ("title", "style")):
+                raise
+            result = dict(parser.fields)
+
+        if instrumental:
+            result["lyrics"] = ""
+
+        self._cache_set(cache_key, result)
+        return result
+
+    def generate_music_prompts_batched(
+        self,
+        themes: list,
+        genre: Optional[str] = None,
+        mood: Optional[str] = None,
+        language: Optional[str] = None,
+        gender: Optional[str] = None,
+        age: Optional[str] = None,
+        tempo: Optional[str] = None,
+        sound_texture: Optional[str] = None,
+        instrumental: bool = False,
+        batch_size: Optional[int] = None,
+        force_fresh: bool = False,
+        used_keys: Optional[set] = None,
+        genders: Optional[list] = None
+    ) -> list:
+        """
+        여러 주제의 프롬프트를 한 번의 요청으로 생성 (JSON 배열 응답)
+
+        시스템 프롬프트와 공통 조건을 batch_size곡마다 한 번만 보내므로
+        10~40곡 일괄 생성 시 토큰과 요청 오버헤드가 줄어든다.
+        응답에서 빠졌거나 형식이 잘못된 항목은 generate_music_prompt로 개별 재시도한다.
+
+        Args:
+            themes: 주제 리스트
+            batch_size: 요청 1회당 곡 수 (기본 config.PROMPT_BATCH_SIZE)
+            force_fresh: True면 캐시를 무시하고 새로 생성
+            used_keys: 여러 번 나눠 호출할 때 공유하는 캐시 키 집합 (generate_music_prompt 참고).
+                한 호출 안에서 반복된 주제는 이 값과 상관없이 새로 생성한다
+            genders: 주제별 보컬 성별 (themes와 같은 길이, 주면 gender 대신 사용 - 곡마다 랜덤 성별용)
+            나머지는 generate_music_prompt와 동일 (모든 주제에 공통 적용)
+
+        Returns:
+            프롬프트 딕셔너리 리스트 (themes 순서 유지, 재시도도 실패하면 {"theme", "error"})
+        """
+        batch_size = batch_size or config.PROMPT_BATCH_SIZE
+        options = {
+            "genre": genre,
+            "mood": mood,
+            "language": language,
+            "gender": gender,
+            "age": age,
+            "tempo": tempo,
+            "sound_texture": sound_texture,
+            "instrumental": instrumental,
+        }
+
+        # 주제별 조건 (성별만 주제마다 다를 수 있음)
+        item_options = [
+            dict(options, gender=genders[i]) if genders else options
+            for i in range(len(themes))
+        ]
+
+        # 캐시에 있는 주제는 요청에서 제외 (이번 일괄 생성에서 이미 쓴 키는 제외하지 않음)
+        if used_keys is None:
+            used_keys = set()
+        results = [None] * len(themes)
+        cache_keys = [self._cache_key(theme, **item_options[i]) for i, theme in enumerate(themes)]
+        for i, key in enumerate(cache_keys):
+            if self._claim_key(key, used_keys) and not force_fresh:
+                cached = self._cache_get(key)
+                if cached:
+                    cached["theme"] = themes[i]
+                    results[i] = cached
+        missing = [i for i, result in enumerate(results) if result is None]
+
+        for start in range(0, len(missing), batch_size):
+            chunk_indices = missing[start:start + batch_size]
+            chunk = [themes[i] for i in chunk_indices]
+            chunk_genders = [genders[i] for i in chunk_indices] if genders else None
+            try:
+                items = self._request_prompt_batch(chunk, chunk_genders, **options)
+            except Exception:
+                items = []  # 응답 전체가 깨졌으면 모든 항목 개별 재시도
+
+            # 인덱스로 매칭, 형식이 잘못된 항목은 버림
+            by_index = {}
+            for position, item in enumerate(items):
+                if not isinstance(item, dict):
+                    continue
+                index = item.get("index", position + 1)
+                if isinstance(index, int) and 1 <= index <= len(chunk) and self._is_valid_prompt(item, instrumental):
+                    by_index.setdefault(index - 1, item)
+
+            def resolve(position: int) -> dict:
+                theme = chunk[position]
+                item = by_index.get(position)
+                if item:
+                    prompt = {field: (item.get(field) or "").strip() for field in PROMPT_FIELDS}
+                    if instrumental:
+                        prompt["lyrics"] = ""
+                    self._cache_set(cache_keys[chunk_indices[position]], prompt)
+                else:
+                    try:
+                        prompt = self.generate_music_prompt(
+                            theme=theme, force_fresh=True, **item_options[chunk_indices[position]]
+                        )
+                    except Exception as e:
+                        return {"theme": theme, "error": str(e)}
+                prompt["theme"] = theme
+                return prompt
+
+            chunk_results = self._fan_out(resolve, list(range(len(chunk))))
+            for i, prompt in zip(chunk_indices, chunk_results):
+                results[i] = prompt
+
+        return results
+
     def generate_batch_prompts(
         self,
         themes: list,
         genre: Optional[str] = None,
         mood: Optional[str] = None,
         language: str = "한국어",
-        instrumental: bool = False
+        instrumental: bool = False,
+        max_workers: Optional[int] = None,
+        batched: bool = False
     ) -> list:
         """
-        여러 주제에 대한 프롬프트 일괄 생성
+        여러 주제에 대한 프롬프트 일괄 생성 (동시 호출)
 
         Args:
             themes: 주제 리스트
+            max_workers: 동시 LLM 호출 수 (기본 config.LLM_MAX_CONCURRENCY, 1이면 순차 실행)
+            batched: True면 여러 주제를 한 요청으로 묶어 생성 (generate_music_prompts_batched)
             나머지는 generate_music_prompt와 동일
 
         Returns:
-            프롬프트 딕셔너리 리스트
+            프롬프트 딕셔너리 리스트 (themes 순서 유지)
         """
-        results = []
+        used_keys = set()  # 같은 주제가 반복되면 캐시 대신 새로 생성
+        if batched:
+            return self.generate_music_prompts_batched(
+                themes,
+                genre=genre,
+                mood=mood,
+                language=language,
+                instrumental=instrumental,
+                used_keys=used_keys
+            )
 
-        for theme in themes:
+        def generate(theme: str) -> dict:
             try:
                 prompt = self.generate_music_prompt(
                     theme=theme,
                     genre=genre,
                     mood=mood,
                     language=language,
-                    instrumental=instrumental
+                    instrumental=instrumental,
+                    used_keys=used_keys
                 )
                 prompt["theme"] = theme
-                results.append(prompt)
+                return prompt
             except Exception as e:
-                results.append({
+                return {
                     "theme": theme,
                     "error": str(e)
-                })
+                }
 
-        return results
+        return self._fan_out(generate, themes, max_workers)
 
     def generate_style_variations(
         self,
         base_theme: str,
         genres: list,
-        language: str = "한국어"
+        language: str = "한국어",
+        max_workers: Optional[int] = None
     ) -> list:
         """
-        하나의 주제로 여러 장르 버전 생성
+        하나의 주제로 여러 장르 버전 생성 (동시 호출)
 
         Args:
             base_theme: 기본 주제
             genres: 장르 리스트 (예: ["K-pop", "R&B", "Lo-fi"])
             language: 가사 언어
+            max_workers: 동시 LLM 호출 수 (기본 config.LLM_MAX_CONCURRENCY, 1이면 순차 실행)
 
         Returns:
-            각 장르별 프롬프트 리스트
+            각 장르별 프롬프트 리스트 (genres 순서 유지)
         """
-        results = []
-
-        for genre in genres:
+        def generate(genre: str) -> dict:
             try:
-                prompt = self.generate_music_prompt(
+                return self.generate_music_prompt(
                     theme=base_theme,
                     genre=genre,
                     language=language
                 )
-                results.append(prompt)
             except Exception as e:
-                results.append({
+                return {
                     "genre": genre,
                     "error": str(e)
-                })
+                }
 
-        return results
+        return self._fan_out(generate, genres, max_workers)
+
+    def _fan_out(self, func: Callable, items: list, max_workers: Optional[int] = None) -> list:
+        """items 각각에 func를 동시 실행하고 입력 순서대로 결과 반환
+
+        SDK 클라이언트는 스레드 간 공유해도 안전하며, 호출별 타임아웃은
+        클라이언트 생성 시 지정한 self.timeout이 적용된다.
+        """
+        max_workers = max_workers or config.LLM_MAX_CONCURRENCY
+        if max_workers <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(executor.map(func, items))
 
     def generate_random_themes(self, count: int = 10, category: Optional[str] = None) -> list:
         """
@@ -257,43 +464,336 @@ JSON 형식으로만 응답해주세요."""
         Returns:
             주제 문자열 리스트
         """
-        system_prompt = """당신은 음악 주제 전문가입니다.
-K-pop, 발라드, R&B 등 한국 음악에 어울리는 참신하고 감성적인 주제를 생성해주세요.
-각 주제는 간결하게 2-5단어로 표현해주세요.
-
-응답은 반드시 JSON 배열로만 해주세요:
-["주제1", "주제2", "주제3", ...]"""
-
         user_message = f"""음악 주제 {count}개를 생성해주세요.
 카테고리: {category if category else "다양하게 (사랑, 이별, 일상, 계절, 감정 등)"}
 
 JSON 배열로만 응답해주세요."""
 
-        # API 호출 (OpenAI 또는 Anthropic)
+        # 짧은 시스템 프롬프트라 제공자 캐시 최소 길이에 못 미침 - 캐시 요청 안 함
+        content = self._complete(THEME_SYSTEM_PROMPT, user_message, max_tokens=1000, cache=False)
+        return self._parse_json(content)
+
+    def _cache_key(
+        self,
+        theme: str,
+        genre: Optional[str] = None,
+        mood: Optional[str] = None,
+        language: Optional[str] = None,
+        gender: Optional[str] = None,
+        age: Optional[str] = None,
+        tempo: Optional[str] = None,
+        sound_texture: Optional[str] = None,
+        instrumental: bool = False
+    ) -> str:
+        """생성 조건 + 제공자 + 시스템 프롬프트 버전으로 캐시 키 생성"""
+        return PromptCache.make_key(
+            provider="openai" if self.use_openai else "anthropic",
+            prompt_version=MUSIC_PROMPT_VERSION,
+            theme=theme,
+            genre=genre,
+            mood=mood,
+            language=language,
+            gender=gender,
+            age=age,
+            tempo=tempo,
+            sound_texture=sound_texture,
+            instrumental=instrumental,
+        )
+
+    def _claim_key(self, key: str, used_keys: Optional[set]) -> bool:
+        """used_keys에 키를 기록하고, 이번 일괄 생성에서 처음 쓰는 키인지 반환"""
+        if used_keys is None:
+            return True
+        with self._used_keys_lock:
+            if key in used_keys:
+                return False
+            used_keys.add(key)
+            return True
+
+    def _cache_get(self, key: str) -> Optional[dict]:
+        """캐시 조회 (캐시 오류는 무시하고 새로 생성)"""
+        if not self.cache:
+            return None
+        try:
+            return self.cache.get(key)
+        except Exception:
+            return None
+
+    def _cache_set(self, key: str, value: dict):
+        """캐시 저장 (theme 등 호출자가 붙인 필드는 제외)"""
+        if not self.cache:
+            return
+        try:
+            self.cache.set(key, {field: value.get(field, "") for field in PROMPT_FIELDS})
+        except Exception as e:
+            print(f"프롬프트 캐시 저장 실패: {e}")
+
+    def _build_conditions(
+        self,
+        genre: Optional[str],
+        mood: Optional[str],
+        language: Optional[str],
+        gender: Optional[str],
+        age: Optional[str],
+        tempo: Optional[str],
+        sound_texture: Optional[str],
+        instrumental: bool
+    ) -> list:
+        """주제를 제외한 생성 조건 목록 (선택된 파라미터만 포함)"""
+        conditions = []
+        conditions.append(f"장르: {genre if genre else '주제에 맞게 자동 선택'}")
+        conditions.append(f"분위기: {mood if mood else '주제에 맞게 자동 선택'}")
+
+        if language:
+            conditions.append(f"가사 언어: {language}")
+        else:
+            conditions.append("가사 언어: 주제와 장르에 맞게 자동 선택 (한국어, 일본어, 영어 중)")
+
+        if gender:
+            conditions.append(f"보컬 성별: {gender}")
+        if age:
+            conditions.append(f"보컬 나이: {age}")
+        if tempo:
+            conditions.append(f"템포: {tempo}")
+        if sound_texture:
+            conditions.append(f"사운드 질감: {sound_texture}")
+
+        conditions.append(f"인스트루멘탈: {'예 (가사 없이 스타일만)' if instrumental else '아니오 (가사 포함)'}")
+        return conditions
+
+    def _music_user_message(
+        self,
+        theme: str,
+        genre: Optional[str],
+        mood: Optional[str],
+        language: Optional[str],
+        gender: Optional[str],
+        age: Optional[str],
+        tempo: Optional[str],
+        sound_texture: Optional[str],
+        instrumental: bool
+    ) -> str:
+        """곡 1개용 사용자 메시지"""
+        conditions = [f"주제: {theme}"] + self._build_conditions(
+            genre, mood, language, gender, age, tempo, sound_texture, instrumental
+        )
+
+        return f"""다음 조건으로 Suno 음악 프롬프트를 만들어주세요:
+
+{chr(10).join(conditions)}{self._genre_reference(genre)}
+
+JSON 형식으로만 응답해주세요."""
+
+    def _genre_reference(self, genre: Optional[str]) -> str:
+        """장르별 레퍼런스 프롬프트 (없으면 빈 문자열)"""
+        if genre and genre in GENRE_REFERENCE:
+            return f"\n\n## 장르 레퍼런스 (style에 반드시 포함):\n{GENRE_REFERENCE[genre]}"
+        return ""
+
+    def _request_prompt_batch(self, themes: list, genders: Optional[list] = None, **options) -> list:
+        """주제 여러 개를 한 요청으로 보내고 JSON 배열 응답을 파싱
+
+        genders를 주면 공통 조건 대신 주제 옆에 보컬 성별을 적는다.
+        출력이 곡 수만큼 길어지므로 타임아웃도 곡 수에 비례해 늘린다.
+        """
+        if genders:
+            options = dict(options, gender=None)
+            theme_lines = [
+                f"{i}. {theme} (보컬 성별: {gender})" if gender else f"{i}. {theme}"
+                for i, (theme, gender) in enumerate(zip(themes, genders), 1)
+            ]
+        else:
+            theme_lines = [f"{i}. {theme}" for i, theme in enumerate(themes, 1)]
+        conditions = self._build_conditions(**options)
+
+        user_message = f"""다음 공통 조건으로 주제 {len(themes)}개 각각에 대한 Suno 음악 프롬프트를 만들어주세요:
+
+{chr(10).join(conditions)}{self._genre_reference(options.get("genre"))}
+
+## 주제 목록:
+{chr(10).join(theme_lines)}
+
+각 주제마다 위 JSON 형식의 객체를 만들고, 주제 번호를 "index" 필드에 넣어
+주제 순서대로 JSON 배열로만 응답해주세요:
+[{{"index": 1, "title": "...", "style": "...", "lyrics": "..."}}, ...]"""
+
+        content = self._complete(
+            MUSIC_SYSTEM_PROMPT,
+            user_message,
+            max_tokens=min(config.PROMPT_BATCH_TOKENS_PER_SONG * len(themes), 32000),
+            timeout=self.timeout * len(themes)
+        )
+        items = self._parse_json(content)
+        if not isinstance(items, list):
+            raise ValueError("JSON 배열 응답이 아닙니다")
+        return items
+
+    def _is_valid_prompt(self, item: dict, instrumental: bool) -> bool:
+        """일괄 생성 결과 항목 검증 (title/style/lyrics 문자열)"""
+        for field in PROMPT_FIELDS:
+            value = item.get(field)
+            if field == "lyrics" and instrumental and not value:
+                continue
+            if not isinstance(value, str) or not value.strip():
+                return False
+        return True
+
+    def get_usage_stats(self) -> dict:
+        """누적 토큰 사용량 및 제공자 프롬프트 캐시 적중률"""
+        with self._usage_lock:
+            stats = dict(self.usage)
+        total_input = stats["input_tokens"] + stats["cache_read_tokens"] + stats["cache_write_tokens"]
+        stats["cache_hit_rate"] = stats["cache_read_tokens"] / total_input if total_input else 0.0
+        return stats
+
+    def _complete(
+        self,
+        system_prompt: str,
+        user_message: str,
+        max_tokens: int,
+        cache: bool = True,
+        timeout: Optional[float] = None
+    ) -> str:
+        """LLM 호출 (OpenAI 또는 Anthropic) 후 응답 텍스트 반환
+
+        정적인 시스템 프롬프트를 항상 맨 앞에 두고 제공자 측 프롬프트 캐시를 쓴다.
+        Anthropic은 cache_control로 명시하고, OpenAI는 동일 접두부를 자동 캐시하므로
+        prompt_cache_key로 같은 시스템 프롬프트 요청이 같은 캐시로 가도록 한다.
+        두 제공자 모두 약 1024 토큰 미만의 접두부는 캐시하지 않으므로, cache=True인데
+        Anthropic 응답에 캐시 쓰기/읽기 토큰이 모두 0이면 uncached_requests로 집계한다.
+        timeout을 주면 이 호출에만 클라이언트 기본 타임아웃 대신 사용한다.
+        """
+        client = self.client.with_options(timeout=timeout) if timeout else self.client
         if self.use_openai:
-            response = self.client.chat.completions.create(
+            response = client.chat.completions.create(
                 model="gpt-4o",
-                max_tokens=1000,
+                max_tokens=max_tokens,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_message}
-                ]
+                ],
+                extra_body={"prompt_cache_key": self._prompt_cache_key(system_prompt)}
             )
-            content = response.choices[0].message.content.strip()
-        else:
-            response = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=1000,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_message}]
+            usage = response.usage
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+            self._record_usage(
+                input_tokens=(usage.prompt_tokens or 0) - cached,
+                output_tokens=usage.completion_tokens or 0,
+                cache_read_tokens=cached
             )
-            content = response.content[0].text.strip()
+            return response.choices[0].message.content.strip()
+
+        response = client.messages.create(
+            model="claude-sonnet-4-20250514",
+            max_tokens=max_tokens,
+            system=self._system_blocks(system_prompt, cache),
+            messages=[{"role": "user", "content": user_message}]
+        )
+        self._record_anthropic_usage(response.usage, cache)
+        return response.content[0].text.strip()
+
+    def _complete_stream(
+        self,
+        system_prompt: str,
+        user_message: str,
+        max_tokens: int,
+        on_text: Callable[[str], None],
+        cache: bool = True
+    ) -> str:
+        """LLM 스트리밍 호출 - 텍스트 조각마다 on_text 호출 후 전체 텍스트 반환"""
+        parts = []
 
-        # JSON 파싱
+        if self.use_openai:
+            stream = self.client.chat.completions.create(
+                model="gpt-4o",
+                max_tokens=max_tokens,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message}
+                ],
+                stream=True,
+                stream_options={"include_usage": True},
+                extra_body={"prompt_cache_key": self._prompt_cache_key(system_prompt)}
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    text = chunk.choices[0].delta.content
+                    parts.append(text)
+                    on_text(text)
+                if chunk.usage:
+                    details = getattr(chunk.usage, "prompt_tokens_details", None)
+                    cached = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+                    self._record_usage(
+                        input_tokens=(chunk.usage.prompt_tokens or 0) - cached,
+                        output_tokens=chunk.usage.completion_tokens or 0,
+                        cache_read_tokens=cached
+                    )
+            return "".join(parts).strip()
+
+        with self.client.messages.stream(
+            model="claude-sonnet-4-20250514",
+            max_tokens=max_tokens,
+            system=self._system_blocks(system_prompt, cache),
+            messages=[{"role": "user", "content": user_message}]
+        ) as stream:
+            for text in stream.text_stream:
+                parts.append(text)
+                on_text(text)
+            usage = stream.get_final_message().usage
+
+        self._record_anthropic_usage(usage, cache)
+        return "".join(parts).strip()
+
+    def _system_blocks(self, system_prompt: str, cache: bool) -> list:
+        """Anthropic system 블록 (cache=True면 cache_control 표시)"""
+        block = {"type": "text", "text": system_prompt}
+        if cache:
+            block["cache_control"] = {"type": "ephemeral"}
+        return [block]
+
+    def _record_anthropic_usage(self, usage, cache: bool):
+        """Anthropic 응답 사용량 기록 - 캐시를 요청했는데 쓰기/읽기가 없으면 캐시 미적용으로 집계"""
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        uncached = cache and not cache_read and not cache_write
+        if uncached and not self._warned_uncached:
+            self._warned_uncached = True
+            print("프롬프트 캐시 미적용: 시스템 프롬프트가 캐시 최소 길이(약 1024 토큰)보다 짧을 수 있습니다")
+        self._record_usage(
+            input_tokens=usage.input_tokens or 0,
+            output_tokens=usage.output_tokens or 0,
+            cache_read_tokens=cache_read,
+            cache_write_tokens=cache_write,
+            uncached=uncached
+        )
+
+    def _prompt_cache_key(self, system_prompt: str) -> str:
+        """OpenAI 프롬프트 캐시 라우팅 키 (시스템 프롬프트별로 고정)"""
+        return "suno-" + hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
+
+    def _record_usage(
+        self,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        uncached: bool = False
+    ):
+        """토큰 사용량 누적 (동시 호출 대비 lock)"""
+        with self._usage_lock:
+            self.usage["requests"] += 1
+            self.usage["uncached_requests"] += int(uncached)
+            self.usage["input_tokens"] += input_tokens
+            self.usage["output_tokens"] += output_tokens
+            self.usage["cache_read_tokens"] += cache_read_tokens
+            self.usage["cache_write_tokens"] += cache_write_tokens
+
+    def _parse_json(self, content: str):
+        """응답 텍스트에서 JSON 블록 추출 후 파싱"""
         if "```json" in content:
             content = content.split("```json")[1].split("```")[0].strip()
         elif "```" in content:
             content = content.split("```")[1].split("```")[0].strip()
 
-        import json
         return json.loads(content)
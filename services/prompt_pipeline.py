@@ -0,0 +1,111 @@
+"""
+프롬프트 선생성 파이프라인 - Suno 렌더링 중에 다음 곡 프롬프트를 미리 생성
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, Optional
+import config
+
+
+class PromptPrefetcher:
+    """작업 목록의 프롬프트를 앞서 생성해두는 생산자/소비자 파이프라인
+
+    result(job)을 호출하면 해당 작업의 프롬프트를 돌려주고, 뒤따르는 작업들을
+    최대 prefetch_size개까지 백그라운드에서 미리 생성한다.
+    generate 함수는 워커 스레드에서 실행되므로 Streamlit 호출을 넣지 않는다.
+
+    generate_batch를 주면 batch_key가 같은 연속 작업을 batch_size개씩 묶어
+    한 번에 생성한다 (generate_batch(jobs) -> 같은 순서의 프롬프트 리스트).
+    결과 항목에 "error"가 있으면 해당 작업의 result()에서 예외로 올린다.
+
+    사용 예:
+        with PromptPrefetcher(jobs, build_prompt) as prefetcher:
+            for job in jobs:
+                prompt_data = prefetcher.result(job)
+    """
+
+    def __init__(
+        self,
+        jobs: list,
+        generate: Optional[Callable[[dict], dict]] = None,
+        prefetch_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        generate_batch: Optional[Callable[[list], list]] = None,
+        batch_key: Optional[Callable[[dict], Hashable]] = None,
+        batch_size: Optional[int] = None
+    ):
+        if generate is None and generate_batch is None:
+            raise Exception("generate 또는 generate_batch가 필요합니다")
+
+        self.jobs = list(jobs)
+        self.generate = generate
+        self.generate_batch = generate_batch
+        self.batch_key = batch_key or (lambda job: None)
+        self.batch_size = max(1, batch_size or config.PROMPT_BATCH_SIZE) if generate_batch else 1
+        self.prefetch_size = max(1, prefetch_size or config.PROMPT_PREFETCH_SIZE)
+        self._executor = ThreadPoolExecutor(
+            max_workers=min(max_workers or config.PROMPT_PREFETCH_WORKERS, self.prefetch_size)
+        )
+        self._futures = {}  # id(job) -> (Future, 묶음 안 위치 또는 None)
+        self._taken = set()  # result()로 이미 가져간 작업 id
+        self._next_index = 0  # 아직 제출하지 않은 첫 작업 인덱스
+        self._fill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def result(self, job: dict) -> dict:
+        """
+        작업의 프롬프트 반환 (미리 생성됐으면 즉시, 아니면 완료까지 대기)
+
+        Raises:
+            프롬프트 생성 중 발생한 예외
+        """
+        self._taken.add(id(job))
+        entry = self._futures.pop(id(job), None)
+        if entry is None:
+            entry = self._submit([job])[id(job)]
+        self._fill()
+
+        future, position = entry
+        if position is None:
+            return future.result()
+
+        prompt_data = future.result()[position]
+        if prompt_data.get("error"):
+            raise Exception(prompt_data["error"])
+        return prompt_data
+
+    def close(self):
+        """남은 선생성 작업 취소"""
+        for future, _ in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._executor.shutdown(wait=False)
+
+    def _fill(self):
+        """선생성 창을 prefetch_size개까지 채우기 (묶음 생성이면 묶음 단위로)"""
+        while len(self._futures) < self.prefetch_size and self._next_index < len(self.jobs):
+            group = []
+            while self._next_index < len(self.jobs) and len(group) < self.batch_size:
+                job = self.jobs[self._next_index]
+                if id(job) in self._taken:
+                    self._next_index += 1
+                    continue
+                if group and self.batch_key(job) != self.batch_key(group[0]):
+                    break
+                group.append(job)
+                self._next_index += 1
+            if group:
+                self._futures.update(self._submit(group))
+
+    def _submit(self, group: list) -> dict:
+        """작업(들)을 워커에 제출하고 {id(job): (Future, 위치)} 반환"""
+        if self.generate_batch is None:
+            job = group[0]
+            return {id(job): (self._executor.submit(self.generate, job), None)}
+
+        future = self._executor.submit(self.generate_batch, group)
+        return {id(job): (future, position) for position, job in enumerate(group)}
@@ -3,8 +3,19 @@ SunoAPI.org 클라이언트
 """
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 import config
+from services.downloader import download_file
+
+# 생성 실패로 간주하는 태스크 상태
+FAILED_STATUSES = {
+    "FAILED",
+    "CREATE_TASK_FAILED",
+    "GENERATE_AUDIO_FAILED",
+    "CALLBACK_EXCEPTION",
+    "SENSITIVE_WORD_ERROR",
+}
 
 
 class SunoClient:
@@ -165,31 +176,34 @@ class SunoClient:
             status = status_data.get("status")
 
             if status == "SUCCESS":
-                response = status_data.get("response", {})
-                suno_data = response.get("sunoData", [])
-
-                # 결과를 기존 포맷에 맞게 변환
-                clips = []
-                for item in suno_data:
-                    clips.append({
-                        "id": item.get("id"),
-                        "title": item.get("title"),
-                        "audio_url": item.get("audioUrl") or item.get("sourceAudioUrl"),
-                        "image_url": item.get("imageUrl") or item.get("sourceImageUrl"),
-                        "duration": item.get("duration"),
-                        "status": "complete",
-                        "tags": item.get("tags"),
-                        "prompt": item.get("prompt"),
-                        "task_id": task_id,
-                    })
-                return clips
-
-            elif status == "FAILED":
+                return self._parse_clips(task_id, status_data)
+
+            elif status in FAILED_STATUSES:
                 error_msg = status_data.get("errorMessage", "Unknown error")
                 raise Exception(f"생성 실패: {error_msg}")
 
             time.sleep(config.GENERATION_WAIT_TIME)
 
+    def _parse_clips(self, task_id: str, status_data: dict) -> list:
+        """record-info 응답을 기존 클립 포맷으로 변환"""
+        response = status_data.get("response") or {}
+        suno_data = response.get("sunoData") or []
+
+        clips = []
+        for item in suno_data:
+            clips.append({
+                "id": item.get("id"),
+                "title": item.get("title"),
+                "audio_url": item.get("audioUrl") or item.get("sourceAudioUrl"),
+                "image_url": item.get("imageUrl") or item.get("sourceImageUrl"),
+                "duration": item.get("duration"),
+                "status": "complete",
+                "tags": item.get("tags"),
+                "prompt": item.get("prompt"),
+                "task_id": task_id,
+            })
+        return clips
+
     def _get_task_status(self, task_id: str, max_retries: int = 3) -> dict:
         """태스크 상태 조회 (재시도 로직 포함)"""
         url = f"{self.base_url}/api/v1/generate/record-info?taskId={task_id}"
@@ -222,6 +236,13 @@ class SunoClient:
 
         raise Exception(f"상태 조회 실패 ({max_retries}회 재시도 후): {last_error}")
 
+    def get_task_clips(self, task_id: str) -> list:
+        """완료된 태스크의 클립 목록 조회 (오디오 URL 갱신용, 미완료면 빈 리스트)"""
+        status_data = self._get_task_status(task_id)
+        if status_data.get("status") != "SUCCESS":
+            return []
+        return self._parse_clips(task_id, status_data)
+
     def get_clips(self, clip_ids: list) -> list:
         """클립 정보 조회 (호환성 유지)"""
         # sunoapi.org에서는 task 기반이라 직접 clip 조회 불가
@@ -232,22 +253,14 @@ class SunoClient:
         """단일 클립 정보 조회 (호환성 유지)"""
         return {}
 
-    def download_audio(self, audio_url: str, save_path: str) -> tuple:
-        """오디오 파일 다운로드 (파일 + bytes 데이터 반환)"""
-        response = requests.get(audio_url, stream=True)
-
-        if response.status_code != 200:
-            raise Exception(f"다운로드 실패: {response.status_code}")
-
-        # 메모리에 데이터 저장
-        audio_data = b''
+    def download_audio(self, audio_url: str, save_path: str) -> str:
+        """오디오 파일 다운로드 (디스크로 바로 스트리밍, 저장 경로 반환)
 
-        with open(save_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-                audio_data += chunk
-
-        return save_path, audio_data
+        .part 파일에 받은 뒤 크기 검증 후 교체하며, 끊기면 Range로 이어받는다.
+        메모리에 bytes를 누적하지 않으므로 Drive 업로드 등 후속 처리는
+        반환된 파일 경로에서 읽는다.
+        """
+        return download_file(audio_url, save_path)
 
     def generate_async(
         self,
@@ -301,3 +314,125 @@ class SunoClient:
             생성된 음악 정보 리스트
         """
         return self._wait_for_task(task_id)
+
+    def create_poller(self) -> "TaskPoller":
+        """다중 태스크 폴러 생성 (실행 중 태스크 추가가 필요한 경우)"""
+        return TaskPoller(self)
+
+    def wait_for_many(self, task_ids: list):
+        """
+        여러 태스크를 동시에 폴링하며 완료되는 순서대로 결과 반환
+
+        Args:
+            task_ids: Suno task ID 리스트
+
+        Yields:
+            (task_id, clips, error) - 성공 시 error는 None, 실패 시 clips는 빈 리스트
+        """
+        poller = self.create_poller()
+        for task_id in task_ids:
+            poller.add(task_id)
+
+        while poller.pending:
+            for result in poller.poll():
+                yield result
+
+
+class TaskPoller:
+    """여러 taskId의 record-info를 한 루프에서 동시 조회 (태스크별 적응형 백오프)
+
+    상태가 바뀐 태스크는 POLL_MIN_INTERVAL 후 다시 조회하고, 변화가 없으면
+    POLL_BACKOFF_FACTOR 배씩 POLL_MAX_INTERVAL까지 간격을 늘린다.
+    시각은 시스템 시계 변경에 영향받지 않도록 time.monotonic()을 쓴다.
+    """
+
+    def __init__(self, client: SunoClient, max_workers: Optional[int] = None):
+        self.client = client
+        self.max_workers = max_workers or config.POLL_MAX_WORKERS
+        # task_id -> {"started_at", "next_poll_at", "interval", "status"}
+        self._tasks = {}
+
+    @property
+    def pending(self) -> list:
+        """아직 끝나지 않은 task ID 목록"""
+        return list(self._tasks)
+
+    def add(self, task_id: str):
+        """폴링 대상 태스크 추가"""
+        now = time.monotonic()
+        self._tasks[task_id] = {
+            "started_at": now,
+            "next_poll_at": now + config.POLL_MIN_INTERVAL,
+            "interval": config.POLL_MIN_INTERVAL,
+            "status": None,
+        }
+
+    def poll(self) -> list:
+        """
+        가장 이른 폴링 시점까지 대기한 뒤, 조회 시점이 된 태스크를 동시에 조회
+
+        Returns:
+            이번 라운드에 끝난 태스크 [(task_id, clips, error), ...]
+        """
+        if not self._tasks:
+            return []
+
+        next_poll_at = min(t["next_poll_at"] for t in self._tasks.values())
+        delay = next_poll_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        now = time.monotonic()
+        due = [task_id for task_id, t in self._tasks.items() if t["next_poll_at"] <= now]
+        if not due:
+            return []
+
+        finished = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(due))) as executor:
+            futures = {
+                executor.submit(self.client._get_task_status, task_id): task_id
+                for task_id in due
+            }
+            for future in as_completed(futures):
+                result = self._handle_status(futures[future], future)
+                if result:
+                    finished.append(result)
+
+        for task_id, _, _ in finished:
+            self._tasks.pop(task_id, None)
+
+        return finished
+
+    def _handle_status(self, task_id: str, future) -> Optional[tuple]:
+        """조회 결과 처리 - 끝났으면 결과 튜플, 진행 중이면 다음 폴링 예약 후 None"""
+        state = self._tasks[task_id]
+
+        try:
+            status_data = future.result()
+        except Exception as e:
+            return task_id, [], str(e)
+
+        status = status_data.get("status")
+
+        if status == "SUCCESS":
+            return task_id, self.client._parse_clips(task_id, status_data), None
+
+        if status in FAILED_STATUSES:
+            error_msg = status_data.get("errorMessage", "Unknown error")
+            return task_id, [], f"생성 실패: {error_msg}"
+
+        now = time.monotonic()
+        if now - state["started_at"] > config.MAX_WAIT_TIME:
+            return task_id, [], "생성 시간 초과"
+
+        # 상태가 바뀌었으면 간격 초기화, 그대로면 점진적으로 늘림
+        if status != state["status"]:
+            state["interval"] = config.POLL_MIN_INTERVAL
+        else:
+            state["interval"] = min(
+                state["interval"] * config.POLL_BACKOFF_FACTOR,
+                config.POLL_MAX_INTERVAL
+            )
+        state["status"] = status
+        state["next_poll_at"] = now + state["interval"]
+        return None
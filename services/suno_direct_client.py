@@ -7,6 +7,7 @@ import base64
 import requests
 from typing import Optional
 import config
+from services.downloader import download_file
 
 
 class SunoDirectClient:
@@ -178,14 +179,5 @@ class SunoDirectClient:
         return self._request("GET", f"/api/clip/{clip_id}")
 
     def download_audio(self, audio_url: str, save_path: str) -> str:
-        """오디오 파일 다운로드"""
-        response = requests.get(audio_url, stream=True, timeout=60)
-
-        if response.status_code != 200:
-            raise Exception(f"다운로드 실패: HTTP {response.status_code}")
-
-        with open(save_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        return save_path
+        """오디오 파일 다운로드 (이어받기 + 크기 검증 후 원자적 저장)"""
+        return download_file(audio_url, save_path)
@@ -120,6 +120,14 @@ class TaskManager:
         """현재 진행 중인 작업 수"""
         return len(self.tasks["pending"])
 
+    def count_today_tasks(self) -> int:
+        """오늘 요청된 작업 수 (실패 작업 제외, 크레딧 사용량 계산용)"""
+        today = datetime.now().strftime("%Y-%m-%d")
+        tasks = self.tasks["pending"] + [
+            t for t in self.tasks["completed"] if t.get("status") != "failed"
+        ]
+        return len([t for t in tasks if t.get("created_at", "").startswith(today)])
+
     def can_add_task(self) -> bool:
         """새 작업 추가 가능 여부"""
         return self.get_active_count() < config.MAX_PARALLEL_GENERATIONS
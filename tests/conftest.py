@@ -0,0 +1,41 @@
+"""
+공용 pytest 픽스처 - 가짜 Drive 서버와 그 서버에 붙는 GoogleDriveManager
+"""
+import pytest
+import config
+import services.drive_batch
+import services.google_drive_manager as google_drive_manager
+from tests.fake_drive import FakeDrive
+
+ROOT_FOLDER_ID = "root-folder"
+
+
+@pytest.fixture
+def fake_drive(monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    drive = FakeDrive().start()
+    drive.files[ROOT_FOLDER_ID] = {
+        "id": ROOT_FOLDER_ID, "name": "root", "mimeType": "application/vnd.google-apps.folder",
+        "parents": [], "content": b"",
+    }
+    yield drive
+    drive.stop()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """재시도 대기 시간 기록 (실제로는 기다리지 않음)"""
+    calls = []
+    monkeypatch.setattr(services.drive_batch.time, "sleep", calls.append)
+    return calls
+
+
+@pytest.fixture
+def drive_manager(fake_drive, sleeps, tmp_path, monkeypatch):
+    """가짜 서버에 연결된 GoogleDriveManager (캐시 파일은 tmp_path에)"""
+    monkeypatch.setattr(config, "DRIVE_UPLOAD_SESSIONS_FILE", tmp_path / "drive_upload_sessions.json")
+    monkeypatch.setattr(config, "DRIVE_FILE_CACHE_FILE", tmp_path / "drive_file_cache.json")
+    monkeypatch.setattr(config, "DRIVE_FOLDER_CACHE_FILE", tmp_path / "drive_folder_cache.json")
+    monkeypatch.setattr(google_drive_manager.GoogleDriveManager, "_authenticate", lambda self: object())
+    monkeypatch.setattr(google_drive_manager, "build", lambda *args, **kwargs: fake_drive.build_service())
+    return google_drive_manager.GoogleDriveManager(ROOT_FOLDER_ID)
@@ -0,0 +1,374 @@
+"""
+테스트용 가짜 Google Drive 서버 (로컬 HTTP)
+
+files.list/create/update, 배치 엔드포인트(multipart/mixed), 재개 가능 업로드를
+메모리 안에서 흉내 낸다. googleapiclient 서비스는 정적 discovery 문서의 주소만
+이 서버로 바꿔서 만들므로 실제 요청 직렬화/응답 파싱 코드가 그대로 실행된다.
+"""
+import hashlib
+import json
+import re
+import threading
+import uuid
+from dataclasses import dataclass, field
+from email.parser import BytesParser, Parser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+import googleapiclient
+from googleapiclient.discovery import build_from_document
+from googleapiclient.http import build_http
+
+FOLDER_MIME = "application/vnd.google-apps.folder"
+DISCOVERY_DOC = Path(googleapiclient.__file__).parent / "discovery_cache" / "documents" / "drive.v3.json"
+
+
+@dataclass
+class FakeRequest:
+    method: str
+    path: str
+    query: dict
+    headers: dict
+    body: bytes = b""
+
+    def param(self, name: str, default=None):
+        return self.query.get(name, [default])[0]
+
+    def json(self) -> dict:
+        return json.loads(self.body or b"{}")
+
+
+@dataclass
+class Fault:
+    status: int
+    when: Callable[[FakeRequest], bool]
+    times: int
+    after: bool  # True면 요청을 처리한 뒤 오류 응답 (서버엔 반영됐는데 응답만 유실)
+
+
+@dataclass
+class UploadSession:
+    file_id: Optional[str]  # 기존 파일 내용 교체면 파일 ID
+    metadata: dict
+    size: int
+    data: bytearray = field(default_factory=bytearray)
+    result: Optional[dict] = None
+
+
+class FakeDrive:
+    """메모리 Drive 상태 + 요청 기록 + 오류 주입"""
+
+    BATCH_LIMIT = 100
+
+    def __init__(self):
+        self.files = {}  # 파일 ID → {"id", "name", "mimeType", "parents", "content"}
+        self.sessions = {}  # 세션 ID → UploadSession
+        self.requests = []  # 처리한 FakeRequest (배치 안의 개별 요청 포함)
+        self.batch_sizes = []  # 배치 요청마다 담긴 개별 요청 수
+        self.reverse_batch_responses = False  # 배치 응답 순서를 뒤집어 Content-ID 매핑 확인
+        self._faults = []
+        self._lock = threading.RLock()
+        self._next_id = 0
+        self._server = None
+        self.root_url = None
+
+    # 서버 수명
+
+    def start(self):
+        drive = self
+
+        class Handler(_Handler):
+            pass
+        Handler.drive = drive
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.root_url = f"http://127.0.0.1:{self._server.server_address[1]}/"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def build_service(self):
+        """이 서버를 가리키는 drive v3 서비스 객체 (호출마다 새 http)"""
+        with open(DISCOVERY_DOC, encoding="utf-8") as f:
+            doc = json.load(f)
+        doc["rootUrl"] = doc["mtlsRootUrl"] = self.root_url
+        doc["baseUrl"] = self.root_url + doc["servicePath"]
+        return build_from_document(doc, http=build_http())
+
+    # 상태 조작 / 조회
+
+    def add_file(self, name: str, parent: str, content: bytes = b"", mime_type: str = "application/octet-stream") -> str:
+        with self._lock:
+            return self._create({"name": name, "parents": [parent], "mimeType": mime_type}, content)["id"]
+
+    def add_folder(self, name: str, parent: str) -> str:
+        return self.add_file(name, parent, mime_type=FOLDER_MIME)
+
+    def children(self, parent: str, folders: Optional[bool] = None) -> dict:
+        """{이름: 파일} (folders가 True/False면 폴더만/파일만)"""
+        return {
+            f["name"]: f for f in self.files.values()
+            if parent in f["parents"] and (folders is None or (f["mimeType"] == FOLDER_MIME) == folders)
+        }
+
+    def fail(self, status: int, when: Callable[[FakeRequest], bool] = lambda request: True, times: int = 1, after: bool = False):
+        """조건에 맞는 다음 요청 times개에 status 오류 응답"""
+        with self._lock:
+            self._faults.append(Fault(status, when, times, after))
+
+    def expire_sessions(self):
+        """재개 가능 업로드 세션 만료 (이후 세션 URI 요청은 404)"""
+        with self._lock:
+            self.sessions.clear()
+
+    def requests_to(self, method: str, pattern: str) -> list:
+        return [r for r in self.requests if r.method == method and re.search(pattern, r.path)]
+
+    # 요청 처리
+
+    def handle(self, request: FakeRequest) -> tuple:
+        """(상태 코드, 헤더, JSON 본문 또는 None)"""
+        with self._lock:
+            self.requests.append(request)
+            fault = self._take_fault(request)
+            if fault and not fault.after:
+                return self._error(fault.status)
+            result = self._route(request)
+            if fault:
+                return self._error(fault.status)
+            return result
+
+    def _take_fault(self, request: FakeRequest) -> Optional[Fault]:
+        for fault in self._faults:
+            if fault.times > 0 and fault.when(request):
+                fault.times -= 1
+                return fault
+        return None
+
+    def _route(self, request: FakeRequest) -> tuple:
+        path = request.path
+        if path == "/drive/v3/files" and request.method == "GET":
+            return self._list(request)
+        if path == "/drive/v3/files" and request.method == "POST":
+            return 200, {}, self._public(self._create(request.json()))
+        match = re.fullmatch(r"/drive/v3/files/([^/]+)", path)
+        if match and request.method == "PATCH":
+            return self._update(match.group(1), request)
+        match = re.fullmatch(r"/upload/drive/v3/files(?:/([^/]+))?", path)
+        if match and request.param("uploadType") == "resumable":
+            return self._start_session(match.group(1), request)
+        if match and request.param("uploadType") == "multipart":
+            return self._multipart_upload(match.group(1), request)
+        match = re.fullmatch(r"/upload/sessions/([^/]+)", path)
+        if match and request.method == "PUT":
+            return self._put_chunk(match.group(1), request)
+        return self._error(400)
+
+    def _list(self, request: FakeRequest) -> tuple:
+        q = request.param("q", "")
+        parent = re.search(r"'([^']+)' in parents", q)
+        name = re.search(r"name='([^']*)'", q)
+        mime = re.search(r"mimeType\s*(!?=)\s*'([^']+)'", q)
+
+        items = []
+        for f in self.files.values():
+            if parent and parent.group(1) not in f["parents"]:
+                continue
+            if name and f["name"] != name.group(1):
+                continue
+            if mime and (f["mimeType"] == mime.group(2)) != (mime.group(1) == "="):
+                continue
+            items.append(self._public(f))
+
+        start = int(request.param("pageToken") or 0)
+        page_size = int(request.param("pageSize") or 100)
+        body = {"files": items[start:start + page_size]}
+        if start + page_size < len(items):
+            body["nextPageToken"] = str(start + page_size)
+        return 200, {}, body
+
+    def _create(self, metadata: dict, content: bytes = b"") -> dict:
+        self._next_id += 1
+        file_id = f"f{self._next_id}"
+        self.files[file_id] = {
+            "id": file_id,
+            "name": metadata.get("name", "Untitled"),
+            "mimeType": metadata.get("mimeType", "application/octet-stream"),
+            "parents": list(metadata.get("parents", [])),
+            "content": bytes(content),
+        }
+        return self.files[file_id]
+
+    def _update(self, file_id: str, request: FakeRequest) -> tuple:
+        f = self.files.get(file_id)
+        if f is None:
+            return self._error(404)
+        f.update({k: v for k, v in request.json().items() if k in ("name", "mimeType")})
+        for parent in (request.param("removeParents") or "").split(","):
+            if parent in f["parents"]:
+                f["parents"].remove(parent)
+        for parent in (request.param("addParents") or "").split(","):
+            if parent and parent not in f["parents"]:
+                f["parents"].append(parent)
+        return 200, {}, self._public(f)
+
+    def _start_session(self, file_id: Optional[str], request: FakeRequest) -> tuple:
+        if file_id and file_id not in self.files:
+            return self._error(404)
+        session_id = uuid.uuid4().hex
+        self.sessions[session_id] = UploadSession(
+            file_id=file_id,
+            metadata=request.json(),
+            size=int(request.headers.get("x-upload-content-length", 0)),
+        )
+        return 200, {"Location": f"{self.root_url}upload/sessions/{session_id}"}, None
+
+    def _multipart_upload(self, file_id: Optional[str], request: FakeRequest) -> tuple:
+        """한 번에 보내는 업로드 (multipart/related: 메타데이터 JSON + 내용)"""
+        message = BytesParser().parsebytes(
+            b"Content-Type: " + request.headers["content-type"].encode() + b"\r\n\r\n" + request.body
+        )
+        metadata_part, media_part = message.get_payload()
+        content = media_part.get_payload(decode=True)
+        if not file_id:
+            return 200, {}, self._public(self._create(json.loads(metadata_part.get_payload()), content))
+        if file_id not in self.files:
+            return self._error(404)
+        self.files[file_id]["content"] = content
+        return 200, {}, self._public(self.files[file_id])
+
+    def _put_chunk(self, session_id: str, request: FakeRequest) -> tuple:
+        session = self.sessions.get(session_id)
+        if session is None:
+            return self._error(404)
+
+        content_range = request.headers.get("content-range", "")
+        chunk = re.fullmatch(r"bytes (\d+)-(\d+)/(\d+|\*)", content_range)
+        if chunk:
+            start = int(chunk.group(1))
+            if start != len(session.data):
+                return self._error(400)
+            session.data += request.body
+            if chunk.group(3) != "*":
+                session.size = int(chunk.group(3))
+        elif not re.fullmatch(r"bytes \*/(\d+|\*)", content_range):
+            return self._error(400)
+
+        if session.result is None and session.size and len(session.data) >= session.size:
+            if session.file_id:
+                f = self.files[session.file_id]
+                f["content"] = bytes(session.data)
+            else:
+                f = self._create(session.metadata, session.data)
+            session.result = self._public(f)
+
+        if session.result is not None:
+            return 200, {}, session.result
+        headers = {"Range": f"bytes=0-{len(session.data) - 1}"} if session.data else {}
+        return 308, headers, None
+
+    @staticmethod
+    def _public(f: dict) -> dict:
+        item = {k: v for k, v in f.items() if k != "content"}
+        if f["mimeType"] != FOLDER_MIME:
+            item["md5Checksum"] = hashlib.md5(f["content"]).hexdigest()
+            item["size"] = str(len(f["content"]))
+        return item
+
+    @staticmethod
+    def _error(status: int) -> tuple:
+        return status, {}, {"error": {"code": status, "message": f"fake error {status}"}}
+
+    # 배치
+
+    def handle_batch(self, content_type: str, body: bytes) -> tuple:
+        message = BytesParser().parsebytes(b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body)
+        parts = message.get_payload()
+        with self._lock:
+            self.batch_sizes.append(len(parts))
+        if len(parts) > self.BATCH_LIMIT:
+            return 400, "text/plain", b"too many requests in batch"
+
+        responses = []
+        for part in parts:
+            request = _parse_http_part(part.get_payload())
+            status, headers, payload = self.handle(request)
+            content_id = part["Content-ID"].strip("<>")
+            responses.append((content_id, status, headers, payload))
+        if self.reverse_batch_responses:
+            responses.reverse()
+
+        boundary = "batch_" + uuid.uuid4().hex
+        out = []
+        for content_id, status, headers, payload in responses:
+            inner = [f"HTTP/1.1 {status} {'OK' if status < 300 else 'Error'}", "Content-Type: application/json"]
+            inner += [f"{k}: {v}" for k, v in headers.items()]
+            out += [
+                f"--{boundary}",
+                "Content-Type: application/http",
+                f"Content-ID: <response-{content_id}>",
+                "",
+                *inner,
+                "",
+                json.dumps(payload) if payload is not None else "",
+            ]
+        out.append(f"--{boundary}--")
+        return 200, f"multipart/mixed; boundary={boundary}", "\r\n".join(out).encode("utf-8")
+
+
+def _parse_http_part(text: str) -> FakeRequest:
+    """배치 파트(application/http) → FakeRequest"""
+    request_line, _, rest = text.replace("\r\n", "\n").partition("\n")
+    method, target, _ = request_line.split(" ", 2)
+    message = Parser().parsestr(rest)
+    url = urlparse(target)
+    return FakeRequest(
+        method=method,
+        path=url.path,
+        query=parse_qs(url.query),
+        headers={k.lower(): v for k, v in message.items()},
+        body=(message.get_payload() or "").encode("utf-8"),
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    drive: FakeDrive = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        url = urlparse(self.path)
+
+        if url.path == "/batch/drive/v3" and self.command == "POST":
+            status, content_type, payload = self.drive.handle_batch(self.headers["Content-Type"], body)
+            self._respond(status, {"Content-Type": content_type}, payload)
+            return
+
+        status, headers, payload = self.drive.handle(FakeRequest(
+            method=self.command,
+            path=url.path,
+            query=parse_qs(url.query),
+            headers={k.lower(): v for k, v in self.headers.items()},
+            body=body,
+        ))
+        data = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self._respond(status, {"Content-Type": "application/json", **headers}, data)
+
+    def _respond(self, status: int, headers: dict, data: bytes):
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = _dispatch
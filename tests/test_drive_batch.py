@@ -0,0 +1,154 @@
+"""
+DriveBatch와 배치 요청을 쓰는 GoogleDriveManager 메서드 테스트 (가짜 Drive 서버 사용)
+"""
+import config
+from services.drive_batch import DriveBatch
+from tests.conftest import ROOT_FOLDER_ID
+from tests.fake_drive import FOLDER_MIME
+
+
+def _create_request(service, name):
+    return service.files().create(
+        body={"name": name, "mimeType": FOLDER_MIME, "parents": [ROOT_FOLDER_ID]},
+        fields="id"
+    )
+
+
+def _named(name):
+    return lambda request: request.method == "POST" and request.json().get("name") == name
+
+
+def test_splits_into_chunks_of_100_and_keeps_add_order(fake_drive, sleeps):
+    fake_drive.reverse_batch_responses = True
+    service = fake_drive.build_service()
+    names = [f"folder-{i}" for i in range(250)]
+
+    batch = DriveBatch(service)
+    for i, name in enumerate(names):
+        assert batch.add(_create_request(service, name)) == i
+    results = batch.execute()
+
+    assert fake_drive.batch_sizes == [100, 100, 50]
+    assert [error for _, error in results] == [None] * 250
+    assert [response["name"] for response, _ in results] == names
+    assert len(batch) == 0
+    assert sleeps == []
+
+
+def test_retries_only_throttled_and_server_errors(fake_drive, sleeps):
+    service = fake_drive.build_service()
+    fake_drive.fail(429, when=_named("a"))
+    fake_drive.fail(503, when=_named("c"))
+    fake_drive.fail(404, when=_named("d"))
+
+    batch = DriveBatch(service)
+    for name in ["a", "b", "c", "d"]:
+        batch.add(_create_request(service, name))
+    results = batch.execute()
+
+    # 실패한 429/503만 두 번째 배치로 다시 보냄 (404는 재시도 안 함)
+    assert fake_drive.batch_sizes == [4, 2]
+    assert sleeps == [1]
+    assert [r["name"] if r else None for r, _ in results] == ["a", "b", "c", None]
+    assert results[3][1].resp.status == 404
+    assert len(fake_drive.requests_to("POST", "/drive/v3/files$")) == 6
+    assert sorted(f["name"] for f in fake_drive.children(ROOT_FOLDER_ID).values()) == ["a", "b", "c"]
+
+
+def test_gives_up_after_max_retries(fake_drive, sleeps):
+    service = fake_drive.build_service()
+    fake_drive.fail(500, when=_named("flaky"), times=10)
+
+    batch = DriveBatch(service, max_retries=3)
+    batch.add(_create_request(service, "ok"))
+    batch.add(_create_request(service, "flaky"))
+    results = batch.execute()
+
+    assert fake_drive.batch_sizes == [2, 1, 1]
+    assert sleeps == [1, 2]
+    assert results[0][1] is None and results[0][0]["name"] == "ok"
+    assert results[1][0] is None and results[1][1].resp.status == 500
+
+
+def test_provision_folders_creates_tree_in_few_batches(fake_drive, drive_manager):
+    genres = config.GENRE_LIST
+    root = fake_drive.children(ROOT_FOLDER_ID, folders=True)
+
+    assert set(root) == {"홀수", "짝수", *genres}
+    assert drive_manager.odd_folder_id == root["홀수"]["id"]
+    assert drive_manager.even_folder_id == root["짝수"]["id"]
+    for genre in genres:
+        children = fake_drive.children(root[genre]["id"], folders=True)
+        assert set(children) == {"홀수", "짝수"}
+        assert drive_manager.genre_folders[genre] == {
+            "id": root[genre]["id"], "홀수": children["홀수"]["id"], "짝수": children["짝수"]["id"]
+        }
+    # 루트 목록, 루트 아래 생성, 장르별 목록, 홀짝 생성 - 장르 수와 무관하게 배치 4번
+    assert len(fake_drive.batch_sizes) == 4
+    assert max(fake_drive.batch_sizes) <= 100
+
+
+def test_provision_folders_only_creates_missing(fake_drive, drive_manager):
+    genre = config.GENRE_LIST[0]
+    before = dict(drive_manager.genre_folders)
+    del fake_drive.files[before[genre]["짝수"]]
+    fake_drive.batch_sizes.clear()
+
+    drive_manager.provision_folders()
+
+    created = drive_manager.genre_folders[genre]["짝수"]
+    assert created != before[genre]["짝수"]
+    assert fake_drive.files[created]["parents"] == [before[genre]["id"]]
+    assert {g: v for g, v in drive_manager.genre_folders.items() if g != genre} == \
+        {g: v for g, v in before.items() if g != genre}
+    assert fake_drive.batch_sizes == [1, len(config.GENRE_LIST), 1]
+
+
+def test_batch_update_metadata_renames_moves_and_reports_errors(fake_drive, drive_manager):
+    odd, even = drive_manager.odd_folder_id, drive_manager.even_folder_id
+    renamed = fake_drive.add_file("old.mp3", odd, b"1")
+    moved = fake_drive.add_file("move.mp3", odd, b"2")
+
+    errors = drive_manager.batch_update_metadata([
+        {"file_id": renamed, "body": {"name": "new.mp3"}},
+        {"file_id": moved, "add_parents": even, "remove_parents": odd},
+        {"file_id": "missing", "body": {"name": "x.mp3"}},
+    ])
+
+    assert errors[renamed] is None and errors[moved] is None
+    assert "404" in errors["missing"]
+    assert fake_drive.files[renamed]["name"] == "new.mp3"
+    assert fake_drive.files[moved]["parents"] == [even]
+    assert fake_drive.batch_sizes[-1] == 3
+
+
+def test_sync_files_moves_legacy_root_files_into_genre_folder(fake_drive, drive_manager, tmp_path):
+    genre = config.GENRE_LIST[0]
+    odd = drive_manager.odd_folder_id
+    genre_odd = drive_manager.genre_folders[genre]["홀수"]
+
+    same = tmp_path / "same.mp3"
+    same.write_bytes(b"same content")
+    changed = tmp_path / "changed.mp3"
+    changed.write_bytes(b"new content")
+    same_id = fake_drive.add_file("same.mp3", odd, b"same content")
+    fake_drive.add_file("changed.mp3", odd, b"old content")
+
+    result = drive_manager.sync_files([
+        {"file_path": str(same), "is_odd": True, "genre": genre},
+        {"file_path": str(changed), "is_odd": True, "genre": genre},
+    ])
+
+    assert result["moved"] == [str(same)]
+    assert result["uploaded"] == [str(changed)]
+    assert result["failed"] == []
+    # 내용이 같은 예전 파일은 다시 올리지 않고 부모만 바꿈
+    assert fake_drive.files[same_id]["parents"] == [genre_odd]
+    assert fake_drive.children(genre_odd)["changed.mp3"]["content"] == b"new content"
+    assert len(fake_drive.requests_to("POST", "^/upload/")) == 1
+    assert drive_manager.file_cache.get(genre_odd, "same.mp3") == same_id
+    assert drive_manager.file_cache.get(odd, "same.mp3") is None
+
+    # 다시 동기화하면 전부 그대로
+    again = drive_manager.sync_files([{"file_path": str(same), "is_odd": True, "genre": genre}])
+    assert again["unchanged"] == [str(same)] and again["moved"] == []
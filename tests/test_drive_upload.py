@@ -0,0 +1,140 @@
+"""
+재개 가능 업로드 이어받기 테스트 (가짜 Drive 서버 사용)
+"""
+import hashlib
+import json
+
+import pytest
+import config
+
+CHUNK = 256 * 1024
+
+
+@pytest.fixture
+def manager(drive_manager, monkeypatch):
+    monkeypatch.setattr(config, "DRIVE_UPLOAD_CHUNK_SIZE", CHUNK)
+    return drive_manager
+
+
+def _write(path, size, fill=b"a"):
+    path.write_bytes((fill * size)[:size])
+    return path
+
+
+def _chunk_at(offset):
+    """offset부터 시작하는 청크 PUT"""
+    return lambda request: request.headers.get("content-range", "").startswith(f"bytes {offset}-")
+
+
+def _status_query(request):
+    return request.method == "PUT" and request.headers.get("content-range", "").startswith("bytes */")
+
+
+def _sessions(manager):
+    with open(manager.upload_sessions_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _starts(fake_drive):
+    return fake_drive.requests_to("POST", "^/upload/drive/v3/files")
+
+
+def _failed_upload(fake_drive, manager, path):
+    """세 번째 청크에서 끊긴 업로드를 만들고 저장된 세션 반환"""
+    fake_drive.fail(400, when=_chunk_at(2 * CHUNK))
+    assert manager.upload_file(str(path)) is False
+    return _sessions(manager)
+
+
+def test_resumes_from_server_offset_with_one_status_query(fake_drive, manager, tmp_path):
+    path = _write(tmp_path / "song.mp3", 3 * CHUNK + 100)
+    sessions = _failed_upload(fake_drive, manager, path)
+
+    key = f"create:{manager.odd_folder_id}/song.mp3"
+    stat = path.stat()
+    assert list(sessions) == [key]
+    assert sessions[key]["content_id"] == f"{stat.st_size}:{stat.st_mtime_ns}"
+    assert sessions[key]["uri"].startswith(fake_drive.root_url + "upload/sessions/")
+
+    fake_drive.requests.clear()
+    assert manager.upload_file(str(path)) is True
+
+    queries = [r for r in fake_drive.requests if _status_query(r)]
+    assert [r.headers["content-range"] for r in queries] == [f"bytes */{3 * CHUNK + 100}"]
+    assert _starts(fake_drive) == []
+    # 서버가 받은 두 청크는 다시 보내지 않음
+    ranges = [r.headers["content-range"] for r in fake_drive.requests_to("PUT", "^/upload/sessions/") if not _status_query(r)]
+    assert ranges == [f"bytes {2 * CHUNK}-{3 * CHUNK - 1}/{3 * CHUNK + 100}", f"bytes {3 * CHUNK}-{3 * CHUNK + 99}/{3 * CHUNK + 100}"]
+    assert fake_drive.children(manager.odd_folder_id)["song.mp3"]["content"] == path.read_bytes()
+    assert _sessions(manager) == {}
+
+
+def test_changed_content_starts_new_session(fake_drive, manager, tmp_path):
+    path = _write(tmp_path / "song.mp3", 3 * CHUNK + 100)
+    _failed_upload(fake_drive, manager, path)
+
+    _write(path, 3 * CHUNK + 200, b"b")
+    fake_drive.requests.clear()
+    assert manager.upload_file(str(path)) is True
+
+    assert not any(_status_query(r) for r in fake_drive.requests)
+    assert len(_starts(fake_drive)) == 1
+    assert fake_drive.children(manager.odd_folder_id)["song.mp3"]["content"] == path.read_bytes()
+    assert _sessions(manager) == {}
+
+
+@pytest.mark.parametrize("status", [404, 410])
+def test_expired_session_restarts_upload(fake_drive, manager, tmp_path, status):
+    path = _write(tmp_path / "song.mp3", 3 * CHUNK + 100)
+    _failed_upload(fake_drive, manager, path)
+
+    fake_drive.fail(status, when=_status_query)
+    fake_drive.requests.clear()
+    assert manager.upload_file(str(path)) is True
+
+    assert len(_starts(fake_drive)) == 1
+    assert fake_drive.children(manager.odd_folder_id)["song.mp3"]["content"] == path.read_bytes()
+    assert _sessions(manager) == {}
+
+
+def test_session_expiring_mid_resume_restarts_upload(fake_drive, manager, tmp_path):
+    path = _write(tmp_path / "song.mp3", 3 * CHUNK + 100)
+    _failed_upload(fake_drive, manager, path)
+
+    # 위치 조회는 됐는데 이어 보낸 청크에서 세션이 사라짐
+    fake_drive.fail(410, when=_chunk_at(2 * CHUNK))
+    fake_drive.requests.clear()
+    assert manager.upload_file(str(path)) is True
+
+    assert len(_starts(fake_drive)) == 1
+    assert fake_drive.children(manager.odd_folder_id)["song.mp3"]["content"] == path.read_bytes()
+    assert _sessions(manager) == {}
+
+
+def test_already_completed_upload_is_not_sent_again(fake_drive, manager, tmp_path):
+    path = _write(tmp_path / "song.mp3", 3 * CHUNK + 100)
+    # 마지막 청크는 서버에 반영됐지만 응답이 유실됨
+    fake_drive.fail(400, when=_chunk_at(3 * CHUNK), after=True)
+    assert manager.upload_file(str(path)) is False
+    assert len(_sessions(manager)) == 1
+
+    fake_drive.requests.clear()
+    assert manager.upload_file(str(path)) is True
+
+    assert [r for r in fake_drive.requests if not _status_query(r)] == []
+    assert list(fake_drive.children(manager.odd_folder_id)) == ["song.mp3"]
+    assert _sessions(manager) == {}
+
+
+def test_bytes_upload_keys_session_by_md5(fake_drive, manager):
+    data = b"x" * (3 * CHUNK + 100)
+    fake_drive.fail(400, when=_chunk_at(2 * CHUNK))
+    assert manager.upload_file(file_data=data, file_name="meta.bin") is False
+
+    sessions = _sessions(manager)
+    assert sessions[f"create:{manager.odd_folder_id}/meta.bin"]["content_id"] == hashlib.md5(data).hexdigest()
+
+    fake_drive.requests.clear()
+    assert manager.upload_file(file_data=data, file_name="meta.bin") is True
+    assert _starts(fake_drive) == []
+    assert fake_drive.children(manager.odd_folder_id)["meta.bin"]["content"] == data
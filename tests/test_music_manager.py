@@ -0,0 +1,71 @@
+"""
+MusicManager 파일 존재 확인 캐시 테스트
+"""
+import pytest
+import config
+from services.music_manager import MusicManager
+
+
+@pytest.fixture
+def music_manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "OUTPUT1_DIR", tmp_path / "output1")
+    monkeypatch.setattr(config, "OUTPUT2_DIR", tmp_path / "output2")
+    monkeypatch.setattr(config, "LIBRARY_DIR", tmp_path / "library")
+    monkeypatch.setattr(config, "FILE_FINGERPRINT_CACHE_FILE", tmp_path / "file_fingerprints.json")
+    # 폴더 mtime 확인 간격이 길어도 앱이 쓴 파일은 바로 반영돼야 함
+    monkeypatch.setattr(config, "DIRECTORY_INDEX_CHECK_INTERVAL", 3600)
+    return MusicManager(tmp_path / "outputs")
+
+
+def _save(music_manager, clip_id, audio_path):
+    return music_manager.save_song({"id": clip_id}, {"title": "노래"}, str(audio_path))
+
+
+def test_saved_and_deleted_files_are_seen_immediately(music_manager):
+    path = music_manager.get_audio_path("노래", "clip-1")
+    assert music_manager.file_exists(str(path)) is False  # 폴더 목록을 캐시에 올려 둠
+
+    path.write_bytes(b"mp3")  # download_audio가 쓴 파일
+    _save(music_manager, "clip-1", path)
+    assert music_manager.file_exists(str(path)) is True
+
+    assert music_manager.delete_song("clip-1") is True
+    assert not path.exists()
+    assert music_manager.file_exists(str(path)) is False
+
+
+def test_delete_song_without_audio_path(music_manager):
+    _save(music_manager, "clip-2", "")
+
+    assert music_manager.delete_song("clip-2") is True
+    assert music_manager.get_song("clip-2") is None
+
+
+def test_sync_to_drive_uploads_only_generated_files(music_manager, drive_manager):
+    in_output = music_manager.get_audio_path("노래", "clip-1", clip_index=1)
+    in_output.write_bytes(b"mp3")
+    _save(music_manager, "clip-1", in_output)
+
+    # 생성 폴더 파일은 지워졌고 library 사본만 있는 곡, 경로가 빈 곡
+    _save(music_manager, "clip-2", music_manager.get_audio_path("노래", "clip-2"))
+    library_copy = music_manager.get_library_path("노래", "clip-2")
+    library_copy.parent.mkdir(exist_ok=True)
+    library_copy.write_bytes(b"mp3")
+    _save(music_manager, "clip-3", "")
+
+    music_manager.drive_manager = drive_manager
+    result = music_manager.sync_to_drive()
+
+    assert result["checked"] == 1
+    assert result["uploaded"] == [str(in_output)]
+    assert list(_drive_file_names(drive_manager)) == [in_output.name]
+    assert music_manager.get_song("clip-1")["drive_status"] == "done"
+
+
+def _drive_file_names(drive_manager):
+    """홀수/짝수 폴더에 올라간 파일명"""
+    return [
+        name
+        for folder_id in (drive_manager.odd_folder_id, drive_manager.even_folder_id)
+        for name in drive_manager._list_folder_files(folder_id)
+    ]